@@ -3,61 +3,25 @@ Account-specific writing styles to avoid Facebook detection.
 Each account has a unique way of writing titles and descriptions.
 """
 
+import functools
 import random
 
 class AccountWritingStyles:
     """Manages unique writing styles for each Facebook account."""
 
-    def __init__(self, account_name):
-        self.account_name = account_name
-        self.style = self._get_style_for_account(account_name)
+    _STYLES = ('professional', 'casual', 'enthusiastic', 'minimalist', 'detailed')
 
-    def _get_style_for_account(self, account_name):
-        """
-        Assign a consistent writing style based on account name.
-        Uses hash to ensure same account always gets same style.
-        """
-        # Get hash of account name to consistently assign style
-        account_hash = sum(ord(c) for c in account_name.lower())
-        style_index = account_hash % 5  # 5 different styles
+    # Shared instances keyed by account name (see get())
+    _instances = {}
 
-        styles = {
-            0: 'professional',
-            1: 'casual',
-            2: 'enthusiastic',
-            3: 'minimalist',
-            4: 'detailed'
-        }
-
-        return styles[style_index]
-
-    def format_description(self, base_description, product_type='general'):
-        """
-        Format description according to account's unique style.
-
-        Args:
-            base_description: The base description content
-            product_type: Type of product (carpet, grass, decking, etc.)
-
-        Returns:
-            Formatted description in account's unique style
-        """
-        if self.style == 'professional':
-            return self._professional_style(base_description, product_type)
-        elif self.style == 'casual':
-            return self._casual_style(base_description, product_type)
-        elif self.style == 'enthusiastic':
-            return self._enthusiastic_style(base_description, product_type)
-        elif self.style == 'minimalist':
-            return self._minimalist_style(base_description, product_type)
-        else:  # detailed
-            return self._detailed_style(base_description, product_type)
-
-    def _professional_style(self, base_desc, product_type):
-        """Professional, formal writing style."""
-        templates = [
-            f"""PRODUCT SPECIFICATIONS:
-{base_desc}
+    # Description templates per style. {desc} marks where the base description
+    # goes; the {product...} fields are filled once per product type (see
+    # _prebuilt_templates) so rendering is just head + base_desc + tail.
+    _TEMPLATES = {
+        # Professional, formal writing style.
+        'professional': (
+            """PRODUCT SPECIFICATIONS:
+{desc}
 
 DELIVERY INFORMATION:
 - Express delivery available (2-4 business days)
@@ -71,9 +35,9 @@ QUALITY ASSURANCE:
 
 Contact us for detailed specifications.""",
 
-            f"""Professional Grade {product_type.title()}
+            """Professional Grade {product_title}
 
-{base_desc}
+{desc}
 
 Service Details:
 → Fast UK delivery (2-4 days)
@@ -85,7 +49,7 @@ All products meet UK quality standards.
 
 Enquiries welcome.""",
 
-            f"""{base_desc}
+            """{desc}
 
 Delivery: 2-4 working days nationwide
 Samples: Available free of charge
@@ -93,16 +57,12 @@ Installation: Professional service offered
 
 Quality assured. UK standards certified.
 Contact for specifications."""
-        ]
-
-        return random.choice(templates)
-
-    def _casual_style(self, base_desc, product_type):
-        """Casual, friendly writing style."""
-        templates = [
-            f"""Hey! Check out this {product_type} :)
+        ),
+        # Casual, friendly writing style.
+        'casual': (
+            """Hey! Check out this {product} :)
 
-{base_desc}
+{desc}
 
 Quick delivery - usually 2-4 days!
 Free samples if you want to see it first
@@ -111,9 +71,9 @@ Can help with fitting too if needed
 Any questions just ask! Happy to help.
 Cheers""",
 
-            f"""Great {product_type} available now!
+            """Great {product} available now!
 
-{base_desc}
+{desc}
 
 Delivery is pretty quick (2-4 days normally)
 Can send you a free sample first if you like
@@ -122,7 +82,7 @@ Also do installation if you need it
 Feel free to message with any questions
 Thanks for looking!""",
 
-            f"""{base_desc}
+            """{desc}
 
 Gets to you in 2-4 days usually
 Free samples available - just ask!
@@ -130,16 +90,12 @@ Can help with fitting if needed
 
 Message me if you have any questions
 Cheers!"""
-        ]
+        ),
+        # Enthusiastic, excited writing style with emojis.
+        'enthusiastic': (
+            """🌟 Amazing {product_title}! 🌟
 
-        return random.choice(templates)
-
-    def _enthusiastic_style(self, base_desc, product_type):
-        """Enthusiastic, excited writing style with emojis."""
-        templates = [
-            f"""🌟 Amazing {product_type.title()}! 🌟
-
-{base_desc}
+{desc}
 
 ✨ WHAT YOU GET:
 🚚 Super fast delivery (2-4 days!)
@@ -150,9 +106,9 @@ Perfect for transforming your space! 💯
 
 Message me - I'd love to help! 😊""",
 
-            f"""⭐ TOP QUALITY {product_type.upper()}! ⭐
+            """⭐ TOP QUALITY {product_upper}! ⭐
 
-{base_desc}
+{desc}
 
 🎯 THE BENEFITS:
 ✅ Quick delivery (2-4 days)
@@ -163,9 +119,9 @@ This will look AMAZING in your home! 🏡
 
 Get in touch - happy to answer questions! 👍""",
 
-            f"""🔥 Brilliant {product_type.title()} Deal! 🔥
+            """🔥 Brilliant {product_title} Deal! 🔥
 
-{base_desc}
+{desc}
 
 💪 Why choose this:
 → Fast delivery! (2-4 days)
@@ -175,14 +131,10 @@ Get in touch - happy to answer questions! 👍""",
 Transform your space today! ✨
 
 Drop me a message! 💬"""
-        ]
-
-        return random.choice(templates)
-
-    def _minimalist_style(self, base_desc, product_type):
-        """Minimalist, concise writing style."""
-        templates = [
-            f"""{base_desc}
+        ),
+        # Minimalist, concise writing style.
+        'minimalist': (
+            """{desc}
 
 Delivery: 2-4 days
 Samples: Free
@@ -190,9 +142,9 @@ Installation: Available
 
 Contact for details.""",
 
-            f"""{product_type.title()} Available
+            """{product_title} Available
 
-{base_desc}
+{desc}
 
 - Fast delivery (2-4 days)
 - Free samples
@@ -200,24 +152,20 @@ Contact for details.""",
 
 Message to order.""",
 
-            f"""{base_desc}
+            """{desc}
 
 Quick delivery.
 Free samples available.
 Installation help if needed.
 
 Get in touch."""
-        ]
-
-        return random.choice(templates)
-
-    def _detailed_style(self, base_desc, product_type):
-        """Detailed, informative writing style."""
-        templates = [
-            f"""Comprehensive {product_type.title()} Solution
+        ),
+        # Detailed, informative writing style.
+        'detailed': (
+            """Comprehensive {product_title} Solution
 
 PRODUCT DESCRIPTION:
-{base_desc}
+{desc}
 
 ORDERING INFORMATION:
 Our streamlined ordering process ensures quick dispatch, with most orders delivered within 2-4 working days. We understand that choosing the right product is important, which is why we offer complimentary samples - allowing you to see and feel the quality before making your purchase decision.
@@ -230,9 +178,9 @@ We pride ourselves on excellent customer service. Feel free to reach out with an
 
 Quality products. Professional service. Competitive prices.""",
 
-            f"""High-Quality {product_type.title()} - Detailed Information
+            """High-Quality {product_title} - Detailed Information
 
-{base_desc}
+{desc}
 
 DELIVERY SERVICE:
 We offer nationwide delivery with most orders dispatched within 24 hours and delivered in 2-4 working days. Track your order online for complete peace of mind.
@@ -245,9 +193,9 @@ Our network of professional installers covers the entire UK. We can arrange a si
 
 For more information or to place an order, please get in touch. We're here to help you find the perfect solution.""",
 
-            f"""{product_type.title()} - Full Product Details
+            """{product_title} - Full Product Details
 
-{base_desc}
+{desc}
 
 Delivery Information:
 Express delivery service available with 2-4 day delivery across the UK. Orders are carefully packaged to ensure products arrive in perfect condition.
@@ -259,39 +207,90 @@ Installation Support:
 Professional installation services available. Our installers are experienced and can complete the work efficiently and to a high standard.
 
 Questions? Contact us anytime. We're happy to provide additional information, specifications, or advice on the best product for your needs."""
-        ]
+        )
+    }
+
+    _TITLE_PREFIXES = {
+        'professional': ('Professional', 'Premium', 'Commercial Grade', 'Quality'),
+        'casual': ('Great', 'Lovely', 'Nice', 'Good Quality'),
+        'enthusiastic': ('Amazing', 'Brilliant', 'Fantastic', 'Superb'),
+        'minimalist': ('Quality', 'Standard', 'Good', 'Solid'),
+        'detailed': ('High-Quality', 'Comprehensive', 'Complete', 'Full-Spec')
+    }
+
+    _TITLE_SUFFIXES = {
+        'professional': ('| Professional Grade', '| Quality Assured', '| UK Standards'),
+        'casual': ('| Great Deal', '| Quick Delivery', '| Check It Out'),
+        'enthusiastic': ('| Amazing Quality!', '| Perfect Choice!', '| Top Rated!'),
+        'minimalist': ('', '| Available Now', ''),
+        'detailed': ('| Full Details Available', '| Complete Service', '| Comprehensive Solution')
+    }
+
+    # (style, product_type) -> tuple of (head, tail) pairs, filled lazily
+    _prebuilt = {}
+
+    def __init__(self, account_name):
+        self.account_name = account_name
+        self.style = self._get_style_for_account(account_name)
+
+    @classmethod
+    def get(cls, account_name):
+        """Return the shared style manager for an account, creating it once."""
+        instance = cls._instances.get(account_name)
+        if instance is None:
+            instance = cls._instances[account_name] = cls(account_name)
+        return instance
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_style_for_account(account_name):
+        """
+        Assign a consistent writing style based on account name.
+        Uses a character-sum hash (not hash(), which is randomised per process)
+        so the same account always gets the same style; cached per name.
+        """
+        account_hash = sum(ord(c) for c in account_name.lower())
+        return AccountWritingStyles._STYLES[account_hash % len(AccountWritingStyles._STYLES)]
 
-        return random.choice(templates)
+    def format_description(self, base_description, product_type='general'):
+        """
+        Format description according to account's unique style.
+
+        Args:
+            base_description: The base description content
+            product_type: Type of product (carpet, grass, decking, etc.)
+
+        Returns:
+            Formatted description in account's unique style
+        """
+        head, tail = random.choice(self._prebuilt_templates(self.style, product_type))
+        return head + base_description + tail
+
+    @classmethod
+    def _prebuilt_templates(cls, style, product_type):
+        """Return the style's templates rendered for a product type, split around {desc}."""
+        key = (style, product_type)
+        prebuilt = cls._prebuilt.get(key)
+        if prebuilt is None:
+            fields = {
+                'product': product_type,
+                'product_title': product_type.title(),
+                'product_upper': product_type.upper(),
+            }
+            prebuilt = tuple(
+                tuple(part.format_map(fields) for part in template.split('{desc}'))
+                for template in cls._TEMPLATES[style]
+            )
+            cls._prebuilt[key] = prebuilt
+        return prebuilt
 
     def get_title_prefix(self, product_type):
         """Get title prefix based on account style."""
-        if self.style == 'professional':
-            prefixes = ['Professional', 'Premium', 'Commercial Grade', 'Quality']
-        elif self.style == 'casual':
-            prefixes = ['Great', 'Lovely', 'Nice', 'Good Quality']
-        elif self.style == 'enthusiastic':
-            prefixes = ['Amazing', 'Brilliant', 'Fantastic', 'Superb']
-        elif self.style == 'minimalist':
-            prefixes = ['Quality', 'Standard', 'Good', 'Solid']
-        else:  # detailed
-            prefixes = ['High-Quality', 'Comprehensive', 'Complete', 'Full-Spec']
-
-        return random.choice(prefixes)
+        return random.choice(self._TITLE_PREFIXES[self.style])
 
     def get_title_suffix(self, product_type):
         """Get title suffix based on account style."""
-        if self.style == 'professional':
-            suffixes = ['| Professional Grade', '| Quality Assured', '| UK Standards']
-        elif self.style == 'casual':
-            suffixes = ['| Great Deal', '| Quick Delivery', '| Check It Out']
-        elif self.style == 'enthusiastic':
-            suffixes = ['| Amazing Quality!', '| Perfect Choice!', '| Top Rated!']
-        elif self.style == 'minimalist':
-            suffixes = ['', '| Available Now', '']
-        else:  # detailed
-            suffixes = ['| Full Details Available', '| Complete Service', '| Comprehensive Solution']
-
-        return random.choice(suffixes)
+        return random.choice(self._TITLE_SUFFIXES[self.style])
 
 
 # Example usage
@@ -300,7 +299,7 @@ if __name__ == "__main__":
     accounts = ['john', 'mary', 'david', 'sarah', 'mike']
 
     for account in accounts:
-        style_manager = AccountWritingStyles(account)
+        style_manager = AccountWritingStyles.get(account)
         print(f"\n{'='*60}")
         print(f"Account: {account} - Style: {style_manager.style}")
         print(f"{'='*60}")
@@ -5,6 +5,13 @@ Analyzes listing images to detect product type, colors, and features.
 """
 
 import os
+import atexit
+import hashlib
+import io
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from PIL import Image
@@ -12,8 +19,85 @@ import requests
 import json
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# On-disk cache of analysis results keyed by image content hash
+IMAGE_CACHE_FILE = os.path.join('accounts', 'ai_image_cache.json')
+IMAGE_CACHE_MAX_ENTRIES = 512
+
+# Upper bound on images analysed concurrently for one listing
+MAX_ANALYSIS_WORKERS = 8
+
+# Images are normalised to this size before decoding is reduced further
+ANALYSIS_SIZE = 400
+
+# Colour, LBP and Gabor features are computed on one shared copy of this
+# size; they are statistical, so 128x128 pixels is ample. Edge density stays
+# at ANALYSIS_SIZE, as its thresholds depend on fine detail that area
+# averaging would smooth away.
+FEATURE_SIZE = 128
+
+# Reduced-resolution decode flags, largest reduction first
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # The kernel is already parallel; serialise launches from analysis threads
+    # since Numba's default threading layer can't run parallel regions concurrently
+    _lbp_kernel_lock = threading.Lock()
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _lbp_kernel(img, out):
+        """Fused LBP pass: all eight neighbour comparisons in one sweep per row."""
+        height, width = img.shape
+        for i in prange(1, height - 1):
+            for j in range(1, width - 1):
+                c = img[i, j]
+                v = 0
+                if img[i-1, j-1] >= c:
+                    v |= 128
+                if img[i-1, j] >= c:
+                    v |= 64
+                if img[i-1, j+1] >= c:
+                    v |= 32
+                if img[i, j+1] >= c:
+                    v |= 16
+                if img[i+1, j+1] >= c:
+                    v |= 8
+                if img[i+1, j] >= c:
+                    v |= 4
+                if img[i+1, j-1] >= c:
+                    v |= 2
+                if img[i, j-1] >= c:
+                    v |= 1
+                out[i, j] = v
+
+    # Warm up once at import so the first analysed image doesn't pay compile cost
+    try:
+        _lbp_kernel(np.zeros((3, 3), dtype=np.uint8), np.zeros((3, 3), dtype=np.uint8))
+    except Exception as e:
+        logger.warning("⚠️ Numba LBP kernel unavailable, using NumPy fallback: %s", e)
+        NUMBA_AVAILABLE = False
+
+
 class AIImageAnalyzer:
     """AI-powered image analysis for product detection and description generation."""
+
+    # Analysis results shared by all analyzers in the process, loaded lazily
+    # from IMAGE_CACHE_FILE and written back at exit
+    _cache = None
+    _cache_dirty = False
+    _cache_lock = threading.Lock()
     
     def __init__(self):
         """Initialize the AI image analyzer."""
@@ -43,25 +127,105 @@ class AIImageAnalyzer:
                 'patterns': ['woodgrain', 'striped']
             }
         }
+
+        # Gabor kernels for the four texture orientations, built once
+        self._gabor_kernels = [
+            cv2.getGaborKernel((21, 21), 5, np.radians(angle), 10, 0.5, 0, ktype=cv2.CV_32F)
+            for angle in (0, 45, 90, 135)
+        ]
+
+        # Hue (0-179 in OpenCV) to color name lookup table
+        hue_lut = np.empty(180, dtype='<U8')
+        hue_lut[0:15] = 'red'
+        hue_lut[15:35] = 'orange'
+        hue_lut[35:85] = 'yellow'
+        hue_lut[85:165] = 'green'
+        hue_lut[165:180] = 'red'
+        self._hue_lut = hue_lut
     
+    @classmethod
+    def _load_cache(cls):
+        """Load cached analysis results from disk (once per process)."""
+        with cls._cache_lock:
+            if cls._cache is not None:
+                return cls._cache
+            cls._cache = {}
+            try:
+                if os.path.exists(IMAGE_CACHE_FILE):
+                    with open(IMAGE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                        cls._cache = json.load(f)
+            except Exception as e:
+                logger.warning("⚠️ Error loading image analysis cache: %s", e)
+            atexit.register(cls.save_cache)
+            return cls._cache
+
+    @classmethod
+    def save_cache(cls):
+        """Write cached analysis results to disk if anything changed."""
+        with cls._cache_lock:
+            if not cls._cache_dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(IMAGE_CACHE_FILE), exist_ok=True)
+                with open(IMAGE_CACHE_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(cls._cache, f, ensure_ascii=False)
+                cls._cache_dirty = False
+            except Exception as e:
+                logger.warning("⚠️ Error saving image analysis cache: %s", e)
+
+    @classmethod
+    def _store_cached(cls, digest, analysis):
+        """Remember an analysis result, evicting the oldest entry when full."""
+        with cls._cache_lock:
+            cls._cache[digest] = analysis
+            while len(cls._cache) > IMAGE_CACHE_MAX_ENTRIES:
+                cls._cache.pop(next(iter(cls._cache)))
+            cls._cache_dirty = True
+
+    def _decode_flag(self, data):
+        """Pick the cheapest imdecode flag that keeps the image >= ANALYSIS_SIZE."""
+        try:
+            # PIL only parses the header here, the pixels are not decoded
+            with Image.open(io.BytesIO(data)) as header:
+                smallest_side = min(header.size)
+        except Exception:
+            return cv2.IMREAD_COLOR
+
+        for factor, flag in _REDUCED_DECODE_FLAGS:
+            if smallest_side // factor >= ANALYSIS_SIZE:
+                return flag
+        return cv2.IMREAD_COLOR
+
     def analyze_image(self, image_path):
         """Analyze a single image for product type and features."""
         try:
-            print(f"🔍 Analyzing image: {os.path.basename(image_path)}")
-            
-            # Load and preprocess image
-            image = cv2.imread(image_path)
+            logger.debug("🔍 Analyzing image: %s", os.path.basename(image_path))
+
+            with open(image_path, 'rb') as f:
+                data = f.read()
+
+            # Same image bytes always give the same analysis
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            cached = self._load_cache().get(digest)
+            if cached is not None:
+                return dict(cached)
+            
+            # Load and preprocess image, decoding at reduced scale when the
+            # source is large enough to still cover the analysis size
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), self._decode_flag(data))
             if image is None:
                 return {'success': False, 'error': 'Could not load image'}
             
-            # Resize for analysis
-            image = cv2.resize(image, (400, 400))
+            # Resize for analysis, then downsample once for the feature passes
+            image = cv2.resize(image, (ANALYSIS_SIZE, ANALYSIS_SIZE))
+            small = cv2.resize(image, (FEATURE_SIZE, FEATURE_SIZE), interpolation=cv2.INTER_AREA)
             
             # Analyze colors
-            color_analysis = self._analyze_colors(image)
+            color_analysis = self._analyze_colors(small)
             
-            # Analyze texture
-            texture_analysis = self._analyze_texture(image)
+            # Analyze texture (edges at full analysis size, LBP and Gabor downsampled)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            texture_analysis = self._analyze_texture(gray)
             
             # Detect product type
             product_type = self._detect_product_from_image(color_analysis, texture_analysis)
@@ -69,7 +233,7 @@ class AIImageAnalyzer:
             # Generate description elements
             description_elements = self._generate_description_elements(product_type, color_analysis, texture_analysis)
             
-            return {
+            analysis = {
                 'success': True,
                 'product_type': product_type,
                 'colors': color_analysis['dominant_colors'],
@@ -77,264 +241,217 @@ class AIImageAnalyzer:
                 'description_elements': description_elements,
                 'confidence': self._calculate_confidence(color_analysis, texture_analysis, product_type)
             }
+            self._store_cached(digest, analysis)
+            return dict(analysis)
             
         except Exception as e:
-            print(f"⚠️ Error analyzing image: {e}")
+            logger.warning("⚠️ Error analyzing image: %s", e)
             return {'success': False, 'error': str(e)}
     
     def _analyze_colors(self, image):
         """Analyze dominant colors in the image."""
-        try:
-            # Convert to HSV for better color analysis
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            
-            # Reshape image to 1D array
-            pixels = hsv.reshape(-1, 3)
-            
-            # Use K-means to find dominant colors
-            from sklearn.cluster import KMeans
-            
-            kmeans = KMeans(n_clusters=5, random_state=42)
-            kmeans.fit(pixels)
-            
-            # Get dominant colors
-            colors = kmeans.cluster_centers_
-            labels = kmeans.labels_
-            
-            # Count occurrences of each color
-            color_counts = np.bincount(labels)
-            dominant_indices = np.argsort(color_counts)[::-1]
-            
-            dominant_colors = []
-            for idx in dominant_indices[:3]:  # Top 3 colors
-                h, s, v = colors[idx]
-                color_name = self._hsv_to_color_name(h, s, v)
-                dominant_colors.append({
-                    'name': color_name,
-                    'hsv': [h, s, v],
-                    'percentage': (color_counts[idx] / len(labels)) * 100
-                })
-            
-            return {
-                'dominant_colors': dominant_colors,
-                'is_green_dominant': any('green' in color['name'] for color in dominant_colors),
-                'is_grey_dominant': any('grey' in color['name'] for color in dominant_colors),
-                'is_brown_dominant': any('brown' in color['name'] for color in dominant_colors)
-            }
-            
-        except Exception as e:
-            print(f"⚠️ Error analyzing colors: {e}")
-            return {
-                'dominant_colors': [],
-                'is_green_dominant': False,
-                'is_grey_dominant': False,
-                'is_brown_dominant': False
-            }
+        # Convert to HSV for better color analysis
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        
+        # Subsample every other row/column - dominant colours are a
+        # statistical estimate, a quarter of the pixels is plenty.
+        # Single float32 copy into a contiguous buffer; the reshape is a view.
+        pixels = np.ascontiguousarray(hsv[::2, ::2], dtype=np.float32).reshape(-1, 3)
+
+        # Use OpenCV K-means to find dominant colors
+        cv2.setRNGSeed(42)
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+        _, labels, colors = cv2.kmeans(pixels, 5, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
+        labels = labels.ravel()
+        
+        # Count occurrences of each color
+        color_counts = np.bincount(labels)
+        dominant_indices = np.argsort(color_counts)[::-1]
+        
+        dominant_colors = []
+        for idx in dominant_indices[:3]:  # Top 3 colors
+            h, s, v = colors[idx]
+            color_name = self._hsv_to_color_name(h, s, v)
+            dominant_colors.append({
+                'name': color_name,
+                'hsv': [float(h), float(s), float(v)],
+                'percentage': float(color_counts[idx] / len(labels)) * 100
+            })
+        
+        return {
+            'dominant_colors': dominant_colors,
+            'is_green_dominant': any('green' in color['name'] for color in dominant_colors),
+            'is_grey_dominant': any('grey' in color['name'] for color in dominant_colors),
+            'is_brown_dominant': any('brown' in color['name'] for color in dominant_colors)
+        }
     
-    def _analyze_texture(self, image):
-        """Analyze texture patterns in the image."""
-        try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate texture features
-            # 1. Local Binary Pattern (LBP)
-            lbp = self._calculate_lbp(gray)
-            
-            # 2. Gabor filters for texture
-            gabor_responses = self._calculate_gabor_responses(gray)
-            
-            # 3. Edge density
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
-            
-            # Determine texture type
-            texture_type = self._classify_texture(lbp, gabor_responses, edge_density)
-            
-            return {
-                'texture_type': texture_type,
-                'edge_density': edge_density,
-                'is_grass_like': 'grass' in texture_type.lower(),
-                'is_carpet_like': 'carpet' in texture_type.lower(),
-                'is_wood_like': 'wood' in texture_type.lower()
-            }
-            
-        except Exception as e:
-            print(f"⚠️ Error analyzing texture: {e}")
-            return {
-                'texture_type': 'unknown',
-                'edge_density': 0,
-                'is_grass_like': False,
-                'is_carpet_like': False,
-                'is_wood_like': False
-            }
+    def _analyze_texture(self, gray):
+        """Analyze texture patterns in an ANALYSIS_SIZE grayscale image."""
+        small = cv2.resize(gray, (FEATURE_SIZE, FEATURE_SIZE), interpolation=cv2.INTER_AREA)
+        
+        # Calculate texture features
+        # 1. Local Binary Pattern (LBP)
+        lbp = self._calculate_lbp(small)
+        
+        # 2. Gabor filters for texture
+        gabor_responses = self._calculate_gabor_responses(small)
+        
+        # 3. Edge density
+        edges = cv2.Canny(gray, 50, 150)
+        edge_density = np.sum(edges > 0) / edges.size
+        
+        # Determine texture type
+        texture_type = self._classify_texture(lbp, gabor_responses, edge_density)
+        
+        return {
+            'texture_type': texture_type,
+            'edge_density': edge_density,
+            'is_grass_like': 'grass' in texture_type.lower(),
+            'is_carpet_like': 'carpet' in texture_type.lower(),
+            'is_wood_like': 'wood' in texture_type.lower()
+        }
     
     def _hsv_to_color_name(self, h, s, v):
         """Convert HSV values to color name."""
-        # Define color ranges in HSV
         if v < 30:
             return 'black'
-        elif s < 30:
+        if s < 30:
             return 'grey'
-        elif h < 15 or h > 165:
-            return 'red'
-        elif 15 <= h < 35:
-            return 'orange'
-        elif 35 <= h < 85:
-            return 'yellow'
-        elif 85 <= h < 165:
-            return 'green'
-        elif 165 <= h < 200:
-            return 'blue'
-        elif 200 <= h < 250:
-            return 'purple'
-        else:
-            return 'pink'
+        # OpenCV hue is 0-179, so the hue bands are a direct table lookup
+        return str(self._hue_lut[min(int(h), 179)])
     
     def _calculate_lbp(self, image):
         """Calculate Local Binary Pattern for texture analysis."""
-        try:
-            # Simple LBP implementation
+        if NUMBA_AVAILABLE:
             lbp = np.zeros_like(image)
-            for i in range(1, image.shape[0] - 1):
-                for j in range(1, image.shape[1] - 1):
-                    center = image[i, j]
-                    binary = ''
-                    # 8-neighborhood
-                    neighbors = [
-                        image[i-1, j-1], image[i-1, j], image[i-1, j+1],
-                        image[i, j+1], image[i+1, j+1], image[i+1, j],
-                        image[i+1, j-1], image[i, j-1]
-                    ]
-                    for neighbor in neighbors:
-                        binary += '1' if neighbor >= center else '0'
-                    lbp[i, j] = int(binary, 2)
-            
+            with _lbp_kernel_lock:
+                _lbp_kernel(np.ascontiguousarray(image), lbp)
             return lbp
-        except:
-            return np.zeros_like(image)
+
+        # Vectorized LBP: compare each 8-neighborhood slice against the
+        # centre pixels and shift the result into its bit position
+        center = image[1:-1, 1:-1]
+        neighbors = [
+            image[:-2, :-2], image[:-2, 1:-1], image[:-2, 2:],
+            image[1:-1, 2:], image[2:, 2:], image[2:, 1:-1],
+            image[2:, :-2], image[1:-1, :-2]
+        ]
+
+        # Reuse one mask buffer for all eight comparisons: compare into it,
+        # shift it in place (viewed as uint8) and OR into the result
+        lbp_inner = np.zeros(center.shape, dtype=np.uint8)
+        mask = np.empty(center.shape, dtype=np.bool_)
+        mask_bits = mask.view(np.uint8)
+        for bit, neighbor in zip(range(7, -1, -1), neighbors):
+            np.greater_equal(neighbor, center, out=mask)
+            np.left_shift(mask_bits, bit, out=mask_bits)
+            lbp_inner |= mask_bits
+
+        lbp = np.zeros_like(image)
+        lbp[1:-1, 1:-1] = lbp_inner
+        return lbp
     
     def _calculate_gabor_responses(self, image):
         """Calculate Gabor filter responses for texture analysis."""
-        try:
-            responses = []
-            for angle in [0, 45, 90, 135]:
-                kernel = cv2.getGaborKernel((21, 21), 5, np.radians(angle), 10, 0.5, 0, ktype=cv2.CV_32F)
-                response = cv2.filter2D(image, cv2.CV_8UC3, kernel)
-                responses.append(np.mean(response))
-            return responses
-        except:
-            return [0, 0, 0, 0]
+        # Each response is reduced to its mean, so the downsampled
+        # FEATURE_SIZE image from _analyze_texture is used as-is
+        return [
+            float(cv2.filter2D(image, cv2.CV_32F, kernel, borderType=cv2.BORDER_REPLICATE).mean())
+            for kernel in self._gabor_kernels
+        ]
     
     def _classify_texture(self, lbp, gabor_responses, edge_density):
         """Classify texture based on features."""
-        try:
-            # Simple texture classification
-            if edge_density > 0.1:
-                if np.mean(gabor_responses) > 50:
-                    return 'grass-like'
-                else:
-                    return 'carpet-like'
-            elif edge_density < 0.05:
-                return 'wood-like'
+        # Simple texture classification
+        if edge_density > 0.1:
+            if np.mean(gabor_responses) > 50:
+                return 'grass-like'
             else:
-                return 'uniform'
-        except:
-            return 'unknown'
+                return 'carpet-like'
+        elif edge_density < 0.05:
+            return 'wood-like'
+        else:
+            return 'uniform'
     
     def _detect_product_from_image(self, color_analysis, texture_analysis):
         """Detect product type from image analysis."""
-        try:
-            # Score each product type
-            scores = {
-                'artificial_grass': 0,
-                'carpet': 0,
-                'decking': 0
-            }
-            
-            # Color-based scoring
-            if color_analysis['is_green_dominant']:
-                scores['artificial_grass'] += 3
-            if color_analysis['is_grey_dominant']:
-                scores['carpet'] += 2
-            if color_analysis['is_brown_dominant']:
-                scores['decking'] += 2
-            
-            # Texture-based scoring
-            if texture_analysis['is_grass_like']:
-                scores['artificial_grass'] += 3
-            if texture_analysis['is_carpet_like']:
-                scores['carpet'] += 3
-            if texture_analysis['is_wood_like']:
-                scores['decking'] += 3
-            
-            # Return product with highest score
-            best_product = max(scores, key=scores.get)
-            confidence = scores[best_product] / 6.0  # Normalize to 0-1
-            
-            print(f"🔍 Product detection scores: {scores}")
-            print(f"✅ Detected: {best_product} (confidence: {confidence:.2f})")
-            
-            return best_product
-            
-        except Exception as e:
-            print(f"⚠️ Error detecting product: {e}")
-            return 'artificial_grass'  # Default fallback
+        # Score each product type
+        scores = {
+            'artificial_grass': 0,
+            'carpet': 0,
+            'decking': 0
+        }
+        
+        # Color-based scoring
+        if color_analysis['is_green_dominant']:
+            scores['artificial_grass'] += 3
+        if color_analysis['is_grey_dominant']:
+            scores['carpet'] += 2
+        if color_analysis['is_brown_dominant']:
+            scores['decking'] += 2
+        
+        # Texture-based scoring
+        if texture_analysis['is_grass_like']:
+            scores['artificial_grass'] += 3
+        if texture_analysis['is_carpet_like']:
+            scores['carpet'] += 3
+        if texture_analysis['is_wood_like']:
+            scores['decking'] += 3
+        
+        # Return product with highest score
+        best_product = max(scores, key=scores.get)
+        confidence = scores[best_product] / 6.0  # Normalize to 0-1
+        
+        logger.debug("🔍 Product detection scores: %s", scores)
+        logger.debug("✅ Detected: %s (confidence: %.2f)", best_product, confidence)
+        
+        return best_product
     
     def _generate_description_elements(self, product_type, color_analysis, texture_analysis):
         """Generate description elements based on analysis."""
-        try:
-            elements = []
-            
-            # Add color information
-            dominant_colors = [color['name'] for color in color_analysis['dominant_colors'][:2]]
-            if dominant_colors:
-                color_text = f"{', '.join(dominant_colors).title()} colored"
-                elements.append(color_text)
-            
-            # Add texture information
-            if texture_analysis['texture_type'] != 'unknown':
-                elements.append(f"{texture_analysis['texture_type']} texture")
-            
-            # Add product-specific elements
-            if product_type == 'artificial_grass':
-                elements.extend(['lush green', 'realistic appearance', 'natural look'])
-            elif product_type == 'carpet':
-                elements.extend(['soft feel', 'durable construction', 'comfortable'])
-            elif product_type == 'decking':
-                elements.extend(['weather resistant', 'low maintenance', 'durable'])
-            
-            return elements
-            
-        except Exception as e:
-            print(f"⚠️ Error generating description elements: {e}")
-            return []
+        elements = []
+        
+        # Add color information
+        dominant_colors = [color['name'] for color in color_analysis['dominant_colors'][:2]]
+        if dominant_colors:
+            color_text = f"{', '.join(dominant_colors).title()} colored"
+            elements.append(color_text)
+        
+        # Add texture information
+        if texture_analysis['texture_type'] != 'unknown':
+            elements.append(f"{texture_analysis['texture_type']} texture")
+        
+        # Add product-specific elements
+        if product_type == 'artificial_grass':
+            elements.extend(['lush green', 'realistic appearance', 'natural look'])
+        elif product_type == 'carpet':
+            elements.extend(['soft feel', 'durable construction', 'comfortable'])
+        elif product_type == 'decking':
+            elements.extend(['weather resistant', 'low maintenance', 'durable'])
+        
+        return elements
     
     def _calculate_confidence(self, color_analysis, texture_analysis, product_type):
         """Calculate confidence score for the analysis."""
-        try:
-            confidence = 0.5  # Base confidence
-            
-            # Color confidence
-            if color_analysis['dominant_colors']:
-                confidence += 0.2
-            
-            # Texture confidence
-            if texture_analysis['texture_type'] != 'unknown':
-                confidence += 0.2
-            
-            # Product-specific confidence
-            if product_type == 'artificial_grass' and color_analysis['is_green_dominant']:
-                confidence += 0.1
-            elif product_type == 'carpet' and (color_analysis['is_grey_dominant'] or color_analysis['is_brown_dominant']):
-                confidence += 0.1
-            elif product_type == 'decking' and color_analysis['is_brown_dominant']:
-                confidence += 0.1
-            
-            return min(confidence, 1.0)
-            
-        except:
-            return 0.5
+        confidence = 0.5  # Base confidence
+        
+        # Color confidence
+        if color_analysis['dominant_colors']:
+            confidence += 0.2
+        
+        # Texture confidence
+        if texture_analysis['texture_type'] != 'unknown':
+            confidence += 0.2
+        
+        # Product-specific confidence
+        if product_type == 'artificial_grass' and color_analysis['is_green_dominant']:
+            confidence += 0.1
+        elif product_type == 'carpet' and (color_analysis['is_grey_dominant'] or color_analysis['is_brown_dominant']):
+            confidence += 0.1
+        elif product_type == 'decking' and color_analysis['is_brown_dominant']:
+            confidence += 0.1
+        
+        return min(confidence, 1.0)
     
     def analyze_listing_images(self, image_paths):
         """Analyze multiple images for a listing."""
@@ -342,19 +459,30 @@ class AIImageAnalyzer:
             if not image_paths:
                 return {'success': False, 'error': 'No images provided'}
             
-            print(f"🔍 Analyzing {len(image_paths)} images for listing...")
+            logger.debug("🔍 Analyzing %d images for listing...", len(image_paths))
             
-            all_analyses = []
+            existing = []
             for i, image_path in enumerate(image_paths):
                 if os.path.exists(image_path):
-                    analysis = self.analyze_image(image_path)
-                    if analysis['success']:
-                        all_analyses.append(analysis)
-                        print(f"✅ Image {i+1} analyzed successfully")
-                    else:
-                        print(f"⚠️ Image {i+1} analysis failed: {analysis.get('error', 'Unknown error')}")
+                    existing.append((i, image_path))
+                else:
+                    logger.warning("⚠️ Image %d not found: %s", i + 1, image_path)
+            
+            # Decoding and the OpenCV kernels release the GIL, so images are
+            # analysed concurrently
+            analyses = []
+            if existing:
+                workers = min(MAX_ANALYSIS_WORKERS, len(existing))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    analyses = list(executor.map(self.analyze_image, [path for _, path in existing]))
+            
+            all_analyses = []
+            for (i, _), analysis in zip(existing, analyses):
+                if analysis['success']:
+                    all_analyses.append(analysis)
+                    logger.debug("✅ Image %d analyzed successfully", i + 1)
                 else:
-                    print(f"⚠️ Image {i+1} not found: {image_path}")
+                    logger.warning("⚠️ Image %d analysis failed: %s", i + 1, analysis.get('error', 'Unknown error'))
             
             if not all_analyses:
                 return {'success': False, 'error': 'No images could be analyzed'}
@@ -373,55 +501,30 @@ class AIImageAnalyzer:
             }
             
         except Exception as e:
-            print(f"⚠️ Error analyzing listing images: {e}")
+            logger.warning("⚠️ Error analyzing listing images: %s", e)
             return {'success': False, 'error': str(e)}
     
     def _combine_analyses(self, analyses):
         """Combine multiple image analyses into a single result."""
         try:
-            # Vote on product type
-            product_votes = {}
-            for analysis in analyses:
-                product_type = analysis['product_type']
-                product_votes[product_type] = product_votes.get(product_type, 0) + 1
-            
-            best_product = max(product_votes, key=product_votes.get)
-            
-            # Combine colors
-            all_colors = []
-            for analysis in analyses:
-                all_colors.extend(analysis['colors'])
-            
-            # Get most common colors
-            color_counts = {}
-            for color in all_colors:
-                color_name = color['name']
-                color_counts[color_name] = color_counts.get(color_name, 0) + 1
-            
-            top_colors = sorted(color_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-            
-            # Combine textures
-            texture_votes = {}
-            for analysis in analyses:
-                texture = analysis['texture']
-                texture_votes[texture] = texture_votes.get(texture, 0) + 1
-            
-            best_texture = max(texture_votes, key=texture_votes.get)
-            
-            # Combine description elements
-            all_elements = []
+            # Tally votes and counts in a single pass
+            product_votes = Counter()
+            texture_votes = Counter()
+            color_counts = Counter()
+            element_counts = Counter()
+            confidence_total = 0.0
             for analysis in analyses:
-                all_elements.extend(analysis['description_elements'])
-            
-            # Remove duplicates and get most common
-            element_counts = {}
-            for element in all_elements:
-                element_counts[element] = element_counts.get(element, 0) + 1
-            
-            top_elements = sorted(element_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-            
-            # Calculate average confidence
-            avg_confidence = sum(analysis['confidence'] for analysis in analyses) / len(analyses)
+                product_votes[analysis['product_type']] += 1
+                texture_votes[analysis['texture']] += 1
+                color_counts.update(color['name'] for color in analysis['colors'])
+                element_counts.update(analysis['description_elements'])
+                confidence_total += analysis['confidence']
+            
+            best_product = product_votes.most_common(1)[0][0]
+            best_texture = texture_votes.most_common(1)[0][0]
+            top_colors = color_counts.most_common(3)
+            top_elements = element_counts.most_common(5)
+            avg_confidence = confidence_total / len(analyses)
             
             return {
                 'product_type': best_product,
@@ -432,7 +535,7 @@ class AIImageAnalyzer:
             }
             
         except Exception as e:
-            print(f"⚠️ Error combining analyses: {e}")
+            logger.warning("⚠️ Error combining analyses: %s", e)
             return {
                 'product_type': 'artificial_grass',
                 'colors': [],
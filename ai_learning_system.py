@@ -5,13 +5,229 @@ Uses Cursor AI API to learn from listing data and generate intelligent variation
 """
 
 import os
+import re
 import json
-import requests
+import asyncio
+import atexit
+import logging
+import weakref
 import sqlite3
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import hashlib
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Installed alongside the openai package; used to tune its connection pool
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Emoji/non-ASCII and digit detection for listing text
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+_DIGIT_RE = re.compile(r'\d')
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Listings considered when learning an account's style. The partial index
+# repeats this predicate verbatim so SQLite can match it to the queries, and
+# covers the category counts without touching the table
+LIVE_LISTINGS_FILTER = "status IS NULL OR status <> 'deleted'"
+LIVE_LISTINGS_INDEX = f'''
+    CREATE INDEX IF NOT EXISTS idx_listings_live_category
+    ON listings(category) WHERE {LIVE_LISTINGS_FILTER}
+'''
+
+# All per-listing features, aggregated in a single scan on the SQLite side.
+# WORD_COUNT and PRICE_VALUE are registered in _get_conn(). Text contains
+# emoji/non-ASCII characters exactly when its UTF-8 byte length exceeds its
+# character length, so that check stays in SQL.
+LISTING_STATS_QUERY = f'''
+    SELECT
+        COUNT(*),
+        AVG(CASE WHEN title <> '' THEN LENGTH(title) END),
+        AVG(CASE WHEN title <> '' THEN WORD_COUNT(title) END),
+        AVG(CASE WHEN title <> '' THEN LENGTH(CAST(title AS BLOB)) > LENGTH(title) END),
+        AVG(CASE WHEN title <> '' THEN title GLOB '*[0-9]*' END),
+        AVG(CASE WHEN description <> '' THEN LENGTH(description) END),
+        AVG(CASE WHEN description <> ''
+            THEN LENGTH(description) - LENGTH(REPLACE(description, char(10), '')) + 1 END),
+        AVG(CASE WHEN description <> ''
+            THEN LENGTH(CAST(description AS BLOB)) > LENGTH(description) END),
+        AVG(CASE WHEN description <> ''
+            THEN INSTR(description, '•') > 0 OR INSTR(description, '-') > 0 END),
+        MIN(price_value),
+        MAX(price_value),
+        AVG(price_value)
+    FROM (
+        SELECT title, description, PRICE_VALUE(price) AS price_value
+        FROM listings
+        WHERE {LIVE_LISTINGS_FILTER}
+    )
+'''
+
+CATEGORY_COUNTS_QUERY = f'''
+    SELECT category, COUNT(*)
+    FROM listings
+    WHERE category <> '' AND ({LIVE_LISTINGS_FILTER})
+    GROUP BY category
+'''
+
+
+# (epoch second, ISO string) of the last timestamp built by _now_iso()
+_last_timestamp = (0, '')
+
+
+def _now_iso() -> str:
+    """Current local time as a second-resolution ISO string, rebuilt at most once a second."""
+    global _last_timestamp
+    second = int(time.time())
+    cached_second, cached = _last_timestamp
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second).isoformat()
+        _last_timestamp = (second, cached)
+    return cached
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _word_count(text):
+    """SQLite WORD_COUNT(): number of whitespace-separated words."""
+    return len(text.split()) if text else 0
+
+
+def _price_value(price):
+    """SQLite PRICE_VALUE(): the digits of a price string as an int, or NULL."""
+    if not price:
+        return None
+    price_clean = _NON_DIGIT_RE.sub('', str(price))
+    return int(price_clean) if price_clean else None
+
+# Applied once to every cached listings connection
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA temp_store=MEMORY',
+)
+
+VARIATIONS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS variations (
+        key TEXT PRIMARY KEY,
+        account TEXT NOT NULL,
+        type TEXT NOT NULL,
+        original TEXT,
+        variation TEXT,
+        ts TEXT
+    )
+'''
+VARIATIONS_INDEX = 'CREATE INDEX IF NOT EXISTS idx_variations_account ON variations(account, type)'
+INSERT_VARIATION_QUERY = '''
+    INSERT OR REPLACE INTO variations (key, account, type, original, variation, ts)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Chat completion settings shared by the sync and async OpenAI calls
+OPENAI_CHAT_PARAMS = {
+    'model': "gpt-3.5-turbo",  # Cost-effective model
+    'max_tokens': 500,  # Limit tokens to control costs
+    'temperature': 0.7,  # Balanced creativity
+    'top_p': 0.9,
+}
+OPENAI_SYSTEM_PROMPT = "You are an expert Facebook Marketplace listing optimizer. Generate unique, engaging variations that are optimized for Facebook Marketplace search and engagement."
+
+# Upper bound on in-flight requests during bulk generation
+OPENAI_MAX_CONCURRENCY = 8
+
+# HTTP settings for the OpenAI clients; keep-alive connections are reused
+# across calls so only the first request pays for the TLS handshake
+OPENAI_TIMEOUT = 30.0
+OPENAI_POOL_LIMITS = {'max_keepalive_connections': 32, 'max_connections': 64}
+
+# Successful responses are reused for identical prompts for a week
+PROMPT_CACHE_TTL = 7 * 86400
+
+PROMPT_CACHE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS prompt_cache (
+        key TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+'''
+
+
+def _chat_messages(prompt: str) -> List[Dict]:
+    """Build the chat messages for a variation prompt."""
+    return [
+        {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _prompt_cache_key(prompt: str) -> str:
+    """Cache key for a prompt under the current chat settings."""
+    key = f"{OPENAI_CHAT_PARAMS['model']}|{OPENAI_CHAT_PARAMS['temperature']}|{prompt}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _openai_client_kwargs(async_client: bool = False) -> Dict:
+    """Keyword arguments giving an OpenAI client a tuned, pooled HTTP client."""
+    if httpx is None:
+        return {'timeout': OPENAI_TIMEOUT}
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    return {'http_client': client_class(timeout=OPENAI_TIMEOUT, limits=httpx.Limits(**OPENAI_POOL_LIMITS))}
+
+
+def _variation_row(entry: Dict) -> Tuple:
+    """Parameters for INSERT_VARIATION_QUERY from a variation entry dict."""
+    return (
+        entry['key'],
+        entry.get('account', ''),
+        entry.get('type', ''),
+        entry.get('original'),
+        entry.get('variation'),
+        entry.get('timestamp')
+    )
+
+
+def _chat_result(response) -> Dict:
+    """Convert a chat completion into the result dict used by the generators."""
+    return {
+        'success': True,
+        'content': response.choices[0].message.content.strip(),
+        'usage': response.usage  # Track token usage for cost monitoring
+    }
+
+# Instances with learning data that may still need writing at exit
+_live_systems = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_systems():
+    """Write any unsaved learning data when the interpreter exits."""
+    for system in list(_live_systems):
+        system.flush()
+
+
 class AILearningSystem:
     """AI-powered learning system for generating intelligent listing variations."""
     
@@ -27,46 +243,228 @@ class AILearningSystem:
         self.api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
         
         if not self.api_key:
-            print("⚠️ No OpenAI API key found. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
-            print("   You can get your API key from: https://platform.openai.com/api-keys")
+            logger.warning("⚠️ No OpenAI API key found. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
+            logger.warning("   You can get your API key from: https://platform.openai.com/api-keys")
         
-        # Learning data storage
+        # Learning data storage; variations live in their own SQLite
+        # database so storing one never rewrites the whole learning file
         self.learning_data_file = os.path.join(base_dir, 'ai_learning_data.json')
+        self.variations_db_file = os.path.join(base_dir, 'ai_learning_variations.db')
+        self.legacy_variations_file = os.path.join(base_dir, 'ai_learning_variations.jsonl')
+        self._variations_db: Optional[sqlite3.Connection] = None
+        
+        # Learning data changes are written by flush(); inside a `with`
+        # block they are coalesced into a single write when it exits
+        self._dirty = False
+        self._batch_depth = 0
+        _live_systems.add(self)
+        
+        # account -> (id of the analysis it was built from, context string)
+        self._context_cache: Dict[str, Tuple[int, str]] = {}
         self.load_learning_data()
+
+        # Open listings.db connections, keyed by account
+        self._conn_cache: Dict[str, sqlite3.Connection] = {}
+        
+        # Created on first use by _get_title_variator()
+        self._title_variator = None
+        
+        # OpenAI client, created on first use by _get_openai_client()
+        self._client = None
+        
+        # On-disk prompt -> response cache, opened by _get_prompt_cache()
+        self.prompt_cache_file = os.path.join(base_dir, 'ai_prompt_cache.db')
+        self._prompt_cache: Optional[sqlite3.Connection] = None
+    
+    def _get_conn(self, account: str) -> sqlite3.Connection:
+        """Return the cached connection to an account's listings database."""
+        conn = self._conn_cache.get(account)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.base_dir, account, 'listings.db'))
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            conn.create_function('WORD_COUNT', 1, _word_count, deterministic=True)
+            conn.create_function('PRICE_VALUE', 1, _price_value, deterministic=True)
+            conn.execute(LIVE_LISTINGS_INDEX)
+            self._conn_cache[account] = conn
+        return conn
+    
+    def _get_title_variator(self):
+        """Return the shared TitleVariator, creating it on first use."""
+        if self._title_variator is None:
+            from title_variator import TitleVariator
+            self._title_variator = TitleVariator()
+        return self._title_variator
+    
+    def _get_openai_client(self):
+        """Return the shared OpenAI client, creating it on first use."""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key, **_openai_client_kwargs())
+        return self._client
+    
+    def _get_variations_db(self) -> sqlite3.Connection:
+        """Return the variations database connection, creating it on first use."""
+        if self._variations_db is None:
+            os.makedirs(self.base_dir, exist_ok=True)
+            conn = sqlite3.connect(self.variations_db_file)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(VARIATIONS_SCHEMA)
+            conn.execute(VARIATIONS_INDEX)
+            self._variations_db = conn
+            self._migrate_variations_file()
+        return self._variations_db
+    
+    def _get_prompt_cache(self) -> sqlite3.Connection:
+        """Return the prompt cache connection, creating the database on first use."""
+        if self._prompt_cache is None:
+            os.makedirs(self.base_dir, exist_ok=True)
+            conn = sqlite3.connect(self.prompt_cache_file)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(PROMPT_CACHE_SCHEMA)
+            self._prompt_cache = conn
+        return self._prompt_cache
+    
+    def _get_cached_response(self, key: str) -> Optional[Dict]:
+        """Return a cached successful response for a prompt key, if still fresh."""
+        try:
+            row = self._get_prompt_cache().execute(
+                'SELECT content FROM prompt_cache WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("⚠️ Error reading AI prompt cache: %s", e)
+            return None
+        if row is None:
+            return None
+        return {'success': True, 'content': row[0], 'usage': None, 'cached': True}
+    
+    def _cache_response(self, key: str, response: Dict):
+        """Store a successful response in the prompt cache."""
+        try:
+            conn = self._get_prompt_cache()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO prompt_cache (key, content, expires_at) VALUES (?, ?, ?)',
+                    (key, response['content'], time.time() + PROMPT_CACHE_TTL)
+                )
+        except sqlite3.Error as e:
+            logger.warning("⚠️ Error writing AI prompt cache: %s", e)
+    
+    def clear_cache(self):
+        """Remove every cached OpenAI response."""
+        conn = self._get_prompt_cache()
+        conn.execute('DELETE FROM prompt_cache')
+        conn.commit()
+        logger.info("AI prompt cache cleared")
+    
+    def close(self):
+        """Save pending learning data and close all database connections and the OpenAI client."""
+        self.flush()
+        for conn in self._conn_cache.values():
+            # Refresh planner statistics for the live-listings index if needed
+            conn.execute('PRAGMA optimize')
+            conn.close()
+        self._conn_cache.clear()
+        if self._variations_db is not None:
+            self._variations_db.close()
+            self._variations_db = None
+        if self._prompt_cache is not None:
+            self._prompt_cache.close()
+            self._prompt_cache = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
     
     def load_learning_data(self):
         """Load existing learning data from file."""
-        try:
-            if os.path.exists(self.learning_data_file):
-                with open(self.learning_data_file, 'r', encoding='utf-8') as f:
-                    self.learning_data = json.load(f)
-                print(f"Loaded AI learning data: {len(self.learning_data.get('accounts', {}))} accounts")
+        self._context_cache.clear()
+        if os.path.exists(self.learning_data_file):
+            try:
+                with open(self.learning_data_file, 'rb') as f:
+                    self.learning_data = _json_loads(f.read())
+            except (OSError, ValueError) as e:  # JSON decode errors are ValueErrors
+                logger.warning("⚠️ Error loading learning data: %s", e)
             else:
-                self.learning_data = {
-                    'accounts': {},
-                    'global_patterns': {},
-                    'success_metrics': {},
-                    'last_updated': datetime.now().isoformat()
-                }
-                print("Initialized new AI learning data")
-        except Exception as e:
-            print(f"⚠️ Error loading learning data: {e}")
-            self.learning_data = {
-                'accounts': {},
-                'global_patterns': {},
-                'success_metrics': {},
-                'last_updated': datetime.now().isoformat()
-            }
+                logger.info("Loaded AI learning data: %d accounts", len(self.learning_data.get('accounts', {})))
+                self._migrate_variations()
+                return
+        else:
+            logger.info("Initialized new AI learning data")
+        self.learning_data = {
+            'accounts': {},
+            'global_patterns': {},
+            'success_metrics': {},
+            'last_updated': _now_iso()
+        }
     
     def save_learning_data(self):
         """Save learning data to file."""
+        self.learning_data['last_updated'] = _now_iso()
+        data = _json_dumps(self.learning_data, indent=True)
         try:
-            self.learning_data['last_updated'] = datetime.now().isoformat()
-            with open(self.learning_data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.learning_data, f, indent=2, ensure_ascii=False)
-            print("AI learning data saved")
-        except Exception as e:
-            print(f"⚠️ Error saving learning data: {e}")
+            with open(self.learning_data_file, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning("⚠️ Error saving learning data: %s", e)
+        else:
+            logger.debug("AI learning data saved")
+    
+    def flush(self):
+        """Save learning data if it changed since the last save."""
+        if self._dirty:
+            self.save_learning_data()
+            self._dirty = False
+    
+    def _mark_dirty(self):
+        """Record a learning data change, saving now unless inside a `with` block."""
+        self._dirty = True
+        if not self._batch_depth:
+            self.flush()
+    
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
+        return False
+    
+    def store_variations_bulk(self, entries: List[Dict]):
+        """
+        Store many variation entries in a single transaction.
+        
+        Args:
+            entries (List[Dict]): Entries with key, account, type, original, variation and timestamp
+        """
+        conn = self._get_variations_db()
+        with conn:
+            conn.executemany(INSERT_VARIATION_QUERY, [_variation_row(entry) for entry in entries])
+    
+    def _migrate_variations(self):
+        """Move variations stored inside the learning JSON into the variations database."""
+        variations = self.learning_data.pop('variations', None)
+        if not variations:
+            return
+        self.store_variations_bulk([dict(entry, key=key) for key, entry in variations.items()])
+        self._mark_dirty()
+        logger.info("Migrated %d AI variations to %s", len(variations), self.variations_db_file)
+    
+    def _migrate_variations_file(self):
+        """Move variations from the older JSONL file into the variations database."""
+        if not os.path.exists(self.legacy_variations_file):
+            return
+        with open(self.legacy_variations_file, 'rb') as f:
+            entries = [_json_loads(line) for line in f if line.strip()]
+        self.store_variations_bulk(entries)
+        os.remove(self.legacy_variations_file)
+        logger.info("Migrated %d AI variations to %s", len(entries), self.variations_db_file)
+    
+    def _count_variations(self) -> int:
+        """Count stored variations."""
+        return self._get_variations_db().execute('SELECT COUNT(*) FROM variations').fetchone()[0]
     
     def analyze_account_listings(self, account: str) -> Dict:
         """
@@ -78,129 +476,67 @@ class AILearningSystem:
         Returns:
             Dict: Analysis results
         """
+        logger.info("Analyzing listings for account: %s", account)
+        
+        # Get listings from database
+        db_path = os.path.join(self.base_dir, account, 'listings.db')
+        if not os.path.exists(db_path):
+            logger.warning("⚠️ No database found for account: %s", account)
+            return {'success': False, 'error': 'No database found'}
+        
+        # Analyze patterns
         try:
-            print(f"Analyzing listings for account: {account}")
-            
-            # Get listings from database
-            db_path = os.path.join(self.base_dir, account, 'listings.db')
-            if not os.path.exists(db_path):
-                print(f"⚠️ No database found for account: {account}")
-                return {'success': False, 'error': 'No database found'}
-            
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get all listings
-            cursor.execute('''
-                SELECT title, description, category, price, status, created_at, updated_at
-                FROM listings 
-                WHERE status != 'deleted' OR status IS NULL
-                ORDER BY created_at DESC
-            ''')
-            
-            listings = cursor.fetchall()
-            conn.close()
-            
-            if not listings:
-                print(f"⚠️ No listings found for account: {account}")
-                return {'success': False, 'error': 'No listings found'}
-            
-            # Analyze patterns
-            analysis = self._analyze_listing_patterns(listings, account)
-            
-            # Store analysis in learning data
-            if account not in self.learning_data['accounts']:
-                self.learning_data['accounts'][account] = {}
-            
-            self.learning_data['accounts'][account] = {
-                'analysis': analysis,
-                'last_analyzed': datetime.now().isoformat(),
-                'total_listings': len(listings)
-            }
-            
-            self.save_learning_data()
-            
-            print(f"✅ Analyzed {len(listings)} listings for account: {account}")
-            return {'success': True, 'analysis': analysis}
-            
-        except Exception as e:
-            print(f"❌ Error analyzing account listings: {e}")
+            analysis = self._analyze_listing_patterns(self._get_conn(account), account)
+        except sqlite3.Error as e:
+            logger.exception("❌ Error analyzing account listings: %s", e)
             return {'success': False, 'error': str(e)}
+        
+        if not analysis['total_listings']:
+            logger.warning("⚠️ No listings found for account: %s", account)
+            return {'success': False, 'error': 'No listings found'}
+        
+        # Store analysis in learning data
+        self.learning_data['accounts'][account] = {
+            'analysis': analysis,
+            'last_analyzed': _now_iso(),
+            'total_listings': analysis['total_listings']
+        }
+        
+        self._mark_dirty()
+        self._context_cache.pop(account, None)
+        
+        logger.info("✅ Analyzed %d listings for account: %s", analysis['total_listings'], account)
+        return {'success': True, 'analysis': analysis}
     
-    def _analyze_listing_patterns(self, listings: List, account: str) -> Dict:
-        """Analyze patterns in listing data."""
-        try:
-            # Extract patterns
-            title_patterns = []
-            description_patterns = []
-            category_patterns = {}
-            price_patterns = []
-            
-            for listing in listings:
-                title, description, category, price, status, created_at, updated_at = listing
-                
-                # Title analysis
-                if title:
-                    title_patterns.append({
-                        'text': title,
-                        'length': len(title),
-                        'words': len(title.split()),
-                        'has_emoji': any(ord(char) > 127 for char in title),
-                        'has_numbers': any(char.isdigit() for char in title)
-                    })
-                
-                # Description analysis
-                if description:
-                    description_patterns.append({
-                        'text': description,
-                        'length': len(description),
-                        'lines': len(description.split('\n')),
-                        'has_emoji': any(ord(char) > 127 for char in description),
-                        'has_bullets': '•' in description or '-' in description
-                    })
-                
-                # Category analysis
-                if category:
-                    category_patterns[category] = category_patterns.get(category, 0) + 1
-                
-                # Price analysis
-                if price:
-                    try:
-                        # Extract numeric price
-                        price_clean = ''.join(filter(str.isdigit, price))
-                        if price_clean:
-                            price_patterns.append(int(price_clean))
-                    except:
-                        pass
-            
-            # Calculate statistics
-            analysis = {
-                'title_stats': {
-                    'avg_length': sum(p['length'] for p in title_patterns) / len(title_patterns) if title_patterns else 0,
-                    'avg_words': sum(p['words'] for p in title_patterns) / len(title_patterns) if title_patterns else 0,
-                    'emoji_usage': sum(1 for p in title_patterns if p['has_emoji']) / len(title_patterns) if title_patterns else 0,
-                    'number_usage': sum(1 for p in title_patterns if p['has_numbers']) / len(title_patterns) if title_patterns else 0
-                },
-                'description_stats': {
-                    'avg_length': sum(p['length'] for p in description_patterns) / len(description_patterns) if description_patterns else 0,
-                    'avg_lines': sum(p['lines'] for p in description_patterns) / len(description_patterns) if description_patterns else 0,
-                    'emoji_usage': sum(1 for p in description_patterns if p['has_emoji']) / len(description_patterns) if description_patterns else 0,
-                    'bullet_usage': sum(1 for p in description_patterns if p['has_bullets']) / len(description_patterns) if description_patterns else 0
-                },
-                'category_distribution': category_patterns,
-                'price_stats': {
-                    'min': min(price_patterns) if price_patterns else 0,
-                    'max': max(price_patterns) if price_patterns else 0,
-                    'avg': sum(price_patterns) / len(price_patterns) if price_patterns else 0
-                },
-                'total_listings': len(listings)
-            }
-            
-            return analysis
-            
-        except Exception as e:
-            print(f"❌ Error analyzing patterns: {e}")
-            return {}
+    def _analyze_listing_patterns(self, conn: sqlite3.Connection, account: str) -> Dict:
+        """Analyze patterns in an account's listings with SQL aggregation."""
+        (total, title_length, title_words, title_emoji, title_numbers,
+         desc_length, desc_lines, desc_emoji, desc_bullets,
+         price_min, price_max, price_avg) = conn.execute(LISTING_STATS_QUERY).fetchone()
+        
+        analysis = {
+            'title_stats': {
+                'avg_length': title_length or 0,
+                'avg_words': title_words or 0,
+                'emoji_usage': title_emoji or 0,
+                'number_usage': title_numbers or 0
+            },
+            'description_stats': {
+                'avg_length': desc_length or 0,
+                'avg_lines': desc_lines or 0,
+                'emoji_usage': desc_emoji or 0,
+                'bullet_usage': desc_bullets or 0
+            },
+            'category_distribution': dict(conn.execute(CATEGORY_COUNTS_QUERY).fetchall()),
+            'price_stats': {
+                'min': price_min or 0,
+                'max': price_max or 0,
+                'avg': price_avg or 0
+            },
+            'total_listings': total
+        }
+        
+        return analysis
     
     def generate_ai_title_variation(self, account: str, original_title: str, context: Dict = None) -> Dict:
         """
@@ -214,25 +550,32 @@ class AILearningSystem:
         Returns:
             Dict: Variation result
         """
-        try:
-            if not self.api_key:
-                return {
-                    'success': False,
-                    'error': 'No Cursor API key available',
-                    'variation': original_title
-                }
-            
-            print(f"🤖 Generating AI title variation for: {original_title[:50]}...")
-            
-            # Get account learning data
-            account_data = self.learning_data.get('accounts', {}).get(account, {})
-            analysis = account_data.get('analysis', {})
-            
-            # Build context for AI
-            ai_context = self._build_ai_context(account, analysis, context)
-            
-            # Create AI prompt
-            prompt = f"""
+        if not self.api_key:
+            return {
+                'success': False,
+                'error': 'No Cursor API key available',
+                'variation': original_title
+            }
+        
+        logger.debug("🤖 Generating AI title variation for: %.50s...", original_title)
+        
+        # Get account learning data
+        analysis = self._get_account_analysis(account)
+        
+        prompt = self._build_title_prompt(account, original_title, analysis, context)
+        
+        # Call OpenAI API
+        response = self._call_openai_api(prompt)
+        
+        return self._title_variation_result(account, original_title, analysis, response)
+    
+    def _build_title_prompt(self, account: str, original_title: str, analysis: Dict, context: Dict = None) -> str:
+        """Build the OpenAI prompt for a title variation."""
+        # Build context for AI
+        ai_context = self._build_ai_context(account, analysis, context)
+        
+        # Create AI prompt
+        prompt = f"""
 You are an expert Facebook Marketplace listing optimizer. Generate ONE unique, engaging title variation for this listing.
 
 Original Title: "{original_title}"
@@ -257,50 +600,42 @@ Generate ONE title variation ONLY. Start your response with "VARIATION:" followe
 Do NOT include multiple variations. Do NOT repeat the title.
 """
 
-            # Call OpenAI API
-            response = self._call_openai_api(prompt)
-
-            if response['success']:
-                print(f"🤖 [AI Response] Raw content: {response['content'][:200]}...")
-                variations = self._parse_ai_variations(response['content'])
+        return prompt
+    
+    def _title_variation_result(self, account: str, original_title: str, analysis: Dict, response: Dict) -> Dict:
+        """Turn an OpenAI response into a title variation result."""
+        if response['success']:
+            logger.debug("🤖 [AI Response] Raw content: %.200s...", response['content'])
+            variations = self._parse_ai_variations(response['content'])
+            
+            if variations:
+                # Select best variation
+                best_variation = self._select_best_variation(variations, original_title, analysis)
+                
+                # Apply length limit to AI-generated title and remove duplications
+                title_variator = self._get_title_variator()
+                best_variation = title_variator._ensure_title_length_limit(best_variation, 100)
                 
-                if variations:
-                    # Select best variation
-                    best_variation = self._select_best_variation(variations, original_title, analysis)
-                    
-                    # Apply length limit to AI-generated title and remove duplications
-                    from title_variator import TitleVariator
-                    title_variator = TitleVariator()
-                    best_variation = title_variator._ensure_title_length_limit(best_variation, 100)
-                    
-                    # Store learning data
-                    self._store_variation_learning(account, original_title, best_variation, 'title')
-                    
-                    return {
-                        'success': True,
-                        'variation': best_variation,
-                        'type': 'ai_generated',
-                        'all_variations': variations,
-                        'confidence': 0.9
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Could not parse AI variations',
-                        'variation': original_title
-                    }
+                # Store learning data
+                self._store_variation_learning(account, original_title, best_variation, 'title')
+                
+                return {
+                    'success': True,
+                    'variation': best_variation,
+                    'type': 'ai_generated',
+                    'all_variations': variations,
+                    'confidence': 0.9
+                }
             else:
                 return {
                     'success': False,
-                    'error': response['error'],
+                    'error': 'Could not parse AI variations',
                     'variation': original_title
                 }
-                
-        except Exception as e:
-            print(f"❌ Error generating AI title variation: {e}")
+        else:
             return {
                 'success': False,
-                'error': str(e),
+                'error': response['error'],
                 'variation': original_title
             }
     
@@ -316,22 +651,21 @@ Do NOT include multiple variations. Do NOT repeat the title.
         Returns:
             Dict: Variation result
         """
-        try:
-            if not self.api_key:
-                return {
-                    'success': False,
-                    'error': 'No Cursor API key available',
-                    'variation': original_description
-                }
-            
-            print(f"🤖 Generating AI description variation for: {original_description[:50]}...")
-            
-            # Get account learning data
-            account_data = self.learning_data.get('accounts', {}).get(account, {})
-            analysis = account_data.get('analysis', {})
-            
-            # Create AI prompt
-            prompt = f"""
+        if not self.api_key:
+            return {
+                'success': False,
+                'error': 'No Cursor API key available',
+                'variation': original_description
+            }
+        
+        logger.debug("🤖 Generating AI description variation for: %.50s...", original_description)
+        
+        # Get account learning data
+        analysis = self._get_account_analysis(account)
+        desc_stats = analysis.get('description_stats', {})
+        
+        # Create AI prompt
+        prompt = f"""
 You are an expert Facebook Marketplace listing optimizer. Generate a unique, engaging description variation for this listing:
 
 Original Description:
@@ -340,260 +674,291 @@ Original Description:
 Account Context:
 - Account: {account}
 - Total Listings: {analysis.get('total_listings', 0)}
-- Average Description Length: {analysis.get('description_stats', {}).get('avg_length', 0):.0f} characters
-- Average Lines: {analysis.get('description_stats', {}).get('avg_lines', 0):.1f}
-- Emoji Usage Rate: {analysis.get('description_stats', {}).get('emoji_usage', 0):.1%}
-- Bullet Usage Rate: {analysis.get('description_stats', {}).get('bullet_usage', 0):.1%}
+- Average Description Length: {desc_stats.get('avg_length', 0):.0f} characters
+- Average Lines: {desc_stats.get('avg_lines', 0):.1f}
+- Emoji Usage Rate: {desc_stats.get('emoji_usage', 0):.1%}
+- Bullet Usage Rate: {desc_stats.get('bullet_usage', 0):.1%}
 
 Requirements:
 1. Keep all essential product information
 2. Make it unique and engaging
 3. Optimize for Facebook Marketplace
-4. Maintain appropriate length ({analysis.get('description_stats', {}).get('avg_length', 200):.0f} chars average)
-5. Use emojis if appropriate ({analysis.get('description_stats', {}).get('emoji_usage', 0):.1%} usage rate)
-6. Use bullet points if appropriate ({analysis.get('description_stats', {}).get('bullet_usage', 0):.1%} usage rate)
+4. Maintain appropriate length ({desc_stats.get('avg_length', 200):.0f} chars average)
+5. Use emojis if appropriate ({desc_stats.get('emoji_usage', 0):.1%} usage rate)
+6. Use bullet points if appropriate ({desc_stats.get('bullet_usage', 0):.1%} usage rate)
 7. Keep the same structure and key information
 
 Generate 3 different description variations, each on a new line starting with "VARIATION:"
 """
+        
+        # Call OpenAI API
+        response = self._call_openai_api(prompt)
+        
+        if response['success']:
+            variations = self._parse_ai_variations(response['content'])
             
-            # Call OpenAI API
-            response = self._call_openai_api(prompt)
-            
-            if response['success']:
-                variations = self._parse_ai_variations(response['content'])
+            if variations:
+                # Select best variation
+                best_variation = self._select_best_variation(variations, original_description, analysis)
+                
+                # Store learning data
+                self._store_variation_learning(account, original_description, best_variation, 'description')
                 
-                if variations:
-                    # Select best variation
-                    best_variation = self._select_best_variation(variations, original_description, analysis)
-                    
-                    # Store learning data
-                    self._store_variation_learning(account, original_description, best_variation, 'description')
-                    
-                    return {
-                        'success': True,
-                        'variation': best_variation,
-                        'type': 'ai_generated',
-                        'all_variations': variations,
-                        'confidence': 0.9
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Could not parse AI variations',
-                        'variation': original_description
-                    }
+                return {
+                    'success': True,
+                    'variation': best_variation,
+                    'type': 'ai_generated',
+                    'all_variations': variations,
+                    'confidence': 0.9
+                }
             else:
                 return {
                     'success': False,
-                    'error': response['error'],
+                    'error': 'Could not parse AI variations',
                     'variation': original_description
                 }
-                
-        except Exception as e:
-            print(f"❌ Error generating AI description variation: {e}")
+        else:
             return {
                 'success': False,
-                'error': str(e),
+                'error': response['error'],
                 'variation': original_description
             }
     
-    def _call_openai_api(self, prompt: str) -> Dict:
-        """Call OpenAI API with the given prompt."""
+    def _call_openai_api(self, prompt: str, no_cache: bool = False) -> Dict:
+        """Call OpenAI API with the given prompt, reusing cached responses unless no_cache is set."""
+        key = _prompt_cache_key(prompt)
+        if not no_cache:
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                logger.debug("🤖 Using cached OpenAI response")
+                return cached
+        
+        logger.debug("🤖 Calling OpenAI API...")
+        
         try:
-            print("🤖 Calling OpenAI API...")
-            
-            # Import OpenAI
-            try:
-                import openai
-            except ImportError:
-                print("❌ OpenAI package not installed. Install with: pip install openai")
-                return {
-                    'success': False,
-                    'error': 'OpenAI package not installed'
-                }
-            
-            # Set API key
-            openai.api_key = self.api_key
-            
-            # Call OpenAI API
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",  # Cost-effective model
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert Facebook Marketplace listing optimizer. Generate unique, engaging variations that are optimized for Facebook Marketplace search and engagement."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,  # Limit tokens to control costs
-                temperature=0.7,  # Balanced creativity
-                top_p=0.9
+            import openai
+        except ImportError:
+            logger.error("❌ OpenAI package not installed. Install with: pip install openai")
+            return {
+                'success': False,
+                'error': 'OpenAI package not installed'
+            }
+        
+        try:
+            response = self._get_openai_client().chat.completions.create(
+                messages=_chat_messages(prompt), **OPENAI_CHAT_PARAMS
             )
-            
-            content = response.choices[0].message.content.strip()
-            
+        except openai.OpenAIError as e:  # Also wraps httpx transport errors
+            logger.error("❌ Error calling OpenAI API: %s", e)
             return {
-                'success': True,
-                'content': content,
-                'usage': response.usage  # Track token usage for cost monitoring
+                'success': False,
+                'error': str(e)
             }
-            
-        except Exception as e:
-            print(f"❌ Error calling OpenAI API: {e}")
+        
+        result = _chat_result(response)
+        self._cache_response(key, result)
+        return result
+    
+    async def _acall_openai_api(self, client, semaphore: asyncio.Semaphore, prompt: str) -> Dict:
+        """Async version of _call_openai_api, limited by the given semaphore."""
+        import openai
+        try:
+            async with semaphore:
+                response = await client.chat.completions.create(messages=_chat_messages(prompt), **OPENAI_CHAT_PARAMS)
+            return _chat_result(response)
+        except openai.OpenAIError as e:
+            logger.error("❌ Error calling OpenAI API: %s", e)
             return {
                 'success': False,
                 'error': str(e)
             }
     
+    async def agenerate_ai_title_variations(self, account: str, titles: List[str], context: Dict = None) -> List[Dict]:
+        """
+        Generate title variations for many titles with concurrent OpenAI calls.
+        
+        Args:
+            account (str): Account name
+            titles (List[str]): Original titles
+            context (Dict): Additional context
+            
+        Returns:
+            List[Dict]: One variation result per title, in the same order
+        """
+        if not self.api_key:
+            return [{'success': False, 'error': 'No Cursor API key available', 'variation': title} for title in titles]
+        
+        try:
+            import openai
+        except ImportError:
+            logger.error("❌ OpenAI package not installed. Install with: pip install openai")
+            return [{'success': False, 'error': 'OpenAI package not installed', 'variation': title} for title in titles]
+        
+        logger.info("🤖 Generating AI title variations for %d titles...", len(titles))
+        analysis = self._get_account_analysis(account)
+        keys = []
+        prompts = {}  # One prompt per distinct key; repeated titles share a call
+        for title in titles:
+            prompt = self._build_title_prompt(account, title, analysis, context)
+            key = _prompt_cache_key(prompt)
+            keys.append(key)
+            prompts.setdefault(key, prompt)
+        
+        responses = {key: self._get_cached_response(key) for key in prompts}
+        missing = [key for key, response in responses.items() if response is None]
+        
+        if missing:
+            # The async client is bound to the running event loop, so it lives
+            # only for this batch
+            semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+            async with openai.AsyncOpenAI(api_key=self.api_key, **_openai_client_kwargs(async_client=True)) as client:
+                fetched = await asyncio.gather(
+                    *(self._acall_openai_api(client, semaphore, prompts[key]) for key in missing)
+                )
+            for key, response in zip(missing, fetched):
+                if response['success']:
+                    self._cache_response(key, response)
+                responses[key] = response
+        
+        return [
+            self._title_variation_result(account, title, analysis, responses[key])
+            for title, key in zip(titles, keys)
+        ]
+    
+    def generate_ai_title_variations_bulk(self, account: str, titles: List[str], context: Dict = None) -> List[Dict]:
+        """Blocking wrapper around agenerate_ai_title_variations()."""
+        return asyncio.run(self.agenerate_ai_title_variations(account, titles, context))
+    
     def _parse_ai_variations(self, content: str) -> List[str]:
         """Parse AI-generated variations from response content."""
-        try:
-            variations = []
-            lines = content.split('\n')
-
-            for line in lines:
-                if line.strip().startswith('VARIATION:'):
-                    variation = line.replace('VARIATION:', '').strip()
-                    if variation:
-                        # SAFETY: Clean and validate the variation
-                        variation = self._clean_variation(variation)
-                        variations.append(variation)
-                        # CRITICAL: Only take the FIRST variation, ignore the rest
-                        break
-
-            # If no VARIATION: prefix found, try to extract first line as variation
-            if not variations and content.strip():
-                first_line = content.strip().split('\n')[0]
-                first_line = self._clean_variation(first_line)
-                if first_line:
-                    variations.append(first_line)
-
-            # SAFETY: Return only the first variation, never multiple
-            if variations:
-                print(f"✅ [AI Parser] Returning ONLY first variation: {variations[0][:50]}...")
-                return [variations[0]]
+        # CRITICAL: Only take the FIRST variation, ignore the rest. Lines
+        # are located with find() so the rest of the response is never split
+        variation = None
+        pos = content.find('VARIATION:')
+        while pos != -1:
+            line_start = content.rfind('\n', 0, pos) + 1
+            line_end = content.find('\n', pos)
+            if line_end == -1:
+                line_end = len(content)
+            line = content[line_start:line_end]
+            if line.strip().startswith('VARIATION:'):
+                variation = line.replace('VARIATION:', '').strip()
+                if variation:
+                    break
+            pos = content.find('VARIATION:', line_end)
 
-            return variations
+        # If no VARIATION: prefix found, try to extract first line as variation
+        if not variation:
+            variation = content.strip().split('\n', 1)[0]
 
-        except Exception as e:
-            print(f"❌ Error parsing AI variations: {e}")
+        # SAFETY: Clean and validate the variation
+        variation = self._clean_variation(variation)
+        if not variation:
             return []
 
+        # SAFETY: Return only the first variation, never multiple
+        logger.debug("✅ [AI Parser] Returning ONLY first variation: %.50s...", variation)
+        return [variation]
+
     def _clean_variation(self, text: str) -> str:
         """Clean and validate a variation to remove duplications."""
-        try:
-            # Remove extra whitespace
-            text = ' '.join(text.split())
-
-            # Detect and remove duplications
-            words = text.split()
-
-            # Check for triple duplication
-            if len(words) >= 9:
-                chunk_size = len(words) // 3
-                chunk1 = ' '.join(words[:chunk_size])
-                chunk2 = ' '.join(words[chunk_size:chunk_size*2])
-                chunk3 = ' '.join(words[chunk_size*2:chunk_size*3])
-
-                if chunk1 == chunk2 == chunk3:
-                    print(f"⚠️ [AI] Detected triple duplication, using single instance")
-                    return chunk1
-
-            # Check for double duplication
-            if len(words) >= 6:
-                chunk_size = len(words) // 2
-                chunk1 = ' '.join(words[:chunk_size])
-                chunk2 = ' '.join(words[chunk_size:chunk_size*2])
-
-                if chunk1 == chunk2:
-                    print(f"⚠️ [AI] Detected double duplication, using single instance")
-                    return chunk1
-
-            # Enforce 100 character limit
-            if len(text) > 100:
-                print(f"⚠️ [AI] Title too long ({len(text)} chars), truncating to 100")
-                # Truncate at word boundary
-                words = text.split()
-                truncated = ""
-                for word in words:
-                    if len(truncated + " " + word) <= 100:
-                        truncated += (" " + word) if truncated else word
-                    else:
-                        break
-                return truncated if truncated else text[:100]
-
-            return text
-
-        except Exception as e:
-            print(f"⚠️ Error cleaning variation: {e}")
-            return text
+        # Remove extra whitespace
+        words = text.split()
+        text = ' '.join(words)
+        n = len(words)
+
+        # Detect and remove duplications, comparing word lists so no
+        # strings are built unless a duplicate is found
+        if n >= 9:
+            k = n // 3
+            if words[:k] == words[k:2*k] == words[2*k:3*k]:
+                logger.debug("⚠️ [AI] Detected triple duplication, using single instance")
+                return ' '.join(words[:k])
+
+        if n >= 6:
+            k = n // 2
+            if words[:k] == words[k:2*k]:
+                logger.debug("⚠️ [AI] Detected double duplication, using single instance")
+                return ' '.join(words[:k])
+
+        # Enforce 100 character limit
+        if len(text) > 100:
+            logger.debug("⚠️ [AI] Title too long (%d chars), truncating to 100", len(text))
+            # Truncate at word boundary, tracking the length as we go
+            kept = []
+            length = 0
+            for word in words:
+                if length + 1 + len(word) > 100:
+                    break
+                length += len(word) + (1 if kept else 0)
+                kept.append(word)
+            return ' '.join(kept) if kept else text[:100]
+
+        return text
 
     def _select_best_variation(self, variations: List[str], original: str, analysis: Dict) -> str:
         """Select the best variation based on analysis and requirements."""
-        try:
-            if not variations:
-                return original
-
-            # Select first valid variation that's not a duplicate
-            for variation in variations:
-                # Additional safety check
-                cleaned = self._clean_variation(variation)
-                if cleaned and len(cleaned) <= 100:
-                    print(f"✅ Selected variation: {cleaned} (length: {len(cleaned)})")
-                    return cleaned
-
-            # If all variations failed, return original
-            print(f"⚠️ All variations invalid, using original")
+        if not variations:
             return original
 
-        except Exception as e:
-            print(f"❌ Error selecting best variation: {e}")
-            return original
+        # Select first valid variation that's not a duplicate
+        for variation in variations:
+            # Additional safety check
+            cleaned = self._clean_variation(variation)
+            if cleaned and len(cleaned) <= 100:
+                logger.debug("✅ Selected variation: %s (length: %d)", cleaned, len(cleaned))
+                return cleaned
+
+        # If all variations failed, return original
+        logger.warning("⚠️ All variations invalid, using original")
+        return original
+    
+    def _get_account_analysis(self, account: str) -> Dict:
+        """Return the stored analysis for an account (empty if never analyzed)."""
+        account_data = self.learning_data['accounts'].get(account)
+        return account_data.get('analysis', {}) if account_data else {}
     
     def _build_ai_context(self, account: str, analysis: Dict, context: Dict) -> str:
+        """Build context string for AI prompts, cached per account when no extra context is given."""
+        if context is None:
+            cached = self._context_cache.get(account)
+            if cached is not None and cached[0] == id(analysis):
+                return cached[1]
+            context_str = self._build_ai_context_uncached(account, analysis, None)
+            self._context_cache[account] = (id(analysis), context_str)
+            return context_str
+        return self._build_ai_context_uncached(account, analysis, context)
+    
+    def _build_ai_context_uncached(self, account: str, analysis: Dict, context: Dict) -> str:
         """Build context string for AI prompts."""
-        try:
-            context_parts = [
-                f"Account: {account}",
-                f"Total Listings: {analysis.get('total_listings', 0)}",
-                f"Category Distribution: {analysis.get('category_distribution', {})}",
-                f"Price Range: £{analysis.get('price_stats', {}).get('min', 0)} - £{analysis.get('price_stats', {}).get('max', 0)}"
-            ]
-            
-            if context:
-                for key, value in context.items():
-                    context_parts.append(f"{key}: {value}")
-            
-            return '\n'.join(context_parts)
-            
-        except Exception as e:
-            print(f"❌ Error building AI context: {e}")
-            return ""
+        context_parts = [
+            f"Account: {account}",
+            f"Total Listings: {analysis.get('total_listings', 0)}",
+            f"Category Distribution: {analysis.get('category_distribution', {})}",
+            f"Price Range: £{analysis.get('price_stats', {}).get('min', 0)} - £{analysis.get('price_stats', {}).get('max', 0)}"
+        ]
+        
+        if context:
+            for key, value in context.items():
+                context_parts.append(f"{key}: {value}")
+        
+        return '\n'.join(context_parts)
     
     def _store_variation_learning(self, account: str, original: str, variation: str, type_: str):
         """Store variation learning data."""
+        variation_key = f"{account}_{type_}_{hashlib.blake2b(original.encode('utf-8'), digest_size=4).hexdigest()}"
+        
         try:
-            if 'variations' not in self.learning_data:
-                self.learning_data['variations'] = {}
-            
-            variation_key = f"{account}_{type_}_{hashlib.md5(original.encode()).hexdigest()[:8]}"
-            
-            self.learning_data['variations'][variation_key] = {
+            self.store_variations_bulk([{
+                'key': variation_key,
                 'account': account,
                 'type': type_,
                 'original': original,
                 'variation': variation,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            self.save_learning_data()
-            
-        except Exception as e:
-            print(f"❌ Error storing variation learning: {e}")
+                'timestamp': _now_iso()
+            }])
+        except sqlite3.Error as e:
+            logger.error("❌ Error storing variation learning: %s", e)
     
     def get_learning_insights(self, account: str = None) -> Dict:
         """
@@ -605,30 +970,28 @@ Generate 3 different description variations, each on a new line starting with "V
         Returns:
             Dict: Learning insights
         """
+        if account:
+            account_data = self.learning_data.get('accounts', {}).get(account, {})
+            return {
+                'account': account,
+                'insights': account_data.get('analysis', {}),
+                'last_analyzed': account_data.get('last_analyzed'),
+                'total_listings': account_data.get('total_listings', 0)
+            }
+        
+        # Global insights
         try:
-            if account:
-                account_data = self.learning_data.get('accounts', {}).get(account, {})
-                return {
-                    'account': account,
-                    'insights': account_data.get('analysis', {}),
-                    'last_analyzed': account_data.get('last_analyzed'),
-                    'total_listings': account_data.get('total_listings', 0)
-                }
-            else:
-                # Global insights
-                total_accounts = len(self.learning_data.get('accounts', {}))
-                total_variations = len(self.learning_data.get('variations', {}))
-                
-                return {
-                    'total_accounts': total_accounts,
-                    'total_variations': total_variations,
-                    'last_updated': self.learning_data.get('last_updated'),
-                    'accounts': list(self.learning_data.get('accounts', {}).keys())
-                }
-                
-        except Exception as e:
-            print(f"❌ Error getting learning insights: {e}")
+            total_variations = self._count_variations()
+        except sqlite3.Error as e:
+            logger.error("❌ Error getting learning insights: %s", e)
             return {'error': str(e)}
+        
+        return {
+            'total_accounts': len(self.learning_data.get('accounts', {})),
+            'total_variations': total_variations,
+            'last_updated': self.learning_data.get('last_updated'),
+            'accounts': list(self.learning_data.get('accounts', {}).keys())
+        }
     
     def train_on_successful_listings(self, account: str, successful_listings: List[Dict]):
         """
@@ -638,55 +1001,54 @@ Generate 3 different description variations, each on a new line starting with "V
             account (str): Account name
             successful_listings (List[Dict]): List of successful listing data
         """
-        try:
-            print(f"🎓 Training AI system on {len(successful_listings)} successful listings for account: {account}")
-            
-            # Analyze successful patterns
-            success_patterns = self._analyze_success_patterns(successful_listings)
-            
-            # Update learning data
-            if account not in self.learning_data['accounts']:
-                self.learning_data['accounts'][account] = {}
-            
-            self.learning_data['accounts'][account]['success_patterns'] = success_patterns
-            self.learning_data['accounts'][account]['last_trained'] = datetime.now().isoformat()
-            
-            self.save_learning_data()
-            
-            print(f"✅ AI system trained on successful listings for account: {account}")
-            
-        except Exception as e:
-            print(f"❌ Error training AI system: {e}")
+        logger.info("🎓 Training AI system on %d successful listings for account: %s", len(successful_listings), account)
+        
+        # Analyze successful patterns
+        success_patterns = self._analyze_success_patterns(successful_listings)
+        
+        # Update learning data
+        if account not in self.learning_data['accounts']:
+            self.learning_data['accounts'][account] = {}
+        
+        self.learning_data['accounts'][account]['success_patterns'] = success_patterns
+        self.learning_data['accounts'][account]['last_trained'] = _now_iso()
+        
+        self._mark_dirty()
+        self._context_cache.pop(account, None)
+        
+        logger.info("✅ AI system trained on successful listings for account: %s", account)
     
     def _analyze_success_patterns(self, successful_listings: List[Dict]) -> Dict:
         """Analyze patterns in successful listings."""
-        try:
-            patterns = {
-                'title_patterns': [],
-                'description_patterns': [],
-                'common_elements': {},
-                'success_indicators': {}
-            }
-            
-            for listing in successful_listings:
-                # Analyze title patterns
-                if 'title' in listing:
-                    patterns['title_patterns'].append({
-                        'length': len(listing['title']),
-                        'has_emoji': any(ord(char) > 127 for char in listing['title']),
-                        'has_numbers': any(char.isdigit() for char in listing['title'])
-                    })
-                
-                # Analyze description patterns
-                if 'description' in listing:
-                    patterns['description_patterns'].append({
-                        'length': len(listing['description']),
-                        'has_emoji': any(ord(char) > 127 for char in listing['description']),
-                        'has_bullets': '•' in listing['description'] or '-' in listing['description']
-                    })
-            
-            return patterns
+        patterns = {
+            'title_patterns': [],
+            'description_patterns': [],
+            'common_elements': {},
+            'success_indicators': {}
+        }
+        
+        title_patterns = patterns['title_patterns']
+        description_patterns = patterns['description_patterns']
+        has_non_ascii = _NON_ASCII_RE.search
+        has_digit = _DIGIT_RE.search
+        
+        for listing in successful_listings:
+            # Analyze title patterns
+            title = listing.get('title')
+            if title is not None:
+                title_patterns.append({
+                    'length': len(title),
+                    'has_emoji': has_non_ascii(title) is not None,
+                    'has_numbers': has_digit(title) is not None
+                })
             
-        except Exception as e:
-            print(f"❌ Error analyzing success patterns: {e}")
-            return {}
+            # Analyze description patterns
+            description = listing.get('description')
+            if description is not None:
+                description_patterns.append({
+                    'length': len(description),
+                    'has_emoji': has_non_ascii(description) is not None,
+                    'has_bullets': '•' in description or '-' in description
+                })
+        
+        return patterns
@@ -6,25 +6,374 @@ Uses OpenAI API to learn from listing data and generate intelligent variations.
 
 import os
 import json
+import asyncio
+import atexit
+import mmap
+import re
 import requests
 import sqlite3
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import hashlib
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Compression level of the learning data file when zstandard is installed
+ZSTD_LEVEL = 6
+
+# Listing columns returned by load_account_listings(), and how many rows are
+# fetched from SQLite at a time while streaming them
+LISTING_COLUMNS = ('title', 'description', 'category', 'price', 'status', 'created_at', 'updated_at')
+LISTINGS_FETCH_SIZE = 5000
+
+# Listings databases are shared with the bot while it posts, so readers use
+# WAL and wait for a busy writer instead of failing. Connections are kept
+# open per account, with a 20 MB page cache each.
+LISTINGS_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA cache_size=-20000',
+)
+LISTINGS_STATUS_INDEX = 'CREATE INDEX IF NOT EXISTS idx_status ON listings(status)'
+LIVE_LISTINGS_FILTER = "status != 'deleted' OR status IS NULL"
+
+# Per-category listing count and mean/median price, computed by SQLite in
+# one pass. Prices are stored as text such as "£1,200"; text that does not
+# start with a number once the currency sign is dropped ("Ask", "from £20")
+# counts as unpriced. The median averages the middle one or two priced rows,
+# which are ranked with unpriced rows last.
+PRICE_TEXT_SQL = "LTRIM(REPLACE(price, ',', ''), '£$ ')"
+PRICE_VALUE_SQL = f"(CASE WHEN {PRICE_TEXT_SQL} GLOB '[0-9]*' THEN CAST({PRICE_TEXT_SQL} AS REAL) END)"
+CATEGORY_STATS_QUERY = f'''
+    WITH ranked AS (
+        SELECT category, {PRICE_VALUE_SQL} AS price,
+               ROW_NUMBER() OVER (PARTITION BY category
+                                  ORDER BY {PRICE_VALUE_SQL} IS NULL, {PRICE_VALUE_SQL}) AS price_rank,
+               COUNT({PRICE_VALUE_SQL}) OVER (PARTITION BY category) AS priced
+        FROM listings
+        WHERE {LIVE_LISTINGS_FILTER}
+    )
+    SELECT category, COUNT(*), AVG(price),
+           AVG(CASE WHEN price_rank IN ((priced + 1) / 2, (priced + 2) / 2) THEN price END)
+    FROM ranked
+    GROUP BY category
+'''
+
+# Chat completion settings; the model and these settings are all part of the
+# response cache key. Variations come from the small model; a response with
+# fewer than OPENAI_MIN_VARIATIONS usable lines is retried on the fallback model.
+OPENAI_MODEL = "gpt-4o-mini"  # Cheap, fast model for formulaic rewrites
+OPENAI_FALLBACK_MODEL = "gpt-4o"  # Stronger model, only used when the small one falls short
+OPENAI_MIN_VARIATIONS = 3
+OPENAI_MAX_TOKENS = 500  # Limit tokens to control costs
+OPENAI_TEMPERATURE = 0.7  # Balanced creativity
+OPENAI_TOP_P = 0.9
+OPENAI_SYSTEM_PROMPT = (
+    "You are an expert Facebook Marketplace listing optimizer. Generate unique, engaging variations "
+    "that are optimized for Facebook Marketplace search and engagement."
+)
+
+# OpenAI HTTP settings: a stalled connection fails fast instead of holding
+# up the pipeline, and pooled connections are kept alive between calls
+OPENAI_TIMEOUT = 15.0
+OPENAI_CONNECT_TIMEOUT = 5.0
+OPENAI_MAX_RETRIES = 2
+OPENAI_POOL_LIMITS = {'max_connections': 32, 'max_keepalive_connections': 16}
+
+# Cached OpenAI responses are reused for identical prompts for a week. The
+# most recently used ones are also kept in memory in front of SQLite.
+OPENAI_CACHE_TTL = 7 * 86400
+OPENAI_MEMORY_CACHE_SIZE = 1024
+OPENAI_CACHE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS cache (
+        key TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        usage TEXT,
+        ts REAL NOT NULL
+    )
+'''
+
+
+# Generated variations, one row per variation of an original. Kept in the
+# same database as the response cache, in WAL mode.
+CACHE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+)
+VARIATIONS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS variations (
+        account TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        original_hash TEXT NOT NULL,
+        variation TEXT NOT NULL,
+        ts REAL NOT NULL
+    )
+'''
+VARIATIONS_INDEX = '''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_variations_original
+    ON variations(account, kind, original_hash, variation)
+'''
+UPSERT_VARIATION_QUERY = '''
+    INSERT INTO variations (account, kind, original_hash, variation, ts) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (account, kind, original_hash, variation) DO UPDATE SET ts = excluded.ts
+'''
+
+# Direct-response gate: character trigrams of everything produced for an
+# account, stored next to the response cache
+SHINGLES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS shingles (
+        account TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        shingle TEXT NOT NULL,
+        PRIMARY KEY (account, kind, shingle)
+    ) WITHOUT ROWID
+'''
+
+# Variation prompts, filled in with str.format_map()
+TITLE_PROMPT_TEMPLATE = """
+You are an expert Facebook Marketplace listing optimizer. Generate a unique, engaging title variation for this listing:
+
+Original Title: "{original}"
+
+Requirements:
+1. Keep the core product information
+2. Make it unique and engaging
+3. Optimize for Facebook Marketplace search
+4. Maintain appropriate length (50-80 characters)
+5. NO EMOJIS - use text only
+6. Include numbers if relevant
+
+Generate 3 different title variations.
+Return JSON: {{"variations": ["v1", "v2", "v3"]}}
+"""
+
+# Several titles share one prompt; the instructions are sent once per batch
+TITLE_BATCH_SIZE = 20
+TITLE_BATCH_MAX_TOKENS = 200  # per title in the batch
+TITLE_BATCH_PROMPT_TEMPLATE = """
+You are an expert Facebook Marketplace listing optimizer. Generate unique, engaging title variations for each of these listings.
+
+Requirements:
+1. Keep the core product information
+2. Make it unique and engaging
+3. Optimize for Facebook Marketplace search
+4. Maintain appropriate length (50-80 characters)
+5. NO EMOJIS - use text only
+6. Include numbers if relevant
+
+Generate 3 different title variations for every listing.
+Return JSON: {{"results": [{{"id": 0, "variations": ["v1", "v2", "v3"]}}]}}
+
+Listings:
+{listings}
+"""
+
+DESCRIPTION_PROMPT_TEMPLATE = """
+You are an expert Facebook Marketplace listing optimizer. Generate an accurate, unique description for this listing.
+
+Context:
+{context_block}
+
+Original Description (may be a placeholder or generic):
+"{original}"
+
+Requirements:
+1. Use the title/category/context to describe the correct product
+2. Keep it accurate and specific to the item
+3. Optimize for Facebook Marketplace
+4. Maintain appropriate length (120-350 characters)
+5. NO EMOJIS - use text only
+6. Use bullet points if appropriate
+7. Avoid adding unrelated product details
+
+Generate 3 different description variations.
+Return JSON: {{"variations": ["v1", "v2", "v3"]}}
+"""
+
+# Variation lines in a response: "VARIATION: ...", a fully quoted line, or
+# a line numbered 1. to 5. Leading/trailing whitespace on a line is ignored.
+_VARIATION_LINE_RE = re.compile(r'^[^\S\n]*(?:VARIATION:(.*)|"(.*)"[^\S\n]*$|[1-5]\.(.*))', re.M)
+
+# Semantic cache: originals whose embeddings are this similar (cosine) to an
+# earlier original reuse its variations. Rows are kept in the response
+# cache database and loaded into a NumPy matrix grown in blocks.
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_BLOCK = 1024
+SEMANTIC_CACHE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS semantic_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        embedding BLOB NOT NULL,
+        variations TEXT NOT NULL,
+        ts REAL NOT NULL
+    )
+'''
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _cache_hash(data: bytes) -> str:
+    """Digest for cache keys: BLAKE3 (SIMD-accelerated) when installed, else SHA-256."""
+    if blake3 is not None:
+        return blake3(data).hexdigest(16)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _original_hash(original: str) -> str:
+    """Key of an original title/description in the variations table (stable SHA-256, stored on disk)."""
+    return hashlib.sha256(original.encode('utf-8')).hexdigest()
+
+
+def _shingles(text: str) -> set:
+    """Character trigrams of text, ignoring case and runs of whitespace."""
+    text = ' '.join(text.lower().split())
+    return {text[i:i + 3] for i in range(len(text) - 2)} or ({text} if text else set())
+
+
+def _context_block(context: Dict) -> str:
+    """The Context: lines of a description prompt."""
+    title = context.get('title', '')
+    category = context.get('category', '')
+    product_type = context.get('product_type', '')
+    image_elements = context.get('image_elements', [])
+    lines = filter(None, (
+        title and f'Title: "{title}"',
+        category and f'Category: "{category}"',
+        product_type and f"Detected product type: {product_type}",
+        image_elements and f"Image clues: {', '.join(image_elements)}",
+    ))
+    return "\n".join(lines) or "No additional context."
+
+
+def _non_empty(path: str) -> bool:
+    """True if path is an existing, non-empty file."""
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def _load_json_file(path: str, compressed: bool = False):
+    """Parse a non-empty (optionally zstd-compressed) JSON file from a read-only memory map."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if compressed:
+            return _json_loads(zstandard.ZstdDecompressor().decompress(mm))
+        if orjson is not None:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+        return json.loads(mm[:])
+
+
+def _chat_params(prompt: str, model: str, max_tokens: int = OPENAI_MAX_TOKENS) -> Dict:
+    """Chat completion arguments for a variation prompt."""
+    return {
+        'model': model,
+        'messages': [
+            {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        'max_tokens': max_tokens,
+        'temperature': OPENAI_TEMPERATURE,
+        'top_p': OPENAI_TOP_P,
+        'response_format': {"type": "json_object"}
+    }
+
+
+def _openai_client_kwargs(async_client: bool = False) -> Dict:
+    """Keyword arguments giving an OpenAI client explicit timeouts, retries and a sized pool."""
+    if httpx is None:
+        return {'timeout': OPENAI_TIMEOUT, 'max_retries': OPENAI_MAX_RETRIES}
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    timeout = httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+    return {
+        'timeout': timeout,
+        'max_retries': OPENAI_MAX_RETRIES,
+        'http_client': client_class(timeout=timeout, limits=httpx.Limits(**OPENAI_POOL_LIMITS))
+    }
+
+
+def _openai_cache_key(prompt: str, model: str, max_tokens: int = OPENAI_MAX_TOKENS) -> str:
+    """Response cache key for a prompt sent to a model under the current chat settings."""
+    key = f"{model}|{max_tokens}|{OPENAI_TEMPERATURE}|{OPENAI_TOP_P}|{prompt}"
+    return _cache_hash(key.encode('utf-8'))
+
+
+# Instances with usage counts that may still need writing at exit
+_live_systems = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_systems():
+    """Write any unsaved learning data when the interpreter exits."""
+    for system in list(_live_systems):
+        system.flush()
+
+
 class AILearningSystem:
     """AI-powered learning system for generating intelligent listing variations."""
     
-    def __init__(self, openai_api_key: str = None, base_dir: str = 'accounts'):
+    def __init__(self, openai_api_key: str = None, base_dir: str = 'accounts',
+                 semantic_threshold: Optional[float] = None, semantic_ttl: float = OPENAI_CACHE_TTL,
+                 title_model: str = OPENAI_MODEL, desc_model: str = OPENAI_MODEL,
+                 fallback_model: str = OPENAI_FALLBACK_MODEL, direct_threshold: Optional[float] = None):
         """
         Initialize the AI learning system.
         
         Args:
             openai_api_key (str): OpenAI API key (if None, will try to get from environment)
             base_dir (str): Base directory for account storage
+            semantic_threshold (float): Cosine similarity above which a near-duplicate original
+                reuses earlier variations (None disables the semantic cache)
+            semantic_ttl (float): Seconds a semantic cache entry stays usable
+            title_model (str): Model used for title variations
+            desc_model (str): Model used for description variations
+            fallback_model (str): Model retried when a response has too few variations
+            direct_threshold (float): Share of an original's trigrams that must already appear in
+                the account's earlier output for OpenAI to be called; below it the original is
+                returned as is (None disables the gate)
         """
         self.base_dir = base_dir
         self.api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
+        self.title_model = title_model
+        self.desc_model = desc_model
+        self.fallback_model = fallback_model
         
         if not self.api_key:
             print("WARNING: No OpenAI API key found. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
@@ -32,15 +381,191 @@ class AILearningSystem:
         
         # Learning data storage
         self.learning_data_file = os.path.join(base_dir, 'ai_learning_data.json')
+        self.compressed_data_file = self.learning_data_file + '.zst'
         self.load_learning_data()
+        
+        # Token usage and direct-gate counts are only kept in memory; flush()
+        # writes them with the rest of the learning data, as does any other save
+        self._dirty = False
+        _live_systems.add(self)
+        
+        # Listings connections per account, opened on first use by _get_conn()
+        self._conn_cache: Dict[str, sqlite3.Connection] = {}
+        
+        # OpenAI client, created on first use by _get_openai_client()
+        self._client = None
+        
+        # OpenAI response cache, opened on first use by _get_cache_conn()
+        self.cache_file = os.path.join(base_dir, 'openai_cache.db')
+        self._cache_conn = None
+        self._response_lru: OrderedDict = OrderedDict()
+        
+        # Direct-response gate settings; (account, kind) -> shingles of earlier output
+        self.direct_threshold = direct_threshold
+        self._shingles: Dict[Tuple[str, str], set] = {}
+        
+        # Semantic cache settings; kind -> [embedding matrix, row count, variations]
+        self.semantic_threshold = semantic_threshold if np is not None else None
+        self.semantic_ttl = semantic_ttl
+        self._semantic_index: Dict[str, list] = {}
+        
+        if 'variations' in self.learning_data:
+            self._migrate_variations()
+    
+    def _get_openai_client(self):
+        """Return the shared OpenAI client, creating it on first use."""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key, **_openai_client_kwargs())
+        return self._client
+    
+    def _get_cache_conn(self) -> sqlite3.Connection:
+        """Return the response cache and variations connection, creating the database on first use."""
+        if self._cache_conn is None:
+            os.makedirs(self.base_dir, exist_ok=True)
+            self._cache_conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+            for pragma in CACHE_PRAGMAS:
+                self._cache_conn.execute(pragma)
+            self._cache_conn.execute(OPENAI_CACHE_SCHEMA)
+            self._cache_conn.execute(SEMANTIC_CACHE_SCHEMA)
+            self._cache_conn.execute(SHINGLES_SCHEMA)
+            self._cache_conn.execute(VARIATIONS_SCHEMA)
+            self._cache_conn.execute(VARIATIONS_INDEX)
+        return self._cache_conn
+    
+    def _remember_response(self, key: str, response: Dict):
+        """Put a response in the in-memory LRU, evicting the least recently used one if full."""
+        self._response_lru[key] = response
+        self._response_lru.move_to_end(key)
+        if len(self._response_lru) > OPENAI_MEMORY_CACHE_SIZE:
+            self._response_lru.popitem(last=False)
+    
+    def _get_cached_response(self, key: str) -> Optional[Dict]:
+        """Return the cached response for a prompt key, from memory or if younger than the TTL on disk."""
+        response = self._response_lru.get(key)
+        if response is not None:
+            self._response_lru.move_to_end(key)
+            return response
+        
+        row = self._get_cache_conn().execute(
+            'SELECT content FROM cache WHERE key = ? AND ts > ?', (key, time.time() - OPENAI_CACHE_TTL)
+        ).fetchone()
+        if row is None:
+            return None
+        response = {'success': True, 'content': row[0], 'usage': None}
+        self._remember_response(key, response)
+        return response
+    
+    def _cache_response(self, key: str, content: str, usage):
+        """Store a successful response in the cache."""
+        usage_json = json.dumps(usage.model_dump()) if hasattr(usage, 'model_dump') else None
+        conn = self._get_cache_conn()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, content, usage, ts) VALUES (?, ?, ?, ?)',
+                (key, content, usage_json, time.time())
+            )
+        self._remember_response(key, {'success': True, 'content': content, 'usage': None})
+    
+    def _embed(self, text: str):
+        """Return the unit-length embedding of text, or None if it could not be fetched."""
+        try:
+            response = self._get_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+        except Exception as e:
+            print(f"WARNING: Could not embed text for semantic cache: {e}")
+            return None
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+    
+    def _get_semantic_index(self, kind: str) -> list:
+        """Load the unexpired semantic cache rows of one kind into memory once."""
+        index = self._semantic_index.get(kind)
+        if index is None:
+            rows = self._get_cache_conn().execute(
+                'SELECT embedding, variations FROM semantic_cache WHERE kind = ? AND ts > ? ORDER BY id',
+                (kind, time.time() - self.semantic_ttl)
+            ).fetchall()
+            index = [None, 0, []]
+            for embedding, variations in rows:
+                self._append_semantic_row(index, np.frombuffer(embedding, dtype=np.float32), json.loads(variations))
+            self._semantic_index[kind] = index
+        return index
+    
+    @staticmethod
+    def _append_semantic_row(index: list, embedding, variations: List[str]):
+        """Append one row to an in-memory semantic index, growing it a block at a time."""
+        matrix, count, _ = index
+        if matrix is None or count == len(matrix):
+            grown = np.zeros((count + SEMANTIC_CACHE_BLOCK, embedding.shape[0]), dtype=np.float32)
+            if matrix is not None:
+                grown[:count] = matrix
+            index[0] = matrix = grown
+        matrix[count] = embedding
+        index[1] = count + 1
+        index[2].append(variations)
+    
+    def _semantic_lookup(self, kind: str, text: str):
+        """
+        Look for earlier variations of a near-duplicate original.
+        
+        Returns:
+            Tuple: (cached variations or None, embedding of text or None)
+        """
+        if self.semantic_threshold is None:
+            return None, None
+        embedding = self._embed(text)
+        if embedding is None:
+            return None, None
+        matrix, count, variations = self._get_semantic_index(kind)
+        if count:
+            similarities = matrix[:count] @ embedding
+            best = int(similarities.argmax())
+            if similarities[best] >= self.semantic_threshold:
+                return variations[best], embedding
+        return None, embedding
+    
+    def _semantic_store(self, kind: str, embedding, variations: List[str]):
+        """Remember the variations generated for an original with the given embedding."""
+        conn = self._get_cache_conn()
+        with conn:
+            conn.execute(
+                'INSERT INTO semantic_cache (kind, embedding, variations, ts) VALUES (?, ?, ?, ?)',
+                (kind, embedding.tobytes(), json.dumps(variations), time.time())
+            )
+        self._append_semantic_row(self._get_semantic_index(kind), embedding, variations)
+    
+    def close(self):
+        """Save pending learning data and close the connections and the OpenAI client."""
+        self.flush()
+        for conn in self._conn_cache.values():
+            conn.close()
+        self._conn_cache.clear()
+        if self._cache_conn is not None:
+            self._cache_conn.close()
+            self._cache_conn = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
     
     def load_learning_data(self):
         """Load existing learning data from file."""
         try:
-            if os.path.exists(self.learning_data_file):
-                with open(self.learning_data_file, 'r', encoding='utf-8') as f:
-                    self.learning_data = json.load(f)
+            # mmap cannot map an empty file; treat it like a missing one. When
+            # both files exist the newer one wins, and a plain one is
+            # compressed on the next save.
+            source = self._learning_data_source()
+            if source == self.compressed_data_file and zstandard is None:
+                print("WARNING: Learning data is zstd-compressed but zstandard is not installed")
+                source = self.learning_data_file if _non_empty(self.learning_data_file) else None
+            if source is not None:
+                self.learning_data = _load_json_file(source, compressed=source == self.compressed_data_file)
+            else:
+                self.learning_data = None
+            
+            if self.learning_data is not None:
                 print(f"Loaded AI learning data: {len(self.learning_data.get('accounts', {}))} accounts")
+                self._migrate_listings()
             else:
                 self.learning_data = {
                     'accounts': {},
@@ -58,16 +583,93 @@ class AILearningSystem:
                 'last_updated': datetime.now().isoformat()
             }
     
+    def _learning_data_source(self) -> Optional[str]:
+        """Return the newer of the non-empty learning data files, or None if neither exists."""
+        files = [path for path in (self.compressed_data_file, self.learning_data_file) if _non_empty(path)]
+        return max(files, key=os.path.getmtime, default=None)
+    
     def save_learning_data(self):
-        """Save learning data to file."""
+        """Save learning data to file (zstd-compressed when available), replacing it atomically."""
         try:
+            if zstandard is None and self._learning_data_source() == self.compressed_data_file:
+                # A plain file would be newer and hide the compressed data for good
+                print("WARNING: Not saving learning data: the newest copy is zstd-compressed "
+                      "and zstandard is not installed")
+                return
             self.learning_data['last_updated'] = datetime.now().isoformat()
-            with open(self.learning_data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.learning_data, f, indent=2, ensure_ascii=False)
+            if zstandard is not None:
+                data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(_json_dumps(self.learning_data))
+                data_file = self.compressed_data_file
+            else:
+                data = _json_dumps(self.learning_data, indent=True)
+                data_file = self.learning_data_file
+            tmp_file = data_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, data_file)
+            self._dirty = False
+            if data_file == self.compressed_data_file and os.path.exists(self.learning_data_file):
+                os.remove(self.learning_data_file)
             print("AI learning data saved")
         except Exception as e:
             print(f"WARNING: Error saving learning data: {e}")
     
+    def flush(self):
+        """Save learning data if usage or gate counts changed since the last save."""
+        if self._dirty:
+            self.save_learning_data()
+    
+    def _get_conn(self, account: str) -> Optional[sqlite3.Connection]:
+        """Return the cached listings connection for an account, or None if it has no database."""
+        conn = self._conn_cache.get(account)
+        if conn is None:
+            db_path = os.path.join(self.base_dir, account, 'listings.db')
+            if not os.path.exists(db_path):
+                return None
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            for pragma in LISTINGS_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(LISTINGS_STATUS_INDEX)
+            self._conn_cache[account] = conn
+        return conn
+    
+    def load_account_listings(self, account: str):
+        """
+        Stream the live listings of an account straight from its database.
+        
+        Args:
+            account (str): Account name
+            
+        Yields:
+            Dict: One listing, newest first
+        """
+        conn = self._get_conn(account)
+        if conn is None:
+            return
+        cursor = conn.cursor()
+        cursor.arraysize = LISTINGS_FETCH_SIZE
+        cursor.execute(f'''
+            SELECT {', '.join(LISTING_COLUMNS)}
+            FROM listings
+            WHERE {LIVE_LISTINGS_FILTER}
+            ORDER BY created_at DESC
+        ''')
+        for rows in iter(cursor.fetchmany, []):
+            for row in rows:
+                yield dict(zip(LISTING_COLUMNS, row))
+    
+    def _migrate_listings(self):
+        """Drop listing copies left in the learning data by older versions."""
+        migrated = False
+        for account, account_data in self.learning_data.get('accounts', {}).items():
+            if account_data.pop('listings', None) is not None:
+                migrated = True
+            legacy_file = os.path.join(self.base_dir, account, 'listings.jsonl')
+            if os.path.exists(legacy_file):
+                os.remove(legacy_file)
+        if migrated:
+            self.save_learning_data()
+    
     def analyze_account_listings(self, account: str) -> Dict:
         """
         Analyze all listings for an account to learn patterns.
@@ -81,63 +683,46 @@ class AILearningSystem:
         try:
             print(f"Analyzing listings for account: {account}")
             
-            # Get listings from database
-            db_path = os.path.join(self.base_dir, account, 'listings.db')
-            if not os.path.exists(db_path):
+            conn = self._get_conn(account)
+            if conn is None:
                 print(f"⚠️ No database found for account: {account}")
                 return {'success': False, 'error': 'No database found'}
             
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get all listings
-            cursor.execute('''
-                SELECT title, description, category, price, status, created_at, updated_at
-                FROM listings 
-                WHERE status != 'deleted' OR status IS NULL
-                ORDER BY created_at DESC
-            ''')
-            
-            listings = cursor.fetchall()
-            conn.close()
+            rows = conn.execute(CATEGORY_STATS_QUERY).fetchall()
             
-            if not listings:
+            listings_count = sum(row[1] for row in rows)
+            if not listings_count:
                 print(f"⚠️ No listings found for account: {account}")
                 return {'success': False, 'error': 'No listings found'}
             
-            # Initialize account data if not exists
-            if account not in self.learning_data['accounts']:
-                self.learning_data['accounts'][account] = {
-                    'listings': [],
-                    'patterns': {},
-                    'success_metrics': {},
-                    'last_analyzed': datetime.now().isoformat()
-                }
-            
-            # Store listings data
-            self.learning_data['accounts'][account]['listings'] = [
-                {
-                    'title': listing[0],
-                    'description': listing[1],
-                    'category': listing[2],
-                    'price': listing[3],
-                    'status': listing[4],
-                    'created_at': listing[5],
-                    'updated_at': listing[6]
+            # Only the aggregates are kept; the listings stay in SQLite
+            patterns = {
+                'total_listings': listings_count,
+                'categories': {
+                    category or 'Uncategorized': {
+                        'count': count,
+                        'avg_price': round(avg_price, 2) if avg_price is not None else None,
+                        'median_price': round(median_price, 2) if median_price is not None else None
+                    }
+                    for category, count, avg_price, median_price in rows
                 }
-                for listing in listings
-            ]
+            }
             
-            # Analyze patterns
-            self.learning_data['accounts'][account]['last_analyzed'] = datetime.now().isoformat()
+            account_data = self.learning_data['accounts'].setdefault(account, {
+                'patterns': {},
+                'success_metrics': {}
+            })
+            account_data['patterns'] = patterns
+            account_data['last_analyzed'] = datetime.now().isoformat()
             
             # Save updated data
             self.save_learning_data()
             
-            print(f"✅ Analyzed {len(listings)} listings for account: {account}")
+            print(f"✅ Analyzed {listings_count} listings for account: {account}")
             return {
                 'success': True,
-                'listings_count': len(listings),
+                'listings_count': listings_count,
+                'analysis': patterns,
                 'account': account
             }
             
@@ -145,6 +730,178 @@ class AILearningSystem:
             print(f"⚠️ Error analyzing account listings: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _get_account_shingles(self, account: str, kind: str) -> set:
+        """Load the trigram shingles of an account's earlier output of one kind once."""
+        key = (account, kind)
+        shingles = self._shingles.get(key)
+        if shingles is None:
+            rows = self._get_cache_conn().execute(
+                'SELECT shingle FROM shingles WHERE account = ? AND kind = ?', (account, kind)
+            ).fetchall()
+            shingles = self._shingles[key] = {row[0] for row in rows}
+        return shingles
+    
+    def _remember_shingles(self, account: str, kind: str, texts: List[str]):
+        """Add the shingles of texts produced for an account to its history."""
+        shingles = self._get_account_shingles(account, kind)
+        new = set().union(*map(_shingles, texts)) - shingles
+        if new:
+            shingles |= new
+            conn = self._get_cache_conn()
+            with conn:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO shingles (account, kind, shingle) VALUES (?, ?, ?)',
+                    [(account, kind, shingle) for shingle in new]
+                )
+    
+    def _remember_variations(self, account: str, kind: str, original: str, result: Dict):
+        """Store a successful result's variations and record them for the direct-response gate."""
+        if not result['success']:
+            return
+        self.store_variations(account, kind, original, result['all_variations'])
+        if self.direct_threshold is not None:
+            self._remember_shingles(account, kind, result['all_variations'])
+    
+    def store_variations(self, account: str, kind: str, original: str, variations: List[str]):
+        """
+        Store variations generated for an original in one transaction.
+        
+        Args:
+            account (str): Account name
+            kind (str): 'title' or 'description'
+            original (str): Original text the variations were generated from
+            variations (List[str]): Generated variations
+        """
+        original_hash = _original_hash(original)
+        now = time.time()
+        conn = self._get_cache_conn()
+        with conn:
+            conn.executemany(UPSERT_VARIATION_QUERY, [
+                (account, kind, original_hash, variation, now) for variation in variations
+            ])
+    
+    def get_variations(self, account: str, original: str, kind: str = 'title') -> List[str]:
+        """
+        Return the stored variations of an original, newest first.
+        
+        Args:
+            account (str): Account name
+            original (str): Original text
+            kind (str): 'title' or 'description'
+            
+        Returns:
+            List[str]: Stored variations
+        """
+        rows = self._get_cache_conn().execute(
+            'SELECT variation FROM variations WHERE account = ? AND kind = ? AND original_hash = ? '
+            'ORDER BY ts DESC, rowid DESC',
+            (account, kind, _original_hash(original))
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def _migrate_variations(self):
+        """Move variations kept in the learning data by older versions into the variations table."""
+        legacy = self.learning_data.pop('variations') or {}
+        now = time.time()
+        rows = [
+            (entry.get('account', ''), entry.get('type', 'title'), _original_hash(entry['original']),
+             entry['variation'], now)
+            for entry in legacy.values()
+            if isinstance(entry, dict) and entry.get('original') and entry.get('variation')
+        ]
+        conn = self._get_cache_conn()
+        with conn:
+            conn.executemany(UPSERT_VARIATION_QUERY, rows)
+        print(f"Moved {len(rows)} variations from the learning data into {self.cache_file}")
+        self.save_learning_data()
+    
+    def _direct_result(self, account: str, kind: str, original: str) -> Optional[Dict]:
+        """
+        Return the original unchanged if it barely overlaps what this account has posted before.
+        
+        Overlap is the share of the original's trigrams already seen in the
+        account's earlier output of the same kind. Checks and hits are counted
+        in success_metrics['direct_gate'] to help tune direct_threshold.
+        """
+        if self.direct_threshold is None:
+            return None
+        
+        shingles = _shingles(original)
+        overlap = len(shingles & self._get_account_shingles(account, kind)) / len(shingles) if shingles else 1.0
+        gate = self.learning_data.setdefault('success_metrics', {}).setdefault(
+            'direct_gate', {'checked': 0, 'direct': 0}
+        )
+        gate['checked'] += 1
+        self._dirty = True
+        if overlap >= self.direct_threshold:
+            return None
+        
+        gate['direct'] += 1
+        print(f"Original {kind} is already unique for this account, skipping OpenAI")
+        self._remember_shingles(account, kind, [original])
+        return {
+            'success': True,
+            'variation': original,
+            'type': 'direct',
+            'all_variations': [original],
+            'confidence': round(1.0 - overlap, 2)
+        }
+    
+    def _title_request(self, original_title: str) -> Tuple[str, str]:
+        """Return (semantic cache text, prompt) for a title variation."""
+        prompt = TITLE_PROMPT_TEMPLATE.format_map({'original': original_title})
+        return original_title, prompt
+    
+    def _description_request(self, original_description: str, context: Dict = None) -> Tuple[str, str]:
+        """Return (semantic cache text, prompt) for a description variation."""
+        context_block = _context_block(context or {})
+        prompt = DESCRIPTION_PROMPT_TEMPLATE.format_map({
+            'context_block': context_block,
+            'original': original_description
+        })
+        # Similarity covers the context too, so a description is only
+        # reused for the same kind of product
+        return f"{context_block}\n{original_description}", prompt
+    
+    @staticmethod
+    def _variation_result(variations: List[str], variation_type: str) -> Dict:
+        """Build the result returned for a set of variations."""
+        return {
+            'success': True,
+            'variation': variations[0],  # Simple selection
+            'type': variation_type,
+            'all_variations': variations,
+            'confidence': 0.9
+        }
+    
+    def _response_result(self, kind: str, original: str, response: Dict, embedding) -> Dict:
+        """Parse an OpenAI response into a variation result."""
+        if not response['success']:
+            return {
+                'success': False,
+                'error': response['error'],
+                'variation': original
+            }
+        
+        variations = self._parse_ai_variations(response['content'])
+        if not variations:
+            return {
+                'success': False,
+                'error': 'Could not parse AI variations',
+                'variation': original
+            }
+        
+        if embedding is not None:
+            self._semantic_store(kind, embedding, variations)
+        return self._variation_result(variations, 'ai_generated')
+    
+    def _cached_result(self, kind: str, cached_variations: Optional[List[str]]) -> Optional[Dict]:
+        """Result for variations reused from the semantic cache, if any."""
+        if not cached_variations:
+            return None
+        print(f"Using variations of a similar earlier {kind}")
+        return self._variation_result(cached_variations, 'ai_cached')
+    
     def generate_ai_title_variation(self, account: str, original_title: str, context: Dict = None) -> Dict:
         """
         Generate AI-powered title variation using OpenAI.
@@ -167,52 +924,18 @@ class AILearningSystem:
             
             print(f"Generating AI title variation for: {original_title[:50]}...")
             
-            # Create AI prompt
-            prompt = f"""
-You are an expert Facebook Marketplace listing optimizer. Generate a unique, engaging title variation for this listing:
-
-Original Title: "{original_title}"
-
-Requirements:
-1. Keep the core product information
-2. Make it unique and engaging
-3. Optimize for Facebook Marketplace search
-4. Maintain appropriate length (50-80 characters)
-5. NO EMOJIS - use text only
-6. Include numbers if relevant
-
-Generate 3 different title variations, each on a new line starting with "VARIATION:"
-"""
-            
-            # Call OpenAI API
-            response = self._call_openai_api(prompt)
+            direct = self._direct_result(account, 'title', original_title)
+            if direct:
+                return direct
             
-            if response['success']:
-                variations = self._parse_ai_variations(response['content'])
-                
-                if variations:
-                    # Select best variation
-                    best_variation = variations[0]  # Simple selection
-                    
-                    return {
-                        'success': True,
-                        'variation': best_variation,
-                        'type': 'ai_generated',
-                        'all_variations': variations,
-                        'confidence': 0.9
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Could not parse AI variations',
-                        'variation': original_title
-                    }
-            else:
-                return {
-                    'success': False,
-                    'error': response['error'],
-                    'variation': original_title
-                }
+            semantic_text, prompt = self._title_request(original_title)
+            cached_variations, embedding = self._semantic_lookup('title', semantic_text)
+            result = self._cached_result('title', cached_variations)
+            if result is None:
+                response = self._call_with_fallback(prompt, self.title_model)
+                result = self._response_result('title', original_title, response, embedding)
+            self._remember_variations(account, 'title', original_title, result)
+            return result
                 
         except Exception as e:
             print(f"ERROR: Error generating AI title variation: {e}")
@@ -243,76 +966,19 @@ Generate 3 different title variations, each on a new line starting with "VARIATI
                 }
             
             print(f"Generating AI description variation for: {original_description[:50]}...")
-
-            context = context or {}
-            title = context.get('title', '')
-            category = context.get('category', '')
-            product_type = context.get('product_type', '')
-            image_elements = context.get('image_elements', [])
-
-            context_lines = []
-            if title:
-                context_lines.append(f'Title: "{title}"')
-            if category:
-                context_lines.append(f'Category: "{category}"')
-            if product_type:
-                context_lines.append(f"Detected product type: {product_type}")
-            if image_elements:
-                context_lines.append(f"Image clues: {', '.join(image_elements)}")
-
-            context_block = "\n".join(context_lines) if context_lines else "No additional context."
-            
-            # Create AI prompt
-            prompt = f"""
-You are an expert Facebook Marketplace listing optimizer. Generate an accurate, unique description for this listing.
-
-Context:
-{context_block}
-
-Original Description (may be a placeholder or generic):
-"{original_description}"
-
-Requirements:
-1. Use the title/category/context to describe the correct product
-2. Keep it accurate and specific to the item
-3. Optimize for Facebook Marketplace
-4. Maintain appropriate length (120-350 characters)
-5. NO EMOJIS - use text only
-6. Use bullet points if appropriate
-7. Avoid adding unrelated product details
-
-Generate 3 different description variations, each on a new line starting with "VARIATION:"
-"""
             
-            # Call OpenAI API
-            response = self._call_openai_api(prompt)
+            direct = self._direct_result(account, 'description', original_description)
+            if direct:
+                return direct
             
-            if response['success']:
-                variations = self._parse_ai_variations(response['content'])
-                
-                if variations:
-                    # Select best variation
-                    best_variation = variations[0]  # Simple selection
-                    
-                    return {
-                        'success': True,
-                        'variation': best_variation,
-                        'type': 'ai_generated',
-                        'all_variations': variations,
-                        'confidence': 0.9
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': 'Could not parse AI variations',
-                        'variation': original_description
-                    }
-            else:
-                return {
-                    'success': False,
-                    'error': response['error'],
-                    'variation': original_description
-                }
+            semantic_text, prompt = self._description_request(original_description, context)
+            cached_variations, embedding = self._semantic_lookup('description', semantic_text)
+            result = self._cached_result('description', cached_variations)
+            if result is None:
+                response = self._call_with_fallback(prompt, self.desc_model)
+                result = self._response_result('description', original_description, response, embedding)
+            self._remember_variations(account, 'description', original_description, result)
+            return result
                 
         except Exception as e:
             print(f"ERROR: Error generating AI description variation: {e}")
@@ -322,14 +988,185 @@ Generate 3 different description variations, each on a new line starting with "V
                 'variation': original_description
             }
     
-    def _call_openai_api(self, prompt: str) -> Dict:
+    async def _agenerate_variation(self, client, account: str, kind: str, original: str, semantic_text: str,
+                                   prompt: str, model: str) -> Dict:
+        """Async counterpart of the generate_ai_*_variation methods."""
+        try:
+            direct = self._direct_result(account, kind, original)
+            if direct:
+                return direct
+            
+            # Embeddings are fetched with the sync client, off the event loop
+            cached_variations, embedding = await asyncio.to_thread(self._semantic_lookup, kind, semantic_text)
+            result = self._cached_result(kind, cached_variations)
+            if result is None:
+                response = await self._acall_with_fallback(client, prompt, model)
+                result = self._response_result(kind, original, response, embedding)
+            self._remember_variations(account, kind, original, result)
+            return result
+        
+        except Exception as e:
+            print(f"ERROR: Error generating AI {kind} variation: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'variation': original
+            }
+    
+    async def agenerate_bundle(self, account: str, title: str, description: str, context: Dict = None) -> Dict:
+        """
+        Generate title and description variations for one listing concurrently.
+        
+        Args:
+            account (str): Account name
+            title (str): Original title
+            description (str): Original description
+            context (Dict): Additional description context; the title is added if missing
+            
+        Returns:
+            Dict: {'title': title variation result, 'description': description variation result}
+        """
+        if not self.api_key:
+            return {
+                'title': {'success': False, 'error': 'No OpenAI API key available', 'variation': title},
+                'description': {'success': False, 'error': 'No OpenAI API key available', 'variation': description}
+            }
+        
+        try:
+            import openai
+        except ImportError:
+            print("ERROR: OpenAI package not installed. Install with: pip install openai")
+            return {
+                'title': {'success': False, 'error': 'OpenAI package not installed', 'variation': title},
+                'description': {'success': False, 'error': 'OpenAI package not installed', 'variation': description}
+            }
+        
+        print(f"Generating AI title and description variations for: {title[:50]}...")
+        
+        context = dict(context or {})
+        context.setdefault('title', title)
+        
+        # An async client is tied to the event loop it was first used on, so
+        # each bundle gets its own
+        async with openai.AsyncOpenAI(api_key=self.api_key, **_openai_client_kwargs(async_client=True)) as client:
+            title_result, description_result = await asyncio.gather(
+                self._agenerate_variation(client, account, 'title', title, *self._title_request(title),
+                                          self.title_model),
+                self._agenerate_variation(client, account, 'description', description,
+                                          *self._description_request(description, context), self.desc_model)
+            )
+        return {'title': title_result, 'description': description_result}
+    
+    def generate_bundle(self, account: str, title: str, description: str, context: Dict = None) -> Dict:
+        """Blocking wrapper around agenerate_bundle() for callers without an event loop."""
+        return asyncio.run(self.agenerate_bundle(account, title, description, context))
+    
+    def _needs_fallback(self, response: Dict, model: str) -> bool:
+        """True if a successful response has too few variations and a fallback model is left."""
+        return (response['success'] and model != self.fallback_model
+                and len(self._parse_ai_variations(response['content'])) < OPENAI_MIN_VARIATIONS)
+    
+    def _call_with_fallback(self, prompt: str, model: str) -> Dict:
+        """Call the given model, retrying on the fallback model if its answer is thin."""
+        response = self._call_openai_api(prompt, model)
+        if self._needs_fallback(response, model):
+            print(f"Too few variations from {model}, retrying with {self.fallback_model}")
+            fallback = self._call_openai_api(prompt, self.fallback_model)
+            if fallback['success']:
+                return fallback
+        return response
+    
+    async def _acall_with_fallback(self, client, prompt: str, model: str) -> Dict:
+        """Async counterpart of _call_with_fallback()."""
+        response = await self._acall_openai_api(client, prompt, model)
+        if self._needs_fallback(response, model):
+            print(f"Too few variations from {model}, retrying with {self.fallback_model}")
+            fallback = await self._acall_openai_api(client, prompt, self.fallback_model)
+            if fallback['success']:
+                return fallback
+        return response
+    
+    def _record_usage(self, model: str, usage):
+        """Add a live response's token usage to the per-model totals in success_metrics."""
+        totals = self.learning_data.setdefault('success_metrics', {}).setdefault('token_usage', {}).setdefault(
+            model, {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+        )
+        totals['calls'] += 1
+        totals['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+        totals['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+        self._dirty = True
+    
+    def generate_ai_title_variations_batch(self, account: str, titles: List[str]) -> List[Dict]:
+        """
+        Generate AI-powered title variations for many listings, several titles per OpenAI call.
+        
+        Args:
+            account (str): Account name
+            titles (List[str]): Original titles
+            
+        Returns:
+            List[Dict]: One variation result per title, in input order
+        """
+        if not self.api_key:
+            return [{'success': False, 'error': 'No OpenAI API key available', 'variation': title}
+                    for title in titles]
+        
+        print(f"Generating AI title variations for {len(titles)} titles in batches...")
+        
+        results: Dict[str, Dict] = {}
+        pending = []
+        for title in dict.fromkeys(titles):
+            direct = self._direct_result(account, 'title', title)
+            if direct:
+                results[title] = direct
+            else:
+                pending.append(title)
+        
+        for start in range(0, len(pending), TITLE_BATCH_SIZE):
+            batch = pending[start:start + TITLE_BATCH_SIZE]
+            for title, variations in zip(batch, self._call_title_batch(batch)):
+                if variations:
+                    result = self._variation_result(variations, 'ai_generated')
+                    self._remember_variations(account, 'title', title, result)
+                else:
+                    # Missing from the batch answer; ask for this title on its own
+                    result = self.generate_ai_title_variation(account, title)
+                results[title] = result
+        
+        return [results[title] for title in titles]
+    
+    def _call_title_batch(self, titles: List[str]) -> List[List[str]]:
+        """Send one batch prompt and return the variations for each title ([] if missing)."""
+        listings = json.dumps([{'id': i, 'title': title} for i, title in enumerate(titles)], ensure_ascii=False)
+        prompt = TITLE_BATCH_PROMPT_TEMPLATE.format_map({'listings': listings})
+        response = self._call_openai_api(prompt, self.title_model, TITLE_BATCH_MAX_TOKENS * len(titles))
+        
+        by_id: Dict[int, List[str]] = {}
+        if response['success']:
+            try:
+                data = _json_loads(response['content'])
+            except ValueError:
+                data = None
+            entries = data.get('results') if isinstance(data, dict) else None
+            for entry in entries if isinstance(entries, list) else []:
+                if (isinstance(entry, dict) and isinstance(entry.get('id'), int)
+                        and isinstance(entry.get('variations'), list)):
+                    by_id[entry['id']] = [v.strip() for v in entry['variations'] if isinstance(v, str) and v.strip()]
+        return [by_id.get(i, []) for i in range(len(titles))]
+    
+    def _call_openai_api(self, prompt: str, model: str = OPENAI_MODEL, max_tokens: int = OPENAI_MAX_TOKENS) -> Dict:
         """Call OpenAI API with the given prompt."""
         try:
+            key = _openai_cache_key(prompt, model, max_tokens)
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                print("Using cached OpenAI response")
+                return cached
+            
             print("Calling OpenAI API...")
             
-            # Import OpenAI
             try:
-                import openai
+                client = self._get_openai_client()
             except ImportError:
                 print("ERROR: OpenAI package not installed. Install with: pip install openai")
                 return {
@@ -337,28 +1174,41 @@ Generate 3 different description variations, each on a new line starting with "V
                     'error': 'OpenAI package not installed'
                 }
             
-            # Initialize OpenAI client
-            client = openai.OpenAI(api_key=self.api_key)
-            
             # Call OpenAI API
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",  # Cost-effective model
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert Facebook Marketplace listing optimizer. Generate unique, engaging variations that are optimized for Facebook Marketplace search and engagement."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,  # Limit tokens to control costs
-                temperature=0.7,  # Balanced creativity
-                top_p=0.9
-            )
+            response = client.chat.completions.create(**_chat_params(prompt, model, max_tokens))
             
             content = response.choices[0].message.content.strip()
+            self._cache_response(key, content, response.usage)
+            self._record_usage(model, response.usage)
+            
+            return {
+                'success': True,
+                'content': content,
+                'usage': response.usage  # Track token usage for cost monitoring
+            }
+            
+        except Exception as e:
+            print(f"ERROR: Error calling OpenAI API: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def _acall_openai_api(self, client, prompt: str, model: str = OPENAI_MODEL) -> Dict:
+        """Async counterpart of _call_openai_api() using a shared AsyncOpenAI client."""
+        try:
+            key = _openai_cache_key(prompt, model)
+            cached = self._get_cached_response(key)
+            if cached is not None:
+                print("Using cached OpenAI response")
+                return cached
+            
+            print("Calling OpenAI API...")
+            response = await client.chat.completions.create(**_chat_params(prompt, model))
+            
+            content = response.choices[0].message.content.strip()
+            self._cache_response(key, content, response.usage)
+            self._record_usage(model, response.usage)
             
             return {
                 'success': True,
@@ -374,29 +1224,30 @@ Generate 3 different description variations, each on a new line starting with "V
             }
     
     def _parse_ai_variations(self, content: str) -> List[str]:
-        """Parse AI-generated variations from response content."""
+        """
+        Parse AI-generated variations from response content.
+        
+        Responses are expected as {"variations": [...]}; anything that is not
+        such a JSON object falls back to the line formats older prompts used.
+        """
         try:
+            try:
+                data = _json_loads(content)
+            except ValueError:
+                data = None
+            if isinstance(data, dict) and isinstance(data.get('variations'), list):
+                return [v.strip() for v in data['variations'] if isinstance(v, str) and v.strip()]
+            
             variations = []
-            lines = content.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line:
-                    # Handle different formats
-                    if line.startswith('VARIATION:'):
-                        variation = line.replace('VARIATION:', '').strip()
-                        if variation:
-                            variations.append(variation)
-                    elif line.startswith('"') and line.endswith('"'):
-                        # Handle quoted variations
-                        variation = line.strip('"')
-                        if variation:
-                            variations.append(variation)
-                    elif any(line.startswith(prefix) for prefix in ['1.', '2.', '3.', '4.', '5.']):
-                        # Handle numbered variations
-                        variation = line.split('.', 1)[1].strip().strip('"')
-                        if variation:
-                            variations.append(variation)
+            for labelled, quoted, numbered in _VARIATION_LINE_RE.findall(content):
+                if labelled:
+                    variation = labelled.replace('VARIATION:', '').strip()
+                elif quoted:
+                    variation = quoted.strip('"')
+                else:
+                    variation = numbered.strip().strip('"')
+                if variation:
+                    variations.append(variation)
             
             return variations
             
@@ -419,14 +1270,17 @@ Generate 3 different description variations, each on a new line starting with "V
                 account_data = self.learning_data.get('accounts', {}).get(account, {})
                 return {
                     'account': account,
-                    'insights': account_data.get('analysis', {}),
+                    'insights': account_data.get('patterns', {}),
                     'last_analyzed': account_data.get('last_analyzed'),
-                    'total_listings': account_data.get('total_listings', 0)
+                    'total_listings': account_data.get('patterns', {}).get('total_listings', 0),
+                    'total_variations': self._get_cache_conn().execute(
+                        'SELECT COUNT(*) FROM variations WHERE account = ?', (account,)
+                    ).fetchone()[0]
                 }
             else:
                 # Global insights
                 total_accounts = len(self.learning_data.get('accounts', {}))
-                total_variations = len(self.learning_data.get('variations', {}))
+                total_variations = self._get_cache_conn().execute('SELECT COUNT(*) FROM variations').fetchone()[0]
                 
                 return {
                     'total_accounts': total_accounts,
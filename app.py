@@ -1,9 +1,26 @@
-from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, abort, render_template, request, jsonify, send_file
+from werkzeug.exceptions import HTTPException, NotFound
+from werkzeug.utils import safe_join
 import os
+import mimetypes
+import re
+import stat
 import json
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 import threading
+import time
 import sqlite3
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import quote
+from urllib.request import pathname2url
 from bot import MarketplaceBot
 from database_enhanced import (
     init_enhanced_tables, log_activity, get_activity_log,
@@ -12,13 +29,395 @@ from database_enhanced import (
     track_analytics
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging():
+    """
+    Send this module's log output to stdout from a background listener thread,
+    so the bot and request threads only enqueue records instead of writing.
+    """
+    if logger.handlers:
+        return None
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+_log_listener = _configure_logging()
+
+# Form and environment values accepted as "on"
+_TRUTHY = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Serialize to compact UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# journal_mode=WAL is set separately in init_db so the result can be checked
+ACCOUNT_DB_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-64000',
+    'PRAGMA wal_autocheckpoint=1000',
+    'PRAGMA mmap_size=134217728',
+)
+
+LISTINGS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS listings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        price TEXT NOT NULL,
+        description TEXT,
+        category TEXT,
+        product_tags TEXT,
+        location TEXT,
+        image_paths TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'active',
+        facebook_listing_id TEXT,
+        notes TEXT
+    )
+'''
+
+LISTINGS_TITLE_INDEX = 'CREATE UNIQUE INDEX IF NOT EXISTS idx_listings_title ON listings(title)'
+# Also serves the relist lookup on databases where duplicate titles block the unique index
+LISTINGS_TITLE_STATUS_INDEX = 'CREATE INDEX IF NOT EXISTS idx_listings_title_status ON listings(title, status)'
+
+# Listings that haven't been deleted, as the listings page and title check select them
+LIVE_LISTING_FILTER = "status != 'deleted' OR status IS NULL"
+# Listings a relist or delete job may still act on
+ACTIONABLE_LISTING_FILTER = "status IN ('active', 'relisted') OR status IS NULL"
+# Partial index matching the filter, so the listings page reads newest-first without sorting
+LISTINGS_LIVE_CREATED_INDEX = f'''
+    CREATE INDEX IF NOT EXISTS idx_listings_live_created
+    ON listings(created_at) WHERE {LIVE_LISTING_FILTER}
+'''
+# The duplicate title check compares titles case-insensitively
+LISTINGS_LOWER_TITLE_INDEX = 'CREATE INDEX IF NOT EXISTS idx_listings_lower_title ON listings(LOWER(title))'
+
+# executemany form; sqlite3 can't run statements that return rows that way
+BULK_UPSERT_LISTINGS_QUERY = '''
+    INSERT INTO listings (title, price, description, category, product_tags, location, image_paths, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'active')
+    ON CONFLICT(title) DO UPDATE SET
+        price = excluded.price,
+        description = excluded.description,
+        category = excluded.category,
+        product_tags = excluded.product_tags,
+        location = excluded.location,
+        image_paths = excluded.image_paths,
+        updated_at = CURRENT_TIMESTAMP,
+        status = 'active'
+'''
+UPSERT_LISTING_QUERY = BULK_UPSERT_LISTINGS_QUERY + '    RETURNING id\n'
+
+MARK_DELETED_QUERY = '''
+    UPDATE listings
+    SET status = 'deleted', updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+# Batch jobs write their database changes in groups of this many listings
+DB_BATCH_SIZE = 10
+
+# Bulk saves commit once per this many listings
+BULK_INSERT_BATCH_SIZE = 5000
+
+# Keep "id IN (...)" lists well under SQLite's bound-parameter limit;
+# a power of two so select_listings_by_ids' padded lists fit exactly
+SQL_IN_CHUNK_SIZE = 512
+
+ACTIVE_LISTINGS_BY_TITLE_QUERY = "SELECT id FROM listings WHERE title = ? AND status = 'active'"
+
+# A NULL title or location leaves the current value in place
+RENAME_LISTING_QUERY = '''
+    UPDATE listings
+    SET status = ?,
+        updated_at = CURRENT_TIMESTAMP,
+        title = COALESCE(?, title),
+        description = ?,
+        location = COALESCE(?, location)
+    WHERE id = ?
+'''
+
+# Deleted listings keep their row (and title) for the history tables, so a
+# listing being renamed onto one of those titles moves the deleted one aside
+FREE_DELETED_TITLE_QUERY = '''
+    UPDATE listings
+    SET title = title || ' (deleted #' || id || ')'
+    WHERE title = ? AND status = 'deleted' AND id != ?
+'''
+
+
+def init_db(conn):
+    """
+    Prepare a freshly opened account database: pragmas, table and indexes.
+    Returns False when older duplicate titles prevent the unique index,
+    in which case saves fall back to looking the title up first.
+    """
+    journal_mode = conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+    if journal_mode.lower() != 'wal':
+        logger.warning("⚠️ Could not enable WAL for listings database, using %s journal", journal_mode)
+    for pragma in ACCOUNT_DB_PRAGMAS:
+        conn.execute(pragma)
+    # Table, indexes and statistics go in one transaction: one commit instead of one per statement
+    conn.execute('BEGIN IMMEDIATE')
+    with conn:
+        conn.execute(LISTINGS_SCHEMA)
+        conn.execute(LISTINGS_TITLE_STATUS_INDEX)
+        conn.execute(LISTINGS_LIVE_CREATED_INDEX)
+        conn.execute(LISTINGS_LOWER_TITLE_INDEX)
+        unique_titles = True
+        try:
+            conn.execute(LISTINGS_TITLE_INDEX)
+        except sqlite3.IntegrityError as e:
+            # Only the failed statement is undone; the rest of the transaction stands
+            logger.warning("⚠️ Duplicate listing titles found, saving without UPSERT: %s", e)
+            unique_titles = False
+        # Refresh planner statistics so the new indexes are picked up
+        conn.execute('ANALYZE listings')
+    return unique_titles
+
+
+def connect_readonly(db_path):
+    """
+    Open a read-only connection for the Flask endpoints.
+    With WAL these reads never wait on the bot's pooled write connection,
+    so request handlers read through read_pool instead of borrowing from db_pool.
+    """
+    uri = 'file:' + pathname2url(os.path.abspath(db_path)) + '?mode=ro'
+    # ReadOnlyPool hands idle connections to whichever request thread comes next
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+class AccountDBPool:
+    """
+    Keeps one open write connection per account database.
+    SQLite only allows a single writer, so each database gets its own lock
+    and callers take turns on the shared connection instead of reopening the file.
+    Endpoints that only read should borrow from read_pool instead.
+    """
+
+    def __init__(self):
+        self._conns = {}
+        self._locks = {}
+        self._unique_titles = {}
+        self._pool_lock = threading.Lock()
+
+    def get(self, db_path):
+        """Return the pooled connection and lock for a database, opening it on first use."""
+        key = os.path.abspath(db_path)
+        with self._pool_lock:
+            conn = self._conns.get(key)
+            if conn is None:
+                conn = sqlite3.connect(key, check_same_thread=False, isolation_level=None)
+                self._unique_titles[key] = init_db(conn)
+                self._conns[key] = conn
+                self._locks[key] = threading.Lock()
+            return conn, self._locks[key]
+
+    def has_unique_titles(self, db_path):
+        """Whether the database has the unique title index that UPSERT relies on."""
+        self.get(db_path)
+        return self._unique_titles[os.path.abspath(db_path)]
+
+    @contextmanager
+    def acquire(self, db_path):
+        """
+        Yield a cursor inside a transaction that commits on success and rolls back on error.
+        BEGIN IMMEDIATE takes the write lock up front, so a transaction that reads
+        before writing can't hit SQLITE_BUSY halfway through when another process
+        (the enhanced-feature helpers) is writing the same file.
+        """
+        conn, lock = self.get(db_path)
+        with lock:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                yield cursor
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                cursor.close()
+
+    def close_all(self):
+        """Close every pooled connection."""
+        with self._pool_lock:
+            for conn in self._conns.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._conns.clear()
+            self._locks.clear()
+            self._unique_titles.clear()
+
+
+db_pool = AccountDBPool()
+atexit.register(db_pool.close_all)
+
+
+class ReadOnlyPool:
+    """
+    Keeps idle read-only connections per account database for the endpoints.
+    Each request borrows one for its queries and hands it back afterwards,
+    so page cache and parsed schema survive between requests.
+    """
+
+    def __init__(self):
+        self._idle = {}
+        self._pool_lock = threading.Lock()
+
+    def _queue(self, key):
+        with self._pool_lock:
+            idle = self._idle.get(key)
+            if idle is None:
+                idle = self._idle[key] = queue.SimpleQueue()
+            return idle
+
+    @contextmanager
+    def borrow(self, db_path):
+        """Yield a read-only connection, returning it to the pool when done."""
+        key = os.path.abspath(db_path)
+        idle = self._queue(key)
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            conn = connect_readonly(key)
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        idle.put(conn)
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._pool_lock:
+            queues = list(self._idle.values())
+            self._idle.clear()
+        for idle in queues:
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+read_pool = ReadOnlyPool()
+atexit.register(read_pool.close_all)
+
+
+@lru_cache(maxsize=64)
+def _select_by_ids_sql(columns, status_filter, count):
+    """SELECT for `count` listing IDs; cached so repeat shapes reuse one SQL string."""
+    return f'''
+        SELECT {columns}
+        FROM listings
+        WHERE id IN ({','.join('?' * count)}) AND ({status_filter})
+        ORDER BY id
+    '''
+
+
+def select_listings_by_ids(conn, columns, listing_ids, status_filter):
+    """
+    Fetch the listings with the given IDs whose status matches status_filter.
+    IDs that aren't numbers are ignored. Each query's ID list is padded to a
+    power of two with an ID that can't exist, so the few resulting SQL strings
+    stay in sqlite3's statement cache on the pooled connections.
+    """
+    wanted_ids = sorted({int(i) for i in listing_ids if str(i).strip().isdigit()})
+    rows = []
+    for start in range(0, len(wanted_ids), SQL_IN_CHUNK_SIZE):
+        chunk = wanted_ids[start:start + SQL_IN_CHUNK_SIZE]
+        bucket = 1 << (len(chunk) - 1).bit_length()
+        chunk += [-1] * (bucket - len(chunk))
+        rows += conn.execute(_select_by_ids_sql(columns, status_filter, bucket), chunk).fetchall()
+    return rows
+
+# Behind nginx, set USE_XACCEL so files are handed to the proxy instead of
+# streamed through Python. nginx needs a matching internal location, e.g.
+#   location /protected/ { internal; alias /app/; }
+# where /app/ is the directory the app runs from.
+USE_XACCEL = os.getenv('USE_XACCEL', '').lower() in _TRUTHY
+XACCEL_PREFIX = os.getenv('XACCEL_PREFIX', '/protected/')
+STATIC_FILE_MAX_AGE = 86400
+
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp'})
+UPLOAD_BUFFER_SIZE = 1 << 20  # Werkzeug copies uploads 16 KiB at a time by default
+
+# Turn a listing title into a folder-name fragment
+_SAFE_TITLE_STRIP = re.compile(r'[^\w\s-]')
+_SAFE_TITLE_SEP = re.compile(r'[-\s]+')
+
+def _send_app_file(subdir, filepath):
+    """
+    Send a file from the app folder (or one of its subfolders), refusing paths that escape it.
+    Uses X-Accel-Redirect when USE_XACCEL is set, otherwise send_file.
+    """
+    app_root = os.getcwd()
+    full_path = safe_join(os.path.join(app_root, subdir), filepath)
+    if full_path is None:
+        abort(404)
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        abort(404)
+    if not stat.S_ISREG(st.st_mode):
+        abort(404)
+
+    if USE_XACCEL:
+        internal_path = os.path.relpath(full_path, app_root).replace(os.sep, '/')
+        response = Response()
+        response.headers['X-Accel-Redirect'] = XACCEL_PREFIX.rstrip('/') + '/' + quote(internal_path)
+        response.headers['Content-Type'] = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        return response
+
+    # send_file streams through the server's file wrapper rather than reading the
+    # whole file, answers repeat requests with 304 and serves byte ranges. The ETag
+    # stays strong so If-Range requests can resume partial downloads.
+    return send_file(
+        full_path,
+        mimetype=mimetypes.guess_type(full_path)[0],
+        conditional=True,
+        etag=f"{st.st_mtime_ns:x}-{st.st_size:x}",
+        last_modified=st.st_mtime,
+        max_age=STATIC_FILE_MAX_AGE
+    )
+
 @app.route('/static/logo/<path:filename>')
 def serve_logo(filename):
     """Serve logo files."""
-    logo_dir = os.path.join(os.getcwd(), 'logo')
-    return send_from_directory(logo_dir, filename)
+    return _send_app_file('logo', filename)
 
 @app.route('/image/<path:filepath>')
 def serve_image(filepath):
@@ -26,28 +425,153 @@ def serve_image(filepath):
     # Images are stored in accounts/account_name/images/
     # The filepath will be like: accounts/account_name/images/filename.jpg
     try:
-        # Get the directory and filename from the full path
-        directory = os.path.dirname(filepath)
-        filename = os.path.basename(filepath)
-        full_dir = os.path.join(os.getcwd(), directory)
-        return send_from_directory(full_dir, filename)
+        return _send_app_file('', filepath)
+    except NotFound:
+        return "Image not found", 404
+    except HTTPException as e:
+        # Keep 416 and other protocol answers from send_file intact
+        return e
     except Exception as e:
-        print(f"Error serving image: {e}")
+        logger.error("Error serving image: %s", e)
         return "Image not found", 404
 
+ACCOUNTS_CACHE_TTL = 5.0
+_accounts_cache = {'accounts': None, 'expires': 0.0}
+
 def get_accounts():
-    """Get list of account directories."""
+    """
+    Get list of account directories.
+    The listing is cached for a few seconds because most pages ask for it;
+    call invalidate_accounts_cache() after creating an account.
+    """
+    now = time.monotonic()
+    if _accounts_cache['accounts'] is not None and now < _accounts_cache['expires']:
+        return list(_accounts_cache['accounts'])
+
     accounts_dir = os.path.join(os.getcwd(), 'accounts')
-    if not os.path.exists(accounts_dir):
-        return []
-    
-    accounts = []
-    for item in os.listdir(accounts_dir):
-        item_path = os.path.join(accounts_dir, item)
-        if os.path.isdir(item_path):
-            accounts.append(item)
-    
-    return accounts
+    try:
+        # scandir's entries already know if they are directories, so no stat per account
+        with os.scandir(accounts_dir) as entries:
+            accounts = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        accounts = []
+
+    _accounts_cache['accounts'] = accounts
+    _accounts_cache['expires'] = now + ACCOUNTS_CACHE_TTL
+    return list(accounts)
+
+def invalidate_accounts_cache():
+    """Forget the cached account list and database paths so they are looked up again."""
+    _accounts_cache['accounts'] = None
+    _account_dbs.clear()
+
+_account_dbs = {}
+
+def _account_db(account_name):
+    """
+    Return the path of an account's listings.db, or None if it doesn't exist.
+    Found paths are remembered; missing ones are checked again next time,
+    since saving the account's first listing creates the database.
+    """
+    db_path = _account_dbs.get(account_name)
+    if db_path is None:
+        db_path = os.path.join('accounts', account_name, 'listings.db')
+        if not os.path.isfile(db_path):
+            return None
+        _account_dbs[account_name] = db_path
+    return db_path
+
+_account_paths = {}
+
+def _resolve_account_paths(account_name):
+    """
+    Return (cookies_path, db_path) for an account, creating its folder if needed.
+    Cookies prefer .pkl over .json. Paths are remembered once a cookies file
+    exists; until then the folder is rescanned so newly added cookies are found.
+    """
+    cached = _account_paths.get(account_name)
+    if cached:
+        return cached
+
+    account_dir = os.path.join('accounts', account_name)
+    os.makedirs(account_dir, exist_ok=True)
+    with os.scandir(account_dir) as entries:
+        names = {entry.name for entry in entries}
+
+    db_path = os.path.join(account_dir, 'listings.db')
+    for cookies_name in ('cookies.pkl', 'cookies.json'):
+        if cookies_name in names:
+            paths = (os.path.join(account_dir, cookies_name), db_path)
+            _account_paths[account_name] = paths
+            return paths
+    return os.path.join(account_dir, 'cookies.json'), db_path  # Default fallback
+
+BOT_WORKERS = int(os.getenv('BOT_WORKERS', '4'))
+BOT_MAX_QUEUE = int(os.getenv('BOT_MAX_QUEUE', '16'))
+
+# Each bot job drives its own browser, so only a few run at once and a
+# bounded number wait behind them; anything beyond that is turned away.
+# Jobs for one account run one after another on a single worker, so an
+# account never has two browser windows logged in at the same time.
+_bot_executor = ThreadPoolExecutor(max_workers=BOT_WORKERS, thread_name_prefix='bot')
+_bot_slots = threading.BoundedSemaphore(BOT_WORKERS + BOT_MAX_QUEUE)
+_bot_futures = {}
+_bot_account_jobs = {}  # account -> deque of jobs waiting behind its running one
+_bot_jobs_lock = threading.Lock()
+
+def _submit_bot_job(account_name, target, *args):
+    """
+    Run a bot function on the shared worker pool, after any earlier jobs for the same account.
+    Returns the Future, or None when the pool and its queue are full.
+    """
+    slots = _bot_slots
+    if not slots.acquire(blocking=False):
+        logger.warning("⚠️ Bot queue is full, not starting job for account: %s", account_name)
+        return None
+
+    future = Future()
+    with _bot_jobs_lock:
+        waiting = _bot_account_jobs.get(account_name)
+        start_worker = waiting is None
+        if start_worker:
+            waiting = _bot_account_jobs[account_name] = deque()
+        waiting.append((target, args, future, slots))
+        _bot_futures[account_name] = future
+    if start_worker:
+        _bot_executor.submit(_run_account_jobs, account_name)
+    else:
+        logger.info("⏳ Bot job for account %s queued behind the one already running", account_name)
+    return future
+
+def _run_account_jobs(account_name):
+    """Run an account's queued bot jobs in order until none are left."""
+    while True:
+        with _bot_jobs_lock:
+            waiting = _bot_account_jobs[account_name]
+            if not waiting:
+                del _bot_account_jobs[account_name]
+                return
+            target, args, future, slots = waiting.popleft()
+
+        # Free the slot before completing the future, so whoever waits on it can submit again
+        if not future.set_running_or_notify_cancel():
+            slots.release()
+            continue
+        try:
+            result = target(account_name, *args)
+        except BaseException as e:
+            slots.release()
+            future.set_exception(e)
+        else:
+            slots.release()
+            future.set_result(result)
+
+def _bot_queue_full_response():
+    """JSON reply for when a bot job could not be queued."""
+    return jsonify({
+        'success': False,
+        'message': 'Too many bot jobs are running or queued. Please try again in a few minutes.'
+    }), 429
 
 def run_bot_process(account_name, listing_data):
     """
@@ -56,26 +580,10 @@ def run_bot_process(account_name, listing_data):
     """
     bot = None
     try:
-        print(f"Starting bot process for account: {account_name}")
+        logger.info("Starting bot process for account: %s", account_name)
         
-        # Construct paths for this account
-        account_dir = os.path.join('accounts', account_name)
-        
-        # Look for cookies file (either .json or .pkl)
-        cookies_path = None
-        for ext in ['.pkl', '.json']:
-            potential_path = os.path.join(account_dir, f'cookies{ext}')
-            if os.path.exists(potential_path):
-                cookies_path = potential_path
-                break
-        
-        if not cookies_path:
-            cookies_path = os.path.join(account_dir, 'cookies.json')  # Default fallback
-        
-        db_path = os.path.join(account_dir, 'listings.db')
-        
-        # Ensure account directory exists
-        os.makedirs(account_dir, exist_ok=True)
+        # Construct paths for this account (creates the account folder if needed)
+        cookies_path, db_path = _resolve_account_paths(account_name)
         
         # Initialize the bot
         delay_factor = float(listing_data.get('speed', 1.0))
@@ -86,56 +594,44 @@ def run_bot_process(account_name, listing_data):
         if listing_data.get('title'):
             # Use original_title if available, otherwise use current title
             search_title = listing_data.get('original_title', listing_data['title'])
-            delete_success = bot.delete_listing_if_exists(search_title)
-            if delete_success:
-                print(f"✅ Successfully deleted existing listing: {search_title}")
-            elif getattr(bot, 'last_delete_found', False):
-                print(f"⚠️ Listing was found but delete failed: {search_title}")
+            delete_result = bot.delete_listing_if_exists(search_title)
+            if delete_result.success:
+                logger.info("✅ Successfully deleted existing listing: %s", search_title)
+            elif delete_result.found:
+                logger.warning("⚠️ Listing was found but delete failed: %s", search_title)
             else:
-                print(f"ℹ️ No existing listing found to delete: {search_title}")
-            print("📝 Continuing with listing creation...")
+                logger.info("ℹ️ No existing listing found to delete: %s", search_title)
+            logger.info("📝 Continuing with listing creation...")
 
         # Create new listing and get the result with new title/description
         result = bot.create_new_listing(listing_data)
 
         # Update database with new title if listing was successful
         if result and result.get('success'):
-            print(f"✅ Listing created with new title: {result['new_title']}")
+            logger.info("✅ Listing created with new title: %s", result['new_title'])
             # Update the database entry with new title and description
             # Find by original title and update to new title to avoid duplicates
             try:
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-
-                # Find the listing by original title
-                original_title = result.get('original_title', listing_data['title'])
-                cursor.execute('SELECT id FROM listings WHERE title = ?', (original_title,))
-                existing = cursor.fetchone()
-
-                if existing:
-                    # Update the existing listing with the new title
-                    listing_id = existing[0]
-                    cursor.execute('''
-                        UPDATE listings
-                        SET title = ?,
-                            description = ?,
-                            updated_at = CURRENT_TIMESTAMP,
-                            status = 'active'
-                        WHERE id = ?
-                    ''', (result['new_title'], result['new_description'], listing_id))
-                    print(f"✅ Database updated: '{original_title}' → '{result['new_title']}'")
-                else:
-                    print(f"⚠️ Original listing not found in database: {original_title}")
-
-                conn.commit()
-                conn.close()
+                with db_pool.acquire(db_path) as cursor:
+                    # Find the listing by original title
+                    original_title = result.get('original_title', listing_data['title'])
+                    cursor.execute('SELECT id FROM listings WHERE title = ?', (original_title,))
+                    existing = cursor.fetchone()
+
+                    if existing:
+                        # Update the existing listing with the new title
+                        listing_id = existing[0]
+                        _rename_listing(cursor, listing_id, 'active', result['new_title'], result['new_description'])
+                        logger.info("✅ Database updated: '%s' → '%s'", original_title, result['new_title'])
+                    else:
+                        logger.warning("⚠️ Original listing not found in database: %s", original_title)
             except Exception as db_error:
-                print(f"⚠️ Failed to update database: {db_error}")
+                logger.warning("⚠️ Failed to update database: %s", db_error)
 
-        print(f"Bot process completed successfully for account: {account_name}")
+        logger.info("Bot process completed successfully for account: %s", account_name)
         
     except Exception as e:
-        print(f"Error in bot process for account {account_name}: {e}")
+        logger.error("Error in bot process for account %s: %s", account_name, e)
     finally:
         if bot:
             bot.close()
@@ -143,28 +639,14 @@ def run_bot_process(account_name, listing_data):
 def run_multiple_bot_process(account_name, listings_data):
     """Run the bot process for multiple listings in a single session."""
     bot = None
+    db_path = None
+    pending_updates = []
     try:
-        print(f"🤖 Starting multiple bot process for account: {account_name}")
-        print(f"📋 Processing {len(listings_data)} listings...")
+        logger.info("🤖 Starting multiple bot process for account: %s", account_name)
+        logger.info("📋 Processing %s listings...", len(listings_data))
         
-        # Construct paths
-        account_dir = os.path.join('accounts', account_name)
-        
-        # Find cookies file (try both .pkl and .json)
-        cookies_path = None
-        for ext in ['.pkl', '.json']:
-            potential_path = os.path.join(account_dir, f'cookies{ext}')
-            if os.path.exists(potential_path):
-                cookies_path = potential_path
-                break
-        
-        if not cookies_path:
-            cookies_path = os.path.join(account_dir, 'cookies.json')  # Default fallback
-        
-        db_path = os.path.join(account_dir, 'listings.db')
-        
-        # Ensure account directory exists
-        os.makedirs(account_dir, exist_ok=True)
+        # Construct paths for this account (creates the account folder if needed)
+        cookies_path, db_path = _resolve_account_paths(account_name)
         
         # Initialize the bot once for all listings
         delay_factor = float(listings_data[0].get('speed', 1.0))
@@ -177,24 +659,24 @@ def run_multiple_bot_process(account_name, listings_data):
         
         for i, listing_data in enumerate(listings_data, 1):
             try:
-                print(f"\n🔄 Processing listing {i}/{len(listings_data)}: {listing_data['title']}")
+                logger.info("\n🔄 Processing listing %s/%s: %s", i, len(listings_data), listing_data['title'])
                 
                 # Delete existing listing if it exists
                 if listing_data.get('title'):
                     # Use original_title if available, otherwise use current title
                     search_title = listing_data.get('original_title', listing_data['title'])
-                    print(f"🗑️ Attempting to delete existing listing: {search_title}")
-                    delete_success = bot.delete_listing_if_exists(search_title)
-                    if delete_success:
-                        print(f"✅ Successfully deleted existing listing: {search_title}")
-                    elif getattr(bot, 'last_delete_found', False):
-                        print(f"⚠️ Listing was found but delete failed: {search_title}")
+                    logger.info("🗑️ Attempting to delete existing listing: %s", search_title)
+                    delete_result = bot.delete_listing_if_exists(search_title)
+                    if delete_result.success:
+                        logger.info("✅ Successfully deleted existing listing: %s", search_title)
+                    elif delete_result.found:
+                        logger.warning("⚠️ Listing was found but delete failed: %s", search_title)
                     else:
-                        print(f"ℹ️ No existing listing found to delete: {search_title}")
-                    print("📝 Continuing with listing creation...")
+                        logger.info("ℹ️ No existing listing found to delete: %s", search_title)
+                    logger.info("📝 Continuing with listing creation...")
                 
                 # Create new listing
-                print(f"📝 Creating new listing: {listing_data['title']}")
+                logger.info("📝 Creating new listing: %s", listing_data['title'])
                 result = bot.create_new_listing(listing_data)
 
                 if result and result.get('success'):
@@ -203,65 +685,56 @@ def run_multiple_bot_process(account_name, listings_data):
                     listing_data['description'] = result['new_description']
                     listing_data['original_title'] = result['original_title']
 
-                    # Update existing listing status instead of creating new entry
-                    update_listing_status(db_path, listing_data)
+                    # Update existing listing status instead of creating new entry;
+                    # the writes are committed together every DB_BATCH_SIZE listings
+                    pending_updates.append(listing_data)
+                    if len(pending_updates) >= DB_BATCH_SIZE:
+                        update_listing_statuses(db_path, pending_updates)
+                        pending_updates = []
                     successful_listings += 1
-                    print(f"✅ Listing {i}/{len(listings_data)} completed successfully")
-                    print(f"   New title: {result['new_title']}")
+                    logger.info("✅ Listing %s/%s completed successfully", i, len(listings_data))
+                    logger.info("   New title: %s", result['new_title'])
                 else:
                     failed_listings += 1
-                    print(f"❌ Listing {i}/{len(listings_data)} failed to create")
+                    logger.error("❌ Listing %s/%s failed to create", i, len(listings_data))
                 
                 # Add a small delay between listings to avoid rate limiting
                 if i < len(listings_data):
-                    print("⏳ Waiting 3 seconds before next listing...")
-                    import time
+                    logger.info("⏳ Waiting 3 seconds before next listing...")
                     time.sleep(3)
                     
             except Exception as e:
                 failed_listings += 1
-                print(f"❌ Error processing listing {i} ({listing_data.get('title', 'Unknown')}): {str(e)}")
+                logger.error("❌ Error processing listing %s (%s): %s", i, listing_data.get('title', 'Unknown'), e)
                 # Continue with next listing instead of stopping
                 continue
         
-        print(f"\n🎉 Batch processing completed for account: {account_name}")
-        print(f"📊 Results: {successful_listings} successful, {failed_listings} failed out of {len(listings_data)} total")
+        logger.info("\n🎉 Batch processing completed for account: %s", account_name)
+        logger.info("📊 Results: %s successful, %s failed out of %s total", successful_listings, failed_listings, len(listings_data))
         
     except Exception as e:
-        print(f"❌ Error in multiple bot process for account {account_name}: {str(e)}")
+        logger.error("❌ Error in multiple bot process for account %s: %s", account_name, e)
     finally:
+        if pending_updates:
+            update_listing_statuses(db_path, pending_updates)
         try:
             if bot:
                 bot.close()
-                print("🔒 Browser closed successfully")
+                logger.info("🔒 Browser closed successfully")
         except:
             pass
 
 def run_delete_only_process(account_name, listings_data):
     """Run the bot process to delete listings without re-uploading."""
     bot = None
+    db_path = None
+    deleted_ids = []
     try:
-        print(f"🗑️ Starting delete-only process for account: {account_name}")
-        print(f"📋 Deleting {len(listings_data)} listings...")
+        logger.info("🗑️ Starting delete-only process for account: %s", account_name)
+        logger.info("📋 Deleting %s listings...", len(listings_data))
 
-        # Construct paths
-        account_dir = os.path.join('accounts', account_name)
-
-        # Find cookies file (try both .pkl and .json)
-        cookies_path = None
-        for ext in ['.pkl', '.json']:
-            potential_path = os.path.join(account_dir, f'cookies{ext}')
-            if os.path.exists(potential_path):
-                cookies_path = potential_path
-                break
-
-        if not cookies_path:
-            cookies_path = os.path.join(account_dir, 'cookies.json')  # Default fallback
-
-        db_path = os.path.join(account_dir, 'listings.db')
-
-        # Ensure account directory exists
-        os.makedirs(account_dir, exist_ok=True)
+        # Construct paths for this account (creates the account folder if needed)
+        cookies_path, db_path = _resolve_account_paths(account_name)
 
         # Initialize the bot once for all listings
         delay_factor = 1.0  # Use normal speed for deletion
@@ -277,56 +750,138 @@ def run_delete_only_process(account_name, listings_data):
                 title = listing_data.get('title', '')
                 listing_id = listing_data.get('listing_id')
 
-                print(f"\n🗑️ Deleting listing {i}/{len(listings_data)}: {title}")
+                logger.info("\n🗑️ Deleting listing %s/%s: %s", i, len(listings_data), title)
 
                 # Delete the listing
-                delete_success = bot.delete_listing_if_exists(title)
+                delete_result = bot.delete_listing_if_exists(title)
 
-                if delete_success:
+                if delete_result.success:
                     successful_deletions += 1
-                    print(f"✅ Listing {i}/{len(listings_data)} deleted successfully")
+                    logger.info("✅ Listing %s/%s deleted successfully", i, len(listings_data))
 
-                    # Update database to mark as deleted
+                    # Mark as deleted in the database, committed every DB_BATCH_SIZE listings
                     if listing_id:
-                        conn = sqlite3.connect(db_path)
-                        cursor = conn.cursor()
-                        cursor.execute('''
-                            UPDATE listings
-                            SET status = 'deleted', updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        ''', (listing_id,))
-                        conn.commit()
-                        conn.close()
-                        print(f"   Database updated: marked as deleted")
+                        deleted_ids.append(listing_id)
+                        if len(deleted_ids) >= DB_BATCH_SIZE:
+                            mark_listings_deleted(db_path, deleted_ids)
+                            deleted_ids = []
                 else:
                     failed_deletions += 1
-                    print(f"⚠️ Listing {i}/{len(listings_data)} not found or failed to delete")
+                    logger.warning("⚠️ Listing %s/%s not found or failed to delete", i, len(listings_data))
 
                 # Add a small delay between deletions to avoid rate limiting
                 if i < len(listings_data):
-                    print("⏳ Waiting 2 seconds before next deletion...")
-                    import time
+                    logger.info("⏳ Waiting 2 seconds before next deletion...")
                     time.sleep(2)
 
             except Exception as e:
                 failed_deletions += 1
-                print(f"❌ Error deleting listing {i} ({listing_data.get('title', 'Unknown')}): {str(e)}")
+                logger.error("❌ Error deleting listing %s (%s): %s", i, listing_data.get('title', 'Unknown'), e)
                 # Continue with next listing instead of stopping
                 continue
 
-        print(f"\n🎉 Batch deletion completed for account: {account_name}")
-        print(f"📊 Results: {successful_deletions} deleted, {failed_deletions} failed out of {len(listings_data)} total")
+        logger.info("\n🎉 Batch deletion completed for account: %s", account_name)
+        logger.info("📊 Results: %s deleted, %s failed out of %s total", successful_deletions, failed_deletions, len(listings_data))
 
     except Exception as e:
-        print(f"❌ Error in delete-only process for account {account_name}: {str(e)}")
+        logger.error("❌ Error in delete-only process for account %s: %s", account_name, e)
     finally:
+        if deleted_ids:
+            mark_listings_deleted(db_path, deleted_ids)
         try:
             if bot:
                 bot.close()
-                print("🔒 Browser closed successfully")
+                logger.info("🔒 Browser closed successfully")
         except:
             pass
 
+def _relist_listing_data(account_name, row):
+    """Listing data for relisting one (id, title, price, description, category, product_tags, location, image_paths) row."""
+    listing_id, title, price, description, category, product_tags, location, image_paths = row
+    # title is the CURRENT title in database (which is what's on Facebook)
+    # We use it as original_title so the bot can find and delete the existing listing
+    return {
+        'title': title,  # Keep same title (or this could be varied)
+        'price': price,
+        'description': description,  # Keep same description (or this could be varied)
+        'category': category or 'Other Garden decor',
+        'product_tags': product_tags or '',
+        'location': location or '',
+        'image_paths': image_paths.split('|') if image_paths else [],
+        'speed': '1.0',
+        'account': account_name,
+        'listing_id': listing_id,  # Include the database ID
+        'original_title': title  # Use current title to find the listing on Facebook
+    }
+
+def run_relist_rows_process(account_name, rows):
+    """Relist database rows selected by relist_listings in one bot session."""
+    run_multiple_bot_process(account_name, [_relist_listing_data(account_name, row) for row in rows])
+
+def run_delete_rows_process(account_name, rows):
+    """Delete the (id, title) rows selected by delete_listings in one bot session."""
+    run_delete_only_process(account_name, [{'listing_id': listing_id, 'title': title} for listing_id, title in rows])
+
+def _rename_listing(cursor, listing_id, status, new_title, description, location=None):
+    """
+    Give a listing the title it now has on Facebook, along with its new status and description.
+    A deleted listing holding that title is renamed out of the way first. If a live
+    listing already has it, the unique title index refuses the rename, so the listing
+    keeps its old title and only the rest is recorded.
+    Returns True if the title was changed.
+    """
+    cursor.execute(FREE_DELETED_TITLE_QUERY, (new_title, listing_id))
+    try:
+        cursor.execute(RENAME_LISTING_QUERY, (status, new_title, description, location, listing_id))
+        return True
+    except sqlite3.IntegrityError:
+        logger.warning("⚠️ Another listing already uses the title '%s', keeping the old title for listing %s",
+                       new_title, listing_id)
+        cursor.execute(RENAME_LISTING_QUERY, (status, None, description, location, listing_id))
+        return False
+
+def _listing_params(listing_data):
+    """Column values for UPSERT_LISTING_QUERY, in order."""
+    return (
+        listing_data['title'],
+        listing_data['price'],
+        listing_data['description'],
+        listing_data.get('category', 'Other Garden decor'),
+        listing_data.get('product_tags', ''),
+        listing_data.get('location', ''),
+        '|'.join(listing_data.get('image_paths', [])),
+    )
+
+def _upsert_listing(cursor, listing_data, unique_titles=True):
+    """Insert a listing or update the one with the same title; returns its ID."""
+    params = _listing_params(listing_data)
+    if unique_titles:
+        cursor.execute(UPSERT_LISTING_QUERY, params)
+        return cursor.fetchone()[0]
+
+    # Older databases with duplicate titles can't use ON CONFLICT(title)
+    cursor.execute('SELECT id FROM listings WHERE title = ?', (listing_data['title'],))
+    existing = cursor.fetchone()
+    if existing:
+        cursor.execute('''
+            UPDATE listings
+            SET price = ?,
+                description = ?,
+                category = ?,
+                product_tags = ?,
+                location = ?,
+                image_paths = ?,
+                updated_at = CURRENT_TIMESTAMP,
+                status = 'active'
+            WHERE id = ?
+        ''', params[1:] + (existing[0],))
+        return existing[0]
+    cursor.execute('''
+        INSERT INTO listings (title, price, description, category, product_tags, location, image_paths, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'active')
+    ''', params)
+    return cursor.lastrowid
+
 def save_listing_to_db(db_path, listing_data):
     """
     Save the listing data to the account's SQLite database.
@@ -337,127 +892,96 @@ def save_listing_to_db(db_path, listing_data):
         listing_data (dict): Dictionary containing listing information
     """
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        unique_titles = db_pool.has_unique_titles(db_path)
+        with db_pool.acquire(db_path) as cursor:
+            listing_id = _upsert_listing(cursor, listing_data, unique_titles)
+        logger.info("✅ Saved listing to database (ID: %s)", listing_id)
+        return listing_id
 
-        # Create listings table if it doesn't exist
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS listings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                price TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                product_tags TEXT,
-                location TEXT,
-                image_paths TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'active',
-                facebook_listing_id TEXT,
-                notes TEXT
-            )
-        ''')
+    except Exception as e:
+        logger.error("Error saving to database: %s", e)
 
-        # Check if a listing with this title already exists
-        cursor.execute('SELECT id FROM listings WHERE title = ?', (listing_data['title'],))
-        existing = cursor.fetchone()
+def save_listings_to_db(db_path, listings_data):
+    """
+    Save many listings at once, updating any whose title already exists.
+    Each BULK_INSERT_BATCH_SIZE listings are written with executemany in one transaction.
 
-        if existing:
-            # Update existing listing
-            listing_id = existing[0]
-            cursor.execute('''
-                UPDATE listings
-                SET price = ?,
-                    description = ?,
-                    category = ?,
-                    product_tags = ?,
-                    location = ?,
-                    image_paths = ?,
-                    updated_at = CURRENT_TIMESTAMP,
-                    status = 'active'
-                WHERE id = ?
-            ''', (
-                listing_data['price'],
-                listing_data['description'],
-                listing_data.get('category', 'Other Garden decor'),
-                listing_data.get('product_tags', ''),
-                listing_data.get('location', ''),
-                '|'.join(listing_data.get('image_paths', [])),
-                listing_id
-            ))
-            print(f"✅ Updated existing listing in database (ID: {listing_id})")
-        else:
-            # Insert the new listing
-            cursor.execute('''
-                INSERT INTO listings (title, price, description, category, product_tags, location, image_paths, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                listing_data['title'],
-                listing_data['price'],
-                listing_data['description'],
-                listing_data.get('category', 'Other Garden decor'),
-                listing_data.get('product_tags', ''),
-                listing_data.get('location', ''),
-                '|'.join(listing_data.get('image_paths', [])),
-                'active'
-            ))
-            listing_id = cursor.lastrowid
-            print(f"✅ Created new listing in database (ID: {listing_id})")
-
-        conn.commit()
-        conn.close()
+    Args:
+        db_path (str): Path to the SQLite database file
+        listings_data (list): Dictionaries containing listing information
 
-        return listing_id
+    Returns:
+        int: Number of listings saved
+    """
+    saved = 0
+    try:
+        unique_titles = db_pool.has_unique_titles(db_path)
+        for start in range(0, len(listings_data), BULK_INSERT_BATCH_SIZE):
+            batch = listings_data[start:start + BULK_INSERT_BATCH_SIZE]
+            with db_pool.acquire(db_path) as cursor:
+                if unique_titles:
+                    cursor.executemany(BULK_UPSERT_LISTINGS_QUERY, map(_listing_params, batch))
+                else:
+                    for listing_data in batch:
+                        _upsert_listing(cursor, listing_data, unique_titles)
+            saved += len(batch)
+        logger.info("✅ Saved %s listings to database", saved)
 
     except Exception as e:
-        print(f"Error saving to database: {e}")
+        logger.error("Error saving listings to database: %s", e)
+    return saved
 
 def update_listing_status(db_path, listing_data):
     """
     Update the status of an existing listing instead of creating a new one.
-    
+    If no active listing has the original title, the listing is saved as new.
+
     Args:
         db_path (str): Path to the SQLite database file
         listing_data (dict): Dictionary containing listing information
     """
+    update_listing_statuses(db_path, [listing_data])
+
+def update_listing_statuses(db_path, listings_data):
+    """
+    Apply update_listing_status to several listings in one transaction.
+    A listing that fails is reported and skipped without undoing the others.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+        listings_data (list): Listing dictionaries, as for update_listing_status
+    """
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Find the existing listing by title and update its status
-        cursor.execute('''
-            UPDATE listings 
-            SET status = 'relisted', 
-                updated_at = CURRENT_TIMESTAMP,
-                title = ?,
-                description = ?,
-                location = ?
-            WHERE title = ? AND status = 'active'
-        ''', (
-            listing_data['title'],
-            listing_data['description'],
-            listing_data.get('location', ''),
-            listing_data.get('original_title', listing_data['title'])  # Use original title to find the listing
-        ))
-        
-        rows_affected = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        if rows_affected > 0:
-            print(f"Updated listing status to 'relisted': {listing_data['title']}")
-        else:
-            print(f"No active listing found to update for: {listing_data['title']}")
-            # If no existing listing found, create a new one
-            save_listing_to_db(db_path, listing_data)
-        
+        unique_titles = db_pool.has_unique_titles(db_path)
+        with db_pool.acquire(db_path) as cursor:
+            for listing_data in listings_data:
+                try:
+                    # Find the existing listing by its original title and update its status
+                    cursor.execute(ACTIVE_LISTINGS_BY_TITLE_QUERY,
+                                   (listing_data.get('original_title', listing_data['title']),))
+                    active_ids = [row[0] for row in cursor.fetchall()]
+                    for listing_id in active_ids:
+                        _rename_listing(cursor, listing_id, 'relisted', listing_data['title'],
+                                        listing_data['description'], listing_data.get('location', ''))
+                    if active_ids:
+                        logger.info("Updated listing status to 'relisted': %s", listing_data['title'])
+                    else:
+                        listing_id = _upsert_listing(cursor, listing_data, unique_titles)
+                        logger.info("No active listing found, saved as new listing (ID: %s): %s", listing_id, listing_data['title'])
+                except sqlite3.Error as e:
+                    logger.error("Error updating listing status for %s: %s", listing_data.get('title'), e)
+
+    except Exception as e:
+        logger.error("Error updating listing status: %s", e)
+
+def mark_listings_deleted(db_path, listing_ids):
+    """Mark several listings as deleted in one transaction."""
+    try:
+        with db_pool.acquire(db_path) as cursor:
+            cursor.executemany(MARK_DELETED_QUERY, [(listing_id,) for listing_id in listing_ids])
+        logger.info("   Database updated: %s listing(s) marked as deleted", len(listing_ids))
     except Exception as e:
-        print(f"Error updating listing status: {e}")
-        # Fallback to creating new entry
-        save_listing_to_db(db_path, listing_data)
+        logger.error("Error marking listings as deleted: %s", e)
 
 @app.route('/')
 def index():
@@ -465,34 +989,78 @@ def index():
     accounts = get_accounts()
     return render_template('index.html', accounts=accounts)
 
+_io_queue = queue.SimpleQueue()
+
+def _io_worker():
+    """Run queued file writes one at a time, off the request threads."""
+    while True:
+        write, args = _io_queue.get()
+        try:
+            write(*args)
+        except Exception as e:
+            logger.warning("⚠️ Background write failed: %s", e)
+
+def wait_for_background_writes(timeout=None):
+    """Block until everything queued so far has been written."""
+    done = threading.Event()
+    _io_queue.put((done.set, ()))
+    return done.wait(timeout)
+
+threading.Thread(target=_io_worker, name='listing-io', daemon=True).start()
+atexit.register(wait_for_background_writes, 5)
+
+def _write_listing_txt(data_file_path, listing_data, created):
+    """Write the human-readable listing_data.txt next to a listing's photos."""
+    lines = [
+        "LISTING DATA",
+        "============",
+        "",
+        f"Title: {listing_data['title']}",
+        f"Price: {listing_data['price']}",
+        f"Category: {listing_data['category']}",
+        f"Product Tags: {listing_data['product_tags']}",
+        f"Location: {listing_data['location']}",
+        f"Created: {created.strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "Description:",
+        listing_data['description'],
+        "",
+        f"Images ({len(listing_data['image_paths'])}):",
+    ]
+    lines += [f"  {i}. {os.path.basename(path)}" for i, path in enumerate(listing_data['image_paths'], 1)]
+    with open(data_file_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    logger.info("Saved listing data to: %s", data_file_path)
+
 def _handle_listing_request(action_override=None):
     """Handle listing save/create requests from the UI."""
     try:
         # Get form data
-        account = request.form.get('account')
-        title = request.form.get('title')
-        price = request.form.get('price')
-        description = request.form.get('description')
-        category = request.form.get('category', 'Other Garden decor')
-        product_tags = request.form.get('product_tags', '')
-        location = request.form.get('location', '')
-        speed = request.form.get('speed', '1.0')
-        proxy = request.form.get('proxy', '').strip() or None
-        ai_enabled_raw = request.form.get('ai_enabled', 'true')
-        ai_enabled = str(ai_enabled_raw).strip().lower() in ['true', '1', 'yes', 'on']
+        form = request.form.to_dict()
+        field = form.get
+        account, title, price, description = field('account'), field('title'), field('price'), field('description')
+        category = field('category', 'Other Garden decor')
+        product_tags = field('product_tags', '')
+        location = field('location', '')
+        speed = field('speed', '1.0')
+        proxy = field('proxy', '').strip() or None
+        ai_enabled = field('ai_enabled', 'true').strip().lower() in _TRUTHY
 
         # Debug: Print received form data
-        print("Received form data:")
-        print(f"  Account: {account}")
-        print(f"  Title: {title}")
-        print(f"  Price: {price}")
-        print(f"  Description: {description[:50]}..." if description else "  Description: None")
-        print(f"  Category: {category}")
-        print(f"  Product Tags: {product_tags}")
-        print(f"  Location: {location}")
-        print(f"  Speed: {speed}")
-        print(f"  Proxy: {proxy}")
-        print(f"  AI Enabled: {ai_enabled}")
+        logger.info("Received form data:")
+        logger.info("  Account: %s", account)
+        logger.info("  Title: %s", title)
+        logger.info("  Price: %s", price)
+        if description:
+            logger.info("  Description: %.50s...", description)
+        else:
+            logger.info("  Description: None")
+        logger.info("  Category: %s", category)
+        logger.info("  Product Tags: %s", product_tags)
+        logger.info("  Location: %s", location)
+        logger.info("  Speed: %s", speed)
+        logger.info("  Proxy: %s", proxy)
+        logger.info("  AI Enabled: %s", ai_enabled)
 
         # Validate required fields
         missing_fields = []
@@ -522,13 +1090,13 @@ def _handle_listing_request(action_override=None):
             }), 400
 
         # Create organized listing folder structure
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        import re
-        safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-        safe_title = re.sub(r'[-\s]+', '_', safe_title)[:50]
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        safe_title = _SAFE_TITLE_SEP.sub('_', _SAFE_TITLE_STRIP.sub('', title).strip())[:50]
 
         listing_dir = os.path.join('accounts', account, 'listings', f"{timestamp}_{safe_title}")
         os.makedirs(listing_dir, exist_ok=True)
+        listing_dir_abs = os.path.abspath(listing_dir)
 
         # Save uploaded photos with proper naming
         image_paths = []
@@ -536,34 +1104,14 @@ def _handle_listing_request(action_override=None):
             if file and file.filename:
                 # Get file extension
                 file_ext = os.path.splitext(file.filename)[1].lower()
-                if file_ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+                if file_ext not in IMAGE_EXTENSIONS:
                     continue
 
                 # Save image with organized naming
-                image_filename = f"image_{i+1:02d}{file_ext}"
-                image_path = os.path.join(listing_dir, image_filename)
-                file.save(image_path)
-                image_paths.append(os.path.abspath(image_path))
-                print(f"Saved image: {image_path}")
-
-        # Create listing data text file
-        data_file_path = os.path.join(listing_dir, 'listing_data.txt')
-        with open(data_file_path, 'w', encoding='utf-8') as f:
-            f.write("LISTING DATA\n")
-            f.write("============\n\n")
-            f.write(f"Title: {title}\n")
-            f.write(f"Price: {price}\n")
-            f.write(f"Category: {category}\n")
-            f.write(f"Product Tags: {product_tags}\n")
-            f.write(f"Location: {location}\n")
-            f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("Description:\n")
-            f.write(f"{description}\n\n")
-            f.write(f"Images ({len(image_paths)}):\n")
-            for i, path in enumerate(image_paths, 1):
-                f.write(f"  {i}. {os.path.basename(path)}\n")
-
-        print(f"Saved listing data to: {data_file_path}")
+                image_path = os.path.join(listing_dir_abs, f"image_{i+1:02d}{file_ext}")
+                file.save(image_path, buffer_size=UPLOAD_BUFFER_SIZE)
+                image_paths.append(image_path)
+                logger.info("Saved image: %s", image_path)
 
         # Bundle listing data
         listing_data = {
@@ -581,13 +1129,17 @@ def _handle_listing_request(action_override=None):
             'proxy': proxy
         }
 
+        # Write the listing data text file in the background; nothing reads it back
+        data_file_path = os.path.join(listing_dir, 'listing_data.txt')
+        _io_queue.put((_write_listing_txt, (data_file_path, dict(listing_data), now)))
+
         # Save to database immediately
         db_path = os.path.join('accounts', account, 'listings.db')
         listing_id = save_listing_to_db(db_path, listing_data)
         listing_data['listing_id'] = listing_id
 
         # Check action parameter
-        action = action_override or request.form.get('action', 'start_bot')
+        action = action_override or field('action', 'start_bot')
 
         if action == 'save_only':
             return jsonify({
@@ -595,13 +1147,9 @@ def _handle_listing_request(action_override=None):
                 'message': 'Listing saved successfully! Click "Start Bot & Create" to begin posting to Facebook.'
             })
 
-        # Start bot in a separate thread
-        bot_thread = threading.Thread(
-            target=run_bot_process,
-            args=(account, listing_data)
-        )
-        bot_thread.daemon = True
-        bot_thread.start()
+        # Start bot on the worker pool
+        if _submit_bot_job(account, run_bot_process, listing_data) is None:
+            return _bot_queue_full_response()
 
         return jsonify({
             'success': True,
@@ -660,7 +1208,7 @@ def add_account():
 
         # Parse the cookies JSON string
         try:
-            cookies = json.loads(cookies_json)
+            cookies = _json_loads(cookies_json)
         except json.JSONDecodeError as e:
             return jsonify({
                 'success': False,
@@ -711,6 +1259,16 @@ def add_account_cookies():
             'message': f'Error adding account: {str(e)}'
         }), 500
 
+# Browser-extension sameSite values mapped to what Selenium expects:
+# "Strict", "Lax", or "None" (capitalized)
+_SAME_SITE_VALUES = {
+    'no_restriction': 'None', 'None': 'None', 'none': 'None',
+    'Lax': 'Lax', 'lax': 'Lax',
+    'Strict': 'Strict', 'strict': 'Strict',
+    # Default unspecified to Lax (common for session cookies)
+    'unspecified': 'Lax', 'Unspecified': 'Lax',
+}
+
 def add_account_cookies_logic(account_name, cookies):
     """Shared logic for adding an account with cookies."""
     try:
@@ -767,56 +1325,21 @@ def add_account_cookies_logic(account_name, cookies):
             else:
                 formatted_cookie['secure'] = True
             
-            # Convert sameSite to Selenium-compatible values
-            # Selenium expects: "Strict", "Lax", or "None" (capitalized)
-            if 'sameSite' in cookie:
-                same_site = cookie['sameSite']
-                # Convert common variations to Selenium format
-                if same_site in ['no_restriction', 'None', 'none']:
-                    formatted_cookie['sameSite'] = 'None'
-                elif same_site in ['Lax', 'lax']:
-                    formatted_cookie['sameSite'] = 'Lax'
-                elif same_site in ['Strict', 'strict']:
-                    formatted_cookie['sameSite'] = 'Strict'
-                elif same_site in ['unspecified', 'Unspecified']:
-                    # Default unspecified to Lax (common for session cookies)
-                    formatted_cookie['sameSite'] = 'Lax'
-                else:
-                    # Unknown value, default to None
-                    formatted_cookie['sameSite'] = 'None'
-            else:
-                formatted_cookie['sameSite'] = 'None'
+            # Convert sameSite to Selenium-compatible values; missing or unknown means None
+            formatted_cookie['sameSite'] = _SAME_SITE_VALUES.get(cookie.get('sameSite'), 'None')
             
             formatted_cookies.append(formatted_cookie)
         
-        # Save cookies to file
-        import json
-        with open(cookies_path, 'w', encoding='utf-8') as f:
-            json.dump(formatted_cookies, f, indent=2, ensure_ascii=False)
+        # Save cookies to file; only the bot reads them, so no indenting
+        with open(cookies_path, 'wb') as f:
+            f.write(_json_dumps(formatted_cookies))
         
         # Initialize database for the account
         db_path = os.path.join(account_dir, 'listings.db')
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS listings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                price TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                product_tags TEXT,
-                location TEXT,
-                image_paths TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'active',
-                facebook_listing_id TEXT,
-                notes TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        db_pool.get(db_path)
+        invalidate_listing_page_query(db_path)
+        invalidate_accounts_cache()
+        _account_paths.pop(account_name, None)
         
         return jsonify({
             'success': True,
@@ -829,15 +1352,57 @@ def add_account_cookies_logic(account_name, cookies):
             'message': f'Error in account creation: {str(e)}'
         }), 500
 
+# The content helpers below keep no per-request state, so one instance of each
+# is shared by every request instead of rebuilding their word and location tables.
+# They're imported on first use to keep PIL and friends out of app startup.
+
+@lru_cache(maxsize=1)
+def _content_manager():
+    from original_content_manager import OriginalContentManager
+    return OriginalContentManager()
+
+@lru_cache(maxsize=1)
+def _title_variator():
+    from title_variator import TitleVariator
+    return TitleVariator()
+
+@lru_cache(maxsize=1)
+def _description_variator():
+    from description_variator import DescriptionVariator
+    return DescriptionVariator()
+
+@lru_cache(maxsize=1)
+def _metadata_modifier():
+    from image_metadata import ImageMetadataModifier
+    return ImageMetadataModifier()
+
+@lru_cache(maxsize=1)
+def _location_manager():
+    from location_manager import LocationManager
+    return LocationManager()
+
+@contextmanager
+def _ai_learning_system():
+    """
+    Yield an AILearningSystem for one request and close it afterwards.
+    It isn't shared like the helpers above: the bot updates the same learning
+    data file, and a long-lived copy would save stale data over its changes.
+    The request's learning data changes are saved once, when it ends.
+    """
+    from ai_learning_system import AILearningSystem
+    ai_system = AILearningSystem()
+    try:
+        with ai_system:
+            yield ai_system
+    finally:
+        ai_system.close()
+
 @app.route('/get_updated_content/<account>/<listing_title>')
 def get_updated_content(account, listing_title):
     """Get updated title and description for a listing."""
     try:
-        from original_content_manager import OriginalContentManager
-        content_manager = OriginalContentManager()
-        
         # Get original listing
-        original_listing = content_manager.get_original_listing(account, listing_title)
+        original_listing = _content_manager().get_original_listing(account, listing_title)
         
         if not original_listing:
             return jsonify({
@@ -845,16 +1410,9 @@ def get_updated_content(account, listing_title):
                 'message': 'Original listing not found'
             })
         
-        # Generate new variations
-        from title_variator import TitleVariator
-        from description_variator import DescriptionVariator
-        
-        title_variator = TitleVariator()
-        description_variator = DescriptionVariator()
-        
         # Generate title variation
-        title_result = title_variator.get_next_title_variation(account, original_listing['title'])
-        description_result = description_variator.get_next_description_variation(account, original_listing['description'])
+        title_result = _title_variator().get_next_title_variation(account, original_listing['title'])
+        description_result = _description_variator().get_next_description_variation(account, original_listing['description'])
         
         return jsonify({
             'success': True,
@@ -880,9 +1438,9 @@ def randomize_locations():
         account = data.get('account')
         listing_ids = data.get('listing_ids', [])
         
-        print(f"DEBUG: Received randomize_locations request")
-        print(f"  Account: {account}")
-        print(f"  Listing IDs: {listing_ids}")
+        logger.debug("Received randomize_locations request")
+        logger.debug("  Account: %s", account)
+        logger.debug("  Listing IDs: %s", listing_ids)
         
         if not account or not listing_ids:
             return jsonify({
@@ -891,40 +1449,30 @@ def randomize_locations():
             })
         
         # Get listings from the regular database (not original_content_manager)
-        db_path = os.path.join('accounts', account, 'listings.db')
-        if not os.path.exists(db_path):
+        db_path = _account_db(account)
+        if not db_path:
             return jsonify({
                 'success': False,
                 'message': f'No database found for account: {account}'
             })
         
-        # Connect to database and get listings
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get all listings
-        cursor.execute('SELECT id, title, price, description, category, location, status FROM listings WHERE status = "active"')
-        all_listings = cursor.fetchall()
-        conn.close()
-        
-        print(f"DEBUG: Found {len(all_listings)} listings in database")
-        
-        # Filter selected listings by ID
-        selected_listings = []
-        for listing in all_listings:
-            listing_id, title, price, description, category, location, status = listing
-            if str(listing_id) in [str(id) for id in listing_ids]:
-                selected_listings.append({
-                    'id': listing_id,
-                    'title': title,
-                    'price': price,
-                    'description': description,
-                    'category': category,
-                    'location': location,
-                    'status': status
-                })
-        
-        print(f"DEBUG: Found {len(selected_listings)} selected listings")
+        # Let the primary key find the selected active listings
+        with read_pool.borrow(db_path) as conn:
+            rows = select_listings_by_ids(
+                conn, 'id, title, price, description, category, location, status',
+                listing_ids, "status = 'active'"
+            )
+        selected_listings = [{
+            'id': listing_id,
+            'title': title,
+            'price': price,
+            'description': description,
+            'category': category,
+            'location': location,
+            'status': status
+        } for listing_id, title, price, description, category, location, status in rows]
+        
+        logger.debug("Found %s selected listings", len(selected_listings))
         
         if not selected_listings:
             return jsonify({
@@ -932,49 +1480,25 @@ def randomize_locations():
                 'message': 'No selected listings found in database'
             })
         
-        # Generate random locations for each listing (ensuring no duplicates)
-        from image_metadata import ImageMetadataModifier
-        metadata_modifier = ImageMetadataModifier()
-
-        randomized_locations = []
-        used_locations = set()  # Track used location names to avoid duplicates
-
-        for listing in selected_listings:
-            # Generate a random UK location, retry if duplicate
-            max_attempts = 50  # Prevent infinite loop
-            attempts = 0
-            random_location = None
-
-            while attempts < max_attempts:
-                temp_location = metadata_modifier.generate_random_uk_location()
-                if temp_location['name'] not in used_locations:
-                    random_location = temp_location
-                    used_locations.add(random_location['name'])
-                    break
-                attempts += 1
-
-            # If we couldn't find a unique location after max attempts, use the last one anyway
-            if random_location is None:
-                random_location = metadata_modifier.generate_random_uk_location()
-
-            randomized_locations.append({
-                'listing_id': listing['id'],
-                'title': listing['title'],
-                'new_location': random_location['name'],
-                'coordinates': f"{random_location['lat']:.4f}, {random_location['lon']:.4f}"
-            })
+        # Generate random locations for each listing in one draw, so names
+        # only repeat once every known location has been used
+        random_locations = _metadata_modifier().sample_random_uk_locations(len(selected_listings))
+        randomized_locations = [{
+            'listing_id': listing['id'],
+            'title': listing['title'],
+            'new_location': random_location['name'],
+            'coordinates': f"{random_location['lat']:.4f}, {random_location['lon']:.4f}"
+        } for listing, random_location in zip(selected_listings, random_locations)]
         
-        print(f"DEBUG: Generated {len(randomized_locations)} random locations")
+        logger.debug("Generated %s random locations", len(randomized_locations))
         
         # Store the randomized locations for the bot to use
-        from location_manager import LocationManager
-        location_manager = LocationManager()
-        storage_result = location_manager.store_randomized_locations(account, randomized_locations)
+        storage_result = _location_manager().store_randomized_locations(account, randomized_locations)
         
         if storage_result['success']:
-            print(f"✅ Stored randomized locations: {storage_result['message']}")
+            logger.info("✅ Stored randomized locations: %s", storage_result['message'])
         else:
-            print(f"⚠️ Failed to store locations: {storage_result['error']}")
+            logger.warning("⚠️ Failed to store locations: %s", storage_result['error'])
         
         return jsonify({
             'success': True,
@@ -983,88 +1507,107 @@ def randomize_locations():
         })
         
     except Exception as e:
-        print(f"DEBUG: Error in randomize_locations: {e}")
+        logger.error("Error in randomize_locations: %s", e)
         return jsonify({
             'success': False,
             'message': f'Error randomizing locations: {str(e)}'
         })
 
+# Listing page columns and the SQL that fills in their defaults; older
+# databases may lack some columns, so each has a fallback for that case too
+LISTING_PAGE_COLUMNS = ('id', 'title', 'price', 'description', 'image_paths', 'created_at', 'status')
+LISTING_PAGE_DEFAULTS = {
+    # Keep image_paths as a string with | separator for the frontend to split
+    'image_paths': "COALESCE(image_paths, '')",
+    'category': "COALESCE(NULLIF(category, ''), 'Other Garden decor')",
+    'product_tags': "COALESCE(product_tags, '')",
+    'location': "COALESCE(location, '')",
+    'notes': "COALESCE(notes, '')",
+}
+LISTING_PAGE_MISSING = {
+    'category': "'Other Garden decor'",
+    'product_tags': "''",
+    'location': "''",
+    'notes': "''",
+}
+
+
+def _listing_page_query(table_columns):
+    """
+    Build the listings page query for a table with the given columns.
+    Returns the SQL and the names of the columns it selects, in order.
+    """
+    names = [col for col in LISTING_PAGE_COLUMNS if col in table_columns]
+    names += LISTING_PAGE_MISSING
+    expressions = []
+    for col in names:
+        if col not in table_columns:
+            expressions.append(f"{LISTING_PAGE_MISSING[col]} AS {col}")
+        elif col in LISTING_PAGE_DEFAULTS:
+            expressions.append(f"{LISTING_PAGE_DEFAULTS[col]} AS {col}")
+        else:
+            expressions.append(col)
+    query = f'''
+        SELECT {', '.join(expressions)}
+        FROM listings
+        WHERE {LIVE_LISTING_FILTER}
+        ORDER BY created_at DESC
+    '''
+    return query, names
+
+
+# Absolute database path -> (query, column names) for the listings page.
+# The listings table's columns don't change while the app runs, so
+# table_info only needs reading the first time each database is shown.
+_listing_page_queries = {}
+
+
+def _resolve_listing_page_query(db_path, conn):
+    """Return the cached listings page query for a database, building it on first use."""
+    key = os.path.abspath(db_path)
+    cached = _listing_page_queries.get(key)
+    if cached is None:
+        columns = {column[1] for column in conn.execute("PRAGMA table_info(listings)")}
+        cached = _listing_page_query(columns)
+        # Don't remember a database whose listings table doesn't exist yet
+        if columns:
+            cached = _listing_page_queries.setdefault(key, cached)
+    return cached
+
+
+def invalidate_listing_page_query(db_path):
+    """Forget the cached listings page query after a database's schema changes."""
+    _listing_page_queries.pop(os.path.abspath(db_path), None)
+
+
+def _json_response(obj):
+    """JSON response for larger payloads, encoded with orjson when installed."""
+    return Response(_json_dumps(obj), mimetype='application/json')
+
+
 @app.route('/account/<account_name>/listings')
 def get_listings(account_name):
     """Get listings for a specific account."""
     try:
-        print(f"📋 Getting listings for account: {account_name}")
-        db_path = os.path.join('accounts', account_name, 'listings.db')
-        print(f"📁 Database path: {db_path}")
-        if not os.path.exists(db_path):
-            print(f"❌ Database not found at: {db_path}")
+        logger.info("📋 Getting listings for account: %s", account_name)
+        db_path = _account_db(account_name)
+        logger.info("📁 Database path: %s", db_path)
+        if not db_path:
+            logger.error("❌ Database not found for account: %s", account_name)
             return jsonify({'listings': []})
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # First, check what columns actually exist in the database
-        cursor.execute("PRAGMA table_info(listings)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        # Build the SELECT query based on available columns
-        base_columns = ['id', 'title', 'price', 'description', 'image_paths', 'created_at', 'status']
-        select_columns = []
+        with read_pool.borrow(db_path) as conn:
+            # The query depends on which columns this database has
+            query, names = _resolve_listing_page_query(db_path, conn)
+            rows = conn.execute(query).fetchall()
         
-        for col in base_columns:
-            if col in columns:
-                select_columns.append(col)
-        
-        # Add optional columns if they exist
-        optional_columns = ['category', 'product_tags', 'location', 'notes']
-        for col in optional_columns:
-            if col in columns:
-                select_columns.append(col)
-        
-        # Execute query with available columns
-        query = f'''
-            SELECT {', '.join(select_columns)}
-            FROM listings
-            WHERE status != 'deleted' OR status IS NULL
-            ORDER BY created_at DESC
-        '''
-        
-        cursor.execute(query)
-        listings = []
-        
-        for row in cursor.fetchall():
-            listing = {}
-            
-            # Map the row data to the listing dict
-            for i, col in enumerate(select_columns):
-                if col == 'image_paths':
-                    # Keep as string with | separator for frontend to split
-                    listing[col] = row[i] if row[i] else ''
-                elif col == 'category':
-                    listing[col] = row[i] if row[i] else 'Other Garden decor'  # Default category
-                elif col in ['product_tags', 'location', 'notes']:
-                    listing[col] = row[i] if row[i] else ''
-                else:
-                    listing[col] = row[i]
-            
-            # Ensure all expected fields exist with defaults
-            if 'category' not in listing:
-                listing['category'] = 'Other Garden decor'
-            if 'product_tags' not in listing:
-                listing['product_tags'] = ''
-            if 'location' not in listing:
-                listing['location'] = ''
-            if 'notes' not in listing:
-                listing['notes'] = ''
-            
-            listings.append(listing)
+        listings = [dict(zip(names, row)) for row in rows]
 
-        conn.close()
-        print(f"✅ Returning {len(listings)} listings for {account_name}")
-        return jsonify({'listings': listings})
+        logger.info("✅ Returning %s listings for %s", len(listings), account_name)
+        return _json_response({'listings': listings})
 
     except Exception as e:
-        print(f"❌ Error getting listings: {str(e)}")
+        logger.error("❌ Error getting listings: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/relist_listings', methods=['POST'])
@@ -1078,54 +1621,24 @@ def relist_listings():
         if not account_name or not listing_ids:
             return jsonify({'success': False, 'message': 'Account and listing IDs are required'}), 400
         
-        db_path = os.path.join('accounts', account_name, 'listings.db')
-        if not os.path.exists(db_path):
+        db_path = _account_db(account_name)
+        if not db_path:
             return jsonify({'error': 'Database not found'}), 404
         
         # Get listings to relist
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        placeholders = ','.join(['?' for _ in listing_ids])
-        cursor.execute(f'''
-            SELECT id, title, price, description, category, product_tags, location, image_paths
-            FROM listings 
-            WHERE id IN ({placeholders}) AND (status = 'active' OR status = 'relisted' OR status IS NULL)
-        ''', listing_ids)
-        
-        listings_to_relist = cursor.fetchall()
-        conn.close()
+        with read_pool.borrow(db_path) as conn:
+            listings_to_relist = select_listings_by_ids(
+                conn, 'id, title, price, description, category, product_tags, location, image_paths',
+                listing_ids, ACTIONABLE_LISTING_FILTER
+            )
         
         if not listings_to_relist:
             return jsonify({'success': False, 'message': 'No active listings found to relist'}), 400
         
-        # Prepare all listings data
-        all_listings_data = []
-        for listing in listings_to_relist:
-            # listing[1] is the CURRENT title in database (which is what's on Facebook)
-            # We use this as original_title so the bot can find and delete the existing listing
-            listing_data = {
-                'title': listing[1],  # Keep same title (or this could be varied)
-                'price': listing[2],
-                'description': listing[3],  # Keep same description (or this could be varied)
-                'category': listing[4] or 'Other Garden decor',
-                'product_tags': listing[5] or '',
-                'location': listing[6] or '',
-                'image_paths': listing[7].split('|') if listing[7] else [],
-                'speed': '1.0',
-                'account': account_name,
-                'listing_id': listing[0],  # Include the database ID
-                'original_title': listing[1]  # Use current title to find the listing on Facebook
-            }
-            all_listings_data.append(listing_data)
-        
         # Process all listings in a single bot session to avoid multiple windows
-        bot_thread = threading.Thread(
-            target=run_multiple_bot_process,
-            args=(account_name, all_listings_data)
-        )
-        bot_thread.daemon = True
-        bot_thread.start()
+        # The worker turns the rows into listing data, so the request returns straight away
+        if _submit_bot_job(account_name, run_relist_rows_process, listings_to_relist) is None:
+            return _bot_queue_full_response()
         
         return jsonify({
             'success': True, 
@@ -1146,43 +1659,20 @@ def delete_listings():
         if not account_name or not listing_ids:
             return jsonify({'success': False, 'message': 'Account and listing IDs are required'}), 400
 
-        db_path = os.path.join('accounts', account_name, 'listings.db')
-        if not os.path.exists(db_path):
+        db_path = _account_db(account_name)
+        if not db_path:
             return jsonify({'error': 'Database not found'}), 404
 
         # Get listings to delete
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        placeholders = ','.join(['?' for _ in listing_ids])
-        cursor.execute(f'''
-            SELECT id, title
-            FROM listings
-            WHERE id IN ({placeholders}) AND (status = 'active' OR status = 'relisted' OR status IS NULL)
-        ''', listing_ids)
-
-        listings_to_delete = cursor.fetchall()
-        conn.close()
+        with read_pool.borrow(db_path) as conn:
+            listings_to_delete = select_listings_by_ids(conn, 'id, title', listing_ids, ACTIONABLE_LISTING_FILTER)
 
         if not listings_to_delete:
             return jsonify({'success': False, 'message': 'No active listings found to delete'}), 400
 
-        # Prepare listings data for deletion
-        all_listings_data = []
-        for listing in listings_to_delete:
-            listing_data = {
-                'listing_id': listing[0],
-                'title': listing[1]
-            }
-            all_listings_data.append(listing_data)
-
         # Process all deletions in a single bot session
-        bot_thread = threading.Thread(
-            target=run_delete_only_process,
-            args=(account_name, all_listings_data)
-        )
-        bot_thread.daemon = True
-        bot_thread.start()
+        if _submit_bot_job(account_name, run_delete_rows_process, listings_to_delete) is None:
+            return _bot_queue_full_response()
 
         return jsonify({
             'success': True,
@@ -1202,23 +1692,19 @@ def check_title_exists(account_name):
         if not title:
             return jsonify({'exists': False, 'message': ''})
         
-        db_path = os.path.join('accounts', account_name, 'listings.db')
+        db_path = _account_db(account_name)
         
-        if not os.path.exists(db_path):
+        if not db_path:
             return jsonify({'exists': False, 'message': ''})
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check for exact title match (case-insensitive)
-        cursor.execute('''
-            SELECT id, title, status, created_at
-            FROM listings 
-            WHERE LOWER(title) = LOWER(?) AND (status != 'deleted' OR status IS NULL)
-        ''', (title,))
-        
-        existing_listing = cursor.fetchone()
-        conn.close()
+        with read_pool.borrow(db_path) as conn:
+            # Check for exact title match (case-insensitive)
+            existing_listing = conn.execute(f'''
+                SELECT id, title, status, created_at
+                FROM listings 
+                WHERE LOWER(title) = LOWER(?) AND ({LIVE_LISTING_FILTER})
+                LIMIT 1
+            ''', (title,)).fetchone()
         
         if existing_listing:
             listing_id, existing_title, status, created_at = existing_listing
@@ -1236,27 +1722,22 @@ def check_title_exists(account_name):
 def delete_listing(account_name, listing_id):
     """Delete a listing from the database."""
     try:
-        db_path = os.path.join('accounts', account_name, 'listings.db')
+        db_path = _account_db(account_name)
         
-        if not os.path.exists(db_path):
+        if not db_path:
             return jsonify({'success': False, 'message': 'Account database not found'}), 404
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Actually delete the listing from the database
-        cursor.execute('''
-            DELETE FROM listings 
-            WHERE id = ?
-        ''', (listing_id,))
+        with db_pool.acquire(db_path) as cursor:
+            # Actually delete the listing from the database
+            cursor.execute('''
+                DELETE FROM listings 
+                WHERE id = ?
+            ''', (listing_id,))
+            deleted = cursor.rowcount
         
-        if cursor.rowcount == 0:
-            conn.close()
+        if deleted == 0:
             return jsonify({'success': False, 'message': 'Listing not found'}), 404
         
-        conn.commit()
-        conn.close()
-        
         return jsonify({'success': True, 'message': 'Listing deleted successfully'})
         
     except Exception as e:
@@ -1269,52 +1750,37 @@ def update_categories(account_name):
         data = request.get_json()
         default_category = data.get('default_category', 'Other Garden decor')
         
-        db_path = os.path.join('accounts', account_name, 'listings.db')
+        db_path = _account_db(account_name)
         
-        if not os.path.exists(db_path):
+        if not db_path:
             return jsonify({'success': False, 'message': 'Account database not found'}), 404
         
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Count listings without categories
-        cursor.execute('''
-            SELECT COUNT(*) FROM listings 
-            WHERE category IS NULL OR category = ''
-        ''')
-        count_before = cursor.fetchone()[0]
-        
-        if count_before == 0:
-            conn.close()
+        # Update and count in one transaction so the stats match the update
+        with db_pool.acquire(db_path) as cursor:
+            # Update listings without categories
+            cursor.execute('''
+                UPDATE listings 
+                SET category = ? 
+                WHERE category IS NULL OR category = ''
+            ''', (default_category,))
+            updated = cursor.rowcount
+            
+            if updated:
+                # Get category distribution
+                cursor.execute('''
+                    SELECT COALESCE(NULLIF(category, ''), 'Uncategorized'), COUNT(*) 
+                    FROM listings 
+                    GROUP BY 1
+                ''')
+                category_stats = dict(cursor.fetchall())
+        
+        if updated == 0:
             return jsonify({
                 'success': True, 
                 'message': 'All listings already have categories assigned!',
                 'updated': 0
             })
         
-        # Update listings without categories
-        cursor.execute('''
-            UPDATE listings 
-            SET category = ? 
-            WHERE category IS NULL OR category = ''
-        ''', (default_category,))
-        
-        conn.commit()
-        updated = cursor.rowcount
-        
-        # Get category distribution
-        cursor.execute('''
-            SELECT category, COUNT(*) 
-            FROM listings 
-            GROUP BY category
-        ''')
-        
-        category_stats = {}
-        for row in cursor.fetchall():
-            category_stats[row[0] or 'Uncategorized'] = row[1]
-        
-        conn.close()
-        
         return jsonify({
             'success': True,
             'message': f'Successfully updated {updated} listing(s) to category: {default_category}',
@@ -1329,10 +1795,8 @@ def update_categories(account_name):
 def ai_analyze_account(account_name):
     """Analyze account listings using AI learning system."""
     try:
-        from ai_learning_system import AILearningSystem
-        
-        ai_system = AILearningSystem()
-        result = ai_system.analyze_account_listings(account_name)
+        with _ai_learning_system() as ai_system:
+            result = ai_system.analyze_account_listings(account_name)
         
         if result['success']:
             return jsonify({
@@ -1353,10 +1817,8 @@ def ai_analyze_account(account_name):
 def get_ai_insights(account_name):
     """Get AI learning insights for an account."""
     try:
-        from ai_learning_system import AILearningSystem
-        
-        ai_system = AILearningSystem()
-        insights = ai_system.get_learning_insights(account_name)
+        with _ai_learning_system() as ai_system:
+            insights = ai_system.get_learning_insights(account_name)
         
         return jsonify({
             'success': True,
@@ -1370,10 +1832,8 @@ def get_ai_insights(account_name):
 def get_global_ai_insights():
     """Get global AI learning insights."""
     try:
-        from ai_learning_system import AILearningSystem
-        
-        ai_system = AILearningSystem()
-        insights = ai_system.get_learning_insights()
+        with _ai_learning_system() as ai_system:
+            insights = ai_system.get_learning_insights()
         
         return jsonify({
             'success': True,
@@ -1390,19 +1850,16 @@ def serve_listing_image(image_path):
         # Normalize the path - convert all slashes to forward slashes
         normalized_path = image_path.replace('\\', '/')
         
-        # Construct the full path to the image
-        full_path = os.path.join('accounts', normalized_path)
-        
-        # Security check - ensure the path is within accounts directory
-        if not os.path.exists(full_path) or not full_path.replace('\\', '/').startswith('accounts/'):
-            return "Image not found", 404
-        
         # Check if it's an image file
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
-        if not any(full_path.lower().endswith(ext) for ext in allowed_extensions):
+        if os.path.splitext(normalized_path)[1].lower() not in IMAGE_EXTENSIONS:
             return "Invalid file type", 400
         
-        return send_file(full_path)
+        # Refuses paths outside the accounts directory and answers repeat views with 304
+        return _send_app_file('accounts', normalized_path)
+    except NotFound:
+        return "Image not found", 404
+    except HTTPException as e:
+        return e
     except Exception as e:
         return f"Error serving image: {str(e)}", 500
 
@@ -1609,6 +2066,8 @@ if __name__ == '__main__':
         account_dir = os.path.join('accounts', account)
         db_path = os.path.join(account_dir, 'listings.db')
         try:
+            # Opening the pooled connection adds any indexes older databases lack
+            db_pool.get(db_path)
             init_enhanced_tables(db_path)
             print(f"✅ Enhanced tables initialized for account: {account}")
         except Exception as e:
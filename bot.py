@@ -19,6 +19,7 @@ import os
 import pickle
 import traceback
 from datetime import datetime
+from typing import NamedTuple
 from image_metadata import ImageMetadataModifier
 from image_cropper import ImageCropper
 from title_variator import TitleVariator
@@ -28,6 +29,16 @@ from original_content_manager import OriginalContentManager
 from ai_learning_system_simple import AILearningSystem
 
 
+class DeleteResult(NamedTuple):
+    """Outcome of MarketplaceBot.delete_listing_if_exists."""
+    success: bool
+    found: bool
+
+    def __bool__(self):
+        # Callers that only test the result keep treating it as "was deleted"
+        return self.success
+
+
 class MarketplaceBot:
     def __init__(self, cookies_path, delay_factor=1.0, proxy=None):
         """
@@ -885,12 +896,17 @@ class MarketplaceBot:
             print(f"⚠️ Error during cleanup: {e}")
 
     def delete_listing_if_exists(self, title, _retry=False):
-        """Search for a listing by title, and if found, delete it."""
+        """
+        Search for a listing by title, and if found, delete it.
+
+        Returns:
+            DeleteResult: success and whether a matching listing was found;
+            truthy only when the listing was deleted
+        """
+        found = False
         try:
             print(f"🔍 Searching for listing with title: '{title}'")
             title_lower = title.lower()
-            self.last_delete_found = False
-            self.last_delete_success = False
 
             # Check if we're already on the selling page
             current_url = self.driver.current_url
@@ -1023,7 +1039,6 @@ class MarketplaceBot:
                                 if title_lower in listing_text or any(word in listing_text for word in title_lower.split() if len(word) > 3):
                                     listing_element = listing
                                     listing_found = True
-                                    self.last_delete_found = True
                                     print(f"✅ Found listing matching title using selector: {selector}")
                                     break
                             except:
@@ -1039,8 +1054,8 @@ class MarketplaceBot:
 
             if not listing_found:
                 print(f"ℹ️ No listing found matching search. Skipping deletion.")
-                return False
-            self.last_delete_found = True
+                return DeleteResult(False, found)
+            found = True
             
             # Click on the listing with retry and improved click strategies
             from selenium.webdriver.common.action_chains import ActionChains
@@ -1141,7 +1156,7 @@ class MarketplaceBot:
                         self._sleep(0.8, 1.2)
                     else:
                         print("⚠️ Could not click on listing, skipping deletion")
-                        return False
+                        return DeleteResult(False, found)
             
             # Step 2: Click "More options" button (three dots)
             print("🔍 Looking for 'More options' button...")
@@ -1176,7 +1191,7 @@ class MarketplaceBot:
 
             if not more_options_clicked:
                 print("❌ Could not find 'More options' button")
-                return False
+                return DeleteResult(False, found)
 
             self._sleep(0.4, 0.6)
 
@@ -1252,7 +1267,7 @@ class MarketplaceBot:
             if not delete_clicked:
                 print("❌ Could not find delete button with any selector")
                 print("💡 Tip: The listing detail page may have opened. Check if delete button is visible.")
-                return False
+                return DeleteResult(False, found)
 
             print("✅ Successfully clicked 'Delete listing'")
 
@@ -1308,11 +1323,11 @@ class MarketplaceBot:
                 
                 if not confirm_delete_button:
                     print("⚠️ Could not find confirm delete button")
-                    return False
+                    return DeleteResult(False, found)
 
             except Exception as e:
                 print(f"⚠️ Could not find confirm delete button: {e}")
-                return False
+                return DeleteResult(False, found)
             
             # Try to click the confirm delete button with retry and improved strategies
             for attempt in range(3):
@@ -1400,7 +1415,7 @@ class MarketplaceBot:
                         self._sleep(2, 3)
                     else:
                         print("⚠️ All confirm delete button attempts failed")
-                        return False
+                        return DeleteResult(False, found)
             
             self._sleep(0.8, 1.2)
             # Try to confirm deletion by checking for toast or missing listing
@@ -1415,8 +1430,6 @@ class MarketplaceBot:
 
             # SKIP verification to avoid searching again - trust the delete worked
             print("ℹ️ Skipping verification (going straight to create to avoid re-searching)")
-            self.last_delete_success = True
-
             # Navigate to create listing page after successful deletion
             print("🚀 Navigating to create listing page...")
             self.driver.get("https://www.facebook.com/marketplace/create/")
@@ -1430,11 +1443,11 @@ class MarketplaceBot:
                 self._sleep(3, 5)
             
             print("✅ Ready to create new listing")
-            return True
+            return DeleteResult(True, True)
 
         except Exception as e:
             print(f"⚠️ Error during listing deletion: {e}")
-            return False
+            return DeleteResult(False, found)
         finally:
             # Always restore overlapping elements
             self._restore_overlapping_elements()
@@ -2129,7 +2142,7 @@ class MarketplaceBot:
                     try:
                         from account_writing_styles import AccountWritingStyles
                         account_name = self.cookies_path.split(os.sep)[-2] if os.sep in self.cookies_path else 'default'
-                        style_manager = AccountWritingStyles(account_name)
+                        style_manager = AccountWritingStyles.get(account_name)
 
                         styled_description = style_manager.format_description(base_description, product_type)
                         listing_data['description'] = styled_description
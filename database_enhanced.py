@@ -15,10 +15,16 @@ def init_enhanced_tables(db_path):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    # Create everything in one transaction so it's committed once
+    cursor.execute('BEGIN IMMEDIATE')
+
+    # Log tables are append-only, so plain rowid keys are enough: AUTOINCREMENT
+    # would only add a sqlite_sequence update to every insert.
+
     # Activity Log Table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS activity_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             action_type TEXT NOT NULL,
             listing_id INTEGER,
@@ -50,7 +56,7 @@ def init_enhanced_tables(db_path):
     # Analytics Table - tracks listing performance over time
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS listing_analytics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             listing_id INTEGER,
             listing_title TEXT,
             action TEXT,
@@ -62,7 +68,7 @@ def init_enhanced_tables(db_path):
         )
     ''')
 
-    # Account Stats Table
+    # Account Stats Table - one small row per account, stored in the key's own B-tree
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS account_stats (
             account_name TEXT PRIMARY KEY,
@@ -72,7 +78,7 @@ def init_enhanced_tables(db_path):
             total_deletions INTEGER DEFAULT 0,
             last_activity TIMESTAMP,
             status TEXT DEFAULT 'active'
-        )
+        ) WITHOUT ROWID
     ''')
 
     # Create indexes
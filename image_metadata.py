@@ -88,8 +88,22 @@ class ImageMetadataModifier:
     
     def generate_random_uk_location(self):
         """Generate a random UK location with slight coordinate variation."""
-        base_location = random.choice(self.uk_locations)
-        
+        return self._vary_location(random.choice(self.uk_locations))
+    
+    def sample_random_uk_locations(self, count):
+        """
+        Generate `count` random UK locations with distinct names where possible.
+        Up to the number of known locations no name repeats; beyond that the
+        extra locations are drawn with repeats.
+        """
+        pool_size = len(self.uk_locations)
+        bases = random.sample(self.uk_locations, min(count, pool_size))
+        if count > pool_size:
+            bases += random.choices(self.uk_locations, k=count - pool_size)
+        return [self._vary_location(base) for base in bases]
+    
+    def _vary_location(self, base_location):
+        """Copy a base location, moving its coordinates slightly."""
         # Add small random variation to coordinates (±0.1 degrees ≈ ±11km)
         lat_variation = random.uniform(-0.1, 0.1)
         lon_variation = random.uniform(-0.1, 0.1)
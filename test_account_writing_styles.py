@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for account-specific writing styles.
+"""
+
+from account_writing_styles import AccountWritingStyles
+
+
+def test_style_manager_is_cached_per_account():
+    """The same account should always resolve to one shared style manager."""
+    print("🧪 Testing style manager caching...")
+
+    first = AccountWritingStyles.get('cache_test_account')
+    second = AccountWritingStyles.get('cache_test_account')
+
+    assert first is second
+    assert first.style == AccountWritingStyles('cache_test_account').style
+    print(f"✅ Cached style: {first.style}")
+
+
+def test_every_style_renders_base_description():
+    """Each template of each style must include the base description."""
+    print("🧪 Testing description templates...")
+
+    base_desc = "Premium quality artificial grass\nLow maintenance"
+    for style in AccountWritingStyles._STYLES:
+        templates = AccountWritingStyles._prebuilt_templates(style, 'carpet')
+        assert len(templates) == len(AccountWritingStyles._TEMPLATES[style])
+        for head, tail in templates:
+            rendered = head + base_desc + tail
+            assert base_desc in rendered
+            assert '{' not in head + tail
+        print(f"✅ {style}: {len(templates)} templates OK")
+
+
+def test_title_prefix_and_suffix_follow_style():
+    """Title helpers should only return values defined for the account's style."""
+    print("🧪 Testing title prefixes and suffixes...")
+
+    manager = AccountWritingStyles('john')
+    for _ in range(10):
+        assert manager.get_title_prefix('carpet') in AccountWritingStyles._TITLE_PREFIXES[manager.style]
+        assert manager.get_title_suffix('carpet') in AccountWritingStyles._TITLE_SUFFIXES[manager.style]
+    print(f"✅ Title helpers match '{manager.style}' style")
+
+
+def main():
+    """Run all writing style tests."""
+    test_style_manager_is_cached_per_account()
+    test_every_style_renders_base_description()
+    test_title_prefix_and_suffix_follow_style()
+    print("\n🎉 All writing style tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI image analyzer feature extraction.
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+import ai_image_analyzer
+from ai_image_analyzer import AIImageAnalyzer
+
+
+def _reference_lbp(image):
+    """Original per-pixel LBP implementation, used as the reference result."""
+    lbp = np.zeros_like(image)
+    for i in range(1, image.shape[0] - 1):
+        for j in range(1, image.shape[1] - 1):
+            center = image[i, j]
+            neighbors = [
+                image[i-1, j-1], image[i-1, j], image[i-1, j+1],
+                image[i, j+1], image[i+1, j+1], image[i+1, j],
+                image[i+1, j-1], image[i, j-1]
+            ]
+            binary = ''.join('1' if neighbor >= center else '0' for neighbor in neighbors)
+            lbp[i, j] = int(binary, 2)
+    return lbp
+
+
+def test_lbp_matches_reference():
+    """Vectorized LBP must produce the same codes as the per-pixel version."""
+    print("🧪 Testing LBP calculation...")
+
+    analyzer = AIImageAnalyzer()
+    rng = np.random.default_rng(42)
+    image = rng.integers(0, 256, size=(64, 48), dtype=np.uint8)
+
+    result = analyzer._calculate_lbp(image)
+
+    assert result.shape == image.shape
+    assert result.dtype == image.dtype
+    assert np.array_equal(result, _reference_lbp(image))
+    print("✅ LBP matches reference implementation")
+
+
+def test_lbp_numpy_fallback_matches_reference():
+    """The NumPy path used when Numba is missing must agree with the reference."""
+    print("🧪 Testing LBP NumPy fallback...")
+
+    analyzer = AIImageAnalyzer()
+    rng = np.random.default_rng(7)
+    image = rng.integers(0, 256, size=(32, 40), dtype=np.uint8)
+
+    numba_available = ai_image_analyzer.NUMBA_AVAILABLE
+    ai_image_analyzer.NUMBA_AVAILABLE = False
+    try:
+        result = analyzer._calculate_lbp(image)
+    finally:
+        ai_image_analyzer.NUMBA_AVAILABLE = numba_available
+
+    assert np.array_equal(result, _reference_lbp(image))
+    print("✅ LBP fallback matches reference implementation")
+
+
+def test_hsv_to_color_name_bands():
+    """Hue lookup table should reproduce the documented color bands."""
+    print("🧪 Testing HSV color naming...")
+
+    analyzer = AIImageAnalyzer()
+    assert analyzer._hsv_to_color_name(60, 200, 20) == 'black'
+    assert analyzer._hsv_to_color_name(60, 10, 200) == 'grey'
+    assert analyzer._hsv_to_color_name(5, 200, 200) == 'red'
+    assert analyzer._hsv_to_color_name(20.5, 200, 200) == 'orange'
+    assert analyzer._hsv_to_color_name(60, 200, 200) == 'yellow'
+    assert analyzer._hsv_to_color_name(120, 200, 200) == 'green'
+    assert analyzer._hsv_to_color_name(179.6, 200, 200) == 'red'
+    print("✅ Color bands OK")
+
+
+def _reference_textures():
+    """Synthetic 400x400 grass, carpet and wood images with a known texture class."""
+    rng = np.random.default_rng(42)
+    grass = np.full((400, 400, 3), (40, 140, 50), dtype=np.int16)
+    grass += rng.integers(-40, 40, (400, 400, 1), dtype=np.int16)  # fine blade noise
+
+    carpet = np.zeros((400, 400, 3), dtype=np.int16)
+    carpet[rng.random((400, 400)) < 0.02] = 200  # sparse pile highlights on dark backing
+
+    rows = np.arange(400)[:, None]
+    wood = np.full((400, 400, 3), (40, 80, 130), dtype=np.int16)
+    wood += (np.sin(rows / 9.0) * 25).astype(np.int16)[..., None]  # smooth grain bands
+
+    return {name: np.clip(image, 0, 255).astype(np.uint8)
+            for name, image in (('grass', grass), ('carpet', carpet), ('wood', wood))}
+
+
+def test_texture_classes_on_reference_images():
+    """Downsampling for features must not change the texture class of reference images."""
+    print("🧪 Testing texture classification...")
+
+    analyzer = AIImageAnalyzer()
+    expected = {'grass': 'grass-like', 'carpet': 'carpet-like', 'wood': 'wood-like'}
+    for name, image in _reference_textures().items():
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        assert analyzer._analyze_texture(gray)['texture_type'] == expected[name], name
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_path = os.path.join(tmp_dir, 'grass.png')
+        cv2.imwrite(image_path, _reference_textures()['grass'])
+        cache_file = ai_image_analyzer.IMAGE_CACHE_FILE
+        ai_image_analyzer.IMAGE_CACHE_FILE = os.path.join(tmp_dir, 'cache.json')
+        AIImageAnalyzer._cache = None
+        try:
+            analysis = analyzer.analyze_image(image_path)
+            assert analysis['texture'] == 'grass-like'
+            assert analysis['product_type'] == 'artificial_grass'
+        finally:
+            ai_image_analyzer.IMAGE_CACHE_FILE = cache_file
+            AIImageAnalyzer._cache = None
+            AIImageAnalyzer._cache_dirty = False
+
+    print("✅ Texture classes stable")
+
+
+def test_analyze_image_uses_content_cache():
+    """A second analysis of identical image bytes should come from the cache."""
+    print("🧪 Testing image analysis cache...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image = np.zeros((120, 120, 3), dtype=np.uint8)
+        image[:, :60] = (40, 160, 40)
+        image_path = os.path.join(tmp_dir, 'listing.png')
+        cv2.imwrite(image_path, image)
+
+        cache_file = ai_image_analyzer.IMAGE_CACHE_FILE
+        ai_image_analyzer.IMAGE_CACHE_FILE = os.path.join(tmp_dir, 'cache.json')
+        AIImageAnalyzer._cache = None
+        try:
+            analyzer = AIImageAnalyzer()
+            first = analyzer.analyze_image(image_path)
+            assert first['success']
+            assert len(AIImageAnalyzer._cache) == 1
+
+            analyzer._analyze_colors = None  # Would fail if the cache were bypassed
+            second = analyzer.analyze_image(image_path)
+            assert second == first
+
+            AIImageAnalyzer.save_cache()
+            assert os.path.exists(ai_image_analyzer.IMAGE_CACHE_FILE)
+        finally:
+            ai_image_analyzer.IMAGE_CACHE_FILE = cache_file
+            AIImageAnalyzer._cache = None
+            AIImageAnalyzer._cache_dirty = False
+
+    print("✅ Cached analysis reused")
+
+
+def main():
+    """Run all image analyzer tests."""
+    test_lbp_matches_reference()
+    test_lbp_numpy_fallback_matches_reference()
+    test_hsv_to_color_name_bands()
+    test_texture_classes_on_reference_images()
+    test_analyze_image_uses_content_cache()
+    print("\n🎉 All image analyzer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
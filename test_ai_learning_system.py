@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI learning system's listing analysis.
+These tests run against a temporary account folder and never call OpenAI.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import types
+
+from ai_learning_system import AILearningSystem, CATEGORY_COUNTS_QUERY
+
+
+SAMPLE_LISTINGS = [
+    ('Grey Twist Carpet 4m', 'Soft carpet\n• Free samples\n• Fast delivery', 'Home & Garden', '£12', 'active'),
+    ('Artificial Grass 🌿', 'Lush green lawn\nLow maintenance', 'Garden', '£8', 'active'),
+    ('Composite Decking Boards', 'Weather resistant - durable', 'Garden', '25', None),
+    ('Old Listing', 'Should be ignored', 'Garden', '£999', 'deleted'),
+]
+
+
+def _create_account(base_dir, account, listings=SAMPLE_LISTINGS):
+    """Create an account folder with a listings.db like the app does."""
+    account_dir = os.path.join(base_dir, account)
+    os.makedirs(account_dir)
+    conn = sqlite3.connect(os.path.join(account_dir, 'listings.db'))
+    conn.execute('''
+        CREATE TABLE listings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            price TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            product_tags TEXT,
+            location TEXT,
+            image_paths TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            facebook_listing_id TEXT,
+            notes TEXT
+        )
+    ''')
+    conn.executemany(
+        'INSERT INTO listings (title, description, category, price, status) VALUES (?, ?, ?, ?, ?)',
+        listings
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_analyze_account_listings():
+    """Analysis should skip deleted listings and summarise the rest."""
+    print("🧪 Testing account listing analysis...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        _create_account(base_dir, 'test_account')
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+
+        result = ai_system.analyze_account_listings('test_account')
+        ai_system.close()
+
+        assert result['success'], result
+        analysis = result['analysis']
+        assert analysis['total_listings'] == 3
+        assert analysis['category_distribution'] == {'Home & Garden': 1, 'Garden': 2}
+        assert analysis['price_stats'] == {'min': 8, 'max': 25, 'avg': 15.0}
+        assert abs(analysis['title_stats']['emoji_usage'] - 1 / 3) < 1e-9
+        assert abs(analysis['title_stats']['number_usage'] - 1 / 3) < 1e-9
+        assert abs(analysis['description_stats']['bullet_usage'] - 2 / 3) < 1e-9
+        assert abs(analysis['description_stats']['emoji_usage'] - 1 / 3) < 1e-9
+        print(f"✅ Analysis OK: {analysis['total_listings']} listings")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def test_connection_is_reused():
+    """Repeated analysis of one account should reuse a single connection."""
+    print("🧪 Testing connection reuse...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        _create_account(base_dir, 'test_account')
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+
+        first = ai_system._get_conn('test_account')
+        ai_system.analyze_account_listings('test_account')
+        assert ai_system._get_conn('test_account') is first
+        assert first.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        plan = first.execute('EXPLAIN QUERY PLAN ' + CATEGORY_COUNTS_QUERY).fetchall()
+        assert 'idx_listings_live_category' in plan[0][3]
+
+        ai_system.close()
+        assert ai_system._conn_cache == {}
+        print("✅ Connection reused and closed")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def test_variations_are_stored_in_sqlite():
+    """Stored variations go to the variations database; older stores are migrated."""
+    print("🧪 Testing variation storage...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        legacy = {
+            'accounts': {},
+            'variations': {
+                'acc_title_0000': {'account': 'acc', 'type': 'title', 'original': 'a', 'variation': 'b'}
+            }
+        }
+        with open(os.path.join(base_dir, 'ai_learning_data.json'), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+        with open(os.path.join(base_dir, 'ai_learning_variations.jsonl'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'key': 'acc_title_1111', 'account': 'acc', 'type': 'title',
+                                'original': 'c', 'variation': 'd'}) + '\n')
+
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        assert 'variations' not in ai_system.learning_data
+
+        ai_system._store_variation_learning('acc', 'Grey Carpet', 'Soft Grey Carpet', 'title')
+        ai_system._store_variation_learning('acc', 'Grey Carpet', 'Plush Grey Carpet', 'title')
+
+        assert not os.path.exists(ai_system.legacy_variations_file)
+        assert ai_system.get_learning_insights()['total_variations'] == 3
+        rows = ai_system._get_variations_db().execute(
+            "SELECT variation FROM variations WHERE original = 'Grey Carpet'"
+        ).fetchall()
+        assert rows == [('Plush Grey Carpet',)]
+        ai_system.close()
+        print("✅ Variations stored and counted")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def test_learning_data_writes_are_coalesced():
+    """Changes inside a `with` block are saved once, when the block exits."""
+    print("🧪 Testing coalesced learning data saves...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        _create_account(base_dir, 'first')
+        _create_account(base_dir, 'second')
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        saves = []
+        save_learning_data = ai_system.save_learning_data
+        ai_system.save_learning_data = lambda: saves.append(1) or save_learning_data()
+
+        with ai_system:
+            ai_system.analyze_account_listings('first')
+            ai_system.analyze_account_listings('second')
+            ai_system.train_on_successful_listings('first', [{'title': 'Grey Carpet'}])
+            assert saves == []
+        assert saves == [1]
+
+        with open(ai_system.learning_data_file, encoding='utf-8') as f:
+            saved = json.load(f)
+        assert set(saved['accounts']) == {'first', 'second'}
+        ai_system.close()
+        assert saves == [1]
+        print("✅ One save for three changes")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+class _FakeAsyncOpenAI:
+    """Stand-in for openai.AsyncOpenAI that echoes the original title back."""
+
+    def __init__(self, api_key=None, **client_kwargs):
+        self.chat = types.SimpleNamespace(completions=self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    calls = 0
+
+    async def create(self, messages, **params):
+        _FakeAsyncOpenAI.calls += 1
+        title = messages[-1]['content'].split('Original Title: "', 1)[1].split('"', 1)[0]
+        message = types.SimpleNamespace(content=f"VARIATION: Premium {title}")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+
+_fake_create = _FakeAsyncOpenAI.create
+
+
+def test_bulk_title_variations_keep_order():
+    """Bulk generation should return one result per title, in input order."""
+    print("🧪 Testing bulk title variations...")
+
+    base_dir = tempfile.mkdtemp()
+    openai_module = sys.modules.get('openai')
+    sys.modules['openai'] = types.SimpleNamespace(AsyncOpenAI=_FakeAsyncOpenAI, OpenAIError=Exception)
+    try:
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        titles = ['Grey Twist Carpet', 'Artificial Grass Roll', 'Grey Twist Carpet', 'Composite Decking']
+
+        _FakeAsyncOpenAI.calls = 0
+        results = ai_system.generate_ai_title_variations_bulk('acc', titles)
+
+        assert _FakeAsyncOpenAI.calls == 3  # the repeated title is sent once
+        assert [r['success'] for r in results] == [True, True, True, True]
+        assert [r['variation'] for r in results] == [f"Premium {t}" for t in titles]
+
+        # Identical prompts are answered from the prompt cache
+        _FakeAsyncOpenAI.create = None
+        cached = ai_system.generate_ai_title_variations_bulk('acc', titles)
+        assert [r['variation'] for r in cached] == [r['variation'] for r in results]
+        ai_system.close()
+        print(f"✅ {len(results)} variations generated in order and cached")
+    finally:
+        _FakeAsyncOpenAI.create = _fake_create
+        if openai_module is None:
+            sys.modules.pop('openai', None)
+        else:
+            sys.modules['openai'] = openai_module
+        shutil.rmtree(base_dir)
+
+
+def main():
+    """Run all AI learning system tests."""
+    test_analyze_account_listings()
+    test_connection_is_reused()
+    test_variations_are_stored_in_sqlite()
+    test_learning_data_writes_are_coalesced()
+    test_bulk_title_variations_keep_order()
+    print("\n🎉 All AI learning system tests passed!")
+
+
+if __name__ == "__main__":
+    main()
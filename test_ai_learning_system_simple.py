@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Test script for the simple AI learning system used by the bot.
+These tests run against a temporary account folder and never call OpenAI.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+
+from ai_learning_system_simple import AILearningSystem, zstandard
+from test_ai_learning_system import SAMPLE_LISTINGS, _create_account
+
+
+class _FakeOpenAI:
+    """Stand-in for openai.OpenAI that returns canned variations."""
+
+    calls = 0
+    clients = 0
+    models = []
+    thin_models = set()  # models that answer with a single variation
+
+    def __init__(self, **client_kwargs):
+        _FakeOpenAI.clients += 1
+        self.chat = types.SimpleNamespace(completions=self)
+        self.embeddings = types.SimpleNamespace(create=self._embed)
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _embed(model, input):
+        """Bag-of-letters embedding: texts differing in case or spacing match exactly."""
+        vector = [0.0] * 26
+        for char in input.lower():
+            if 'a' <= char <= 'z':
+                vector[ord(char) - ord('a')] += 1.0
+        return types.SimpleNamespace(data=[types.SimpleNamespace(embedding=vector)])
+
+    def create(self, messages, model, **params):
+        _FakeOpenAI.calls += 1
+        _FakeOpenAI.models.append(model)
+        variations = ["Soft Grey Carpet", "Plush Grey Carpet", "Grey Twist Carpet"]
+        if model in _FakeOpenAI.thin_models:
+            variations = variations[:1]
+        assert params['response_format'] == {"type": "json_object"}
+        content = json.dumps({"variations": variations})
+        prompt = messages[-1]['content']
+        if 'Listings:' in prompt:
+            # Batch prompt: answer every listing except "Unanswered" ones
+            listings = json.loads(prompt.split('Listings:', 1)[1])
+            content = json.dumps({"results": [
+                {"id": listing['id'], "variations": [f"Premium {listing['title']}"]}
+                for listing in listings if not listing['title'].startswith('Unanswered')
+            ]})
+        message = types.SimpleNamespace(content=content)
+        usage = types.SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+
+class _FakeAsyncOpenAI:
+    """Stand-in for openai.AsyncOpenAI; records prompts and shares the sync call counter."""
+
+    prompts = []
+
+    def __init__(self, **client_kwargs):
+        self.chat = types.SimpleNamespace(completions=self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def create(self, messages, **params):
+        _FakeAsyncOpenAI.prompts.append(messages[-1]['content'])
+        return _FakeOpenAI.create(None, messages, **params)
+
+
+def _with_fake_openai(test):
+    """Run a test with the fake OpenAI module installed and a temp base dir."""
+    def wrapper():
+        base_dir = tempfile.mkdtemp()
+        openai_module = sys.modules.get('openai')
+        sys.modules['openai'] = types.SimpleNamespace(
+            OpenAI=_FakeOpenAI, AsyncOpenAI=_FakeAsyncOpenAI, OpenAIError=Exception
+        )
+        _FakeOpenAI.calls = 0
+        _FakeOpenAI.clients = 0
+        _FakeOpenAI.models = []
+        _FakeOpenAI.thin_models = set()
+        _FakeAsyncOpenAI.prompts = []
+        try:
+            test(base_dir)
+        finally:
+            if openai_module is None:
+                sys.modules.pop('openai', None)
+            else:
+                sys.modules['openai'] = openai_module
+            shutil.rmtree(base_dir)
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+
+@_with_fake_openai
+def test_identical_prompts_use_response_cache(base_dir):
+    """A repeated title should be answered from the in-memory, then on-disk, response cache."""
+    print("🧪 Testing OpenAI response cache...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    first = ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    second = ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    ai_system.close()
+
+    assert first['success'] and second['success']
+    assert second['all_variations'] == first['all_variations']
+    assert _FakeOpenAI.calls == 1
+
+    # The cache survives a restart, and repeats are then served from memory
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    ai_system._get_cache_conn().execute('DELETE FROM cache')
+    ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    ai_system.close()
+    assert _FakeOpenAI.calls == 1
+    print("✅ Repeated prompt served from cache")
+
+
+@_with_fake_openai
+def test_near_duplicate_titles_use_semantic_cache(base_dir):
+    """Titles differing only in case/spacing should reuse earlier variations."""
+    print("🧪 Testing semantic cache...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir, semantic_threshold=0.95)
+    first = ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    similar = ai_system.generate_ai_title_variation('acc', 'grey   CARPET')
+    assert _FakeOpenAI.calls == 1
+    assert similar['type'] == 'ai_cached'
+    assert similar['all_variations'] == first['all_variations']
+
+    ai_system.generate_ai_title_variation('acc', 'Artificial Grass')
+    assert _FakeOpenAI.calls == 2
+    ai_system.close()
+
+    # Stored embeddings are reloaded from disk
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir, semantic_threshold=0.95)
+    assert ai_system.generate_ai_title_variation('acc', 'GREY carpet')['type'] == 'ai_cached'
+    ai_system.close()
+    assert _FakeOpenAI.calls == 2
+    print("✅ Near-duplicate title served from semantic cache")
+
+
+@_with_fake_openai
+def test_bundle_generates_title_and_description(base_dir):
+    """One bundle call should return both variations, each from its own prompt."""
+    print("🧪 Testing title + description bundle...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    bundle = ai_system.generate_bundle('acc', 'Grey Carpet', 'Soft grey carpet, free samples')
+    ai_system.close()
+
+    assert bundle['title']['success'] and bundle['description']['success']
+    assert bundle['title']['variation'] == 'Soft Grey Carpet'
+    assert _FakeOpenAI.calls == 2
+    description_prompt = next(p for p in _FakeAsyncOpenAI.prompts if 'Original Description' in p)
+    assert 'Title: "Grey Carpet"' in description_prompt
+    print("✅ Bundle returned title and description variations")
+
+
+@_with_fake_openai
+def test_thin_answers_are_retried_on_fallback_model(base_dir):
+    """The small model is tried first; too few variations escalate to the fallback."""
+    print("🧪 Testing model routing...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    assert _FakeOpenAI.models == [ai_system.title_model]
+
+    _FakeOpenAI.thin_models = {ai_system.desc_model}
+    result = ai_system.generate_ai_description_variation('acc', 'Soft grey carpet')
+    assert _FakeOpenAI.models[1:] == [ai_system.desc_model, ai_system.fallback_model]
+    assert len(result['all_variations']) == 3
+    assert _FakeOpenAI.clients == 1  # one client shared by all three calls
+    assert not os.path.exists(ai_system.learning_data_file)  # usage is saved on close, not per call
+    ai_system.close()
+
+    saved = AILearningSystem(openai_api_key='test-key', base_dir=base_dir).learning_data
+    usage = saved['success_metrics']['token_usage']
+    assert usage[ai_system.title_model] == {'calls': 2, 'prompt_tokens': 200, 'completion_tokens': 40}
+    assert usage[ai_system.fallback_model]['calls'] == 1
+    print("✅ Thin answer retried on the fallback model")
+
+
+@_with_fake_openai
+def test_direct_gate_skips_openai_for_unseen_originals(base_dir):
+    """Originals unlike anything the account produced before are used as is."""
+    print("🧪 Testing direct-response gate...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir, direct_threshold=0.5)
+    first = ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    assert first['type'] == 'direct' and first['variation'] == 'Grey Carpet'
+    assert _FakeOpenAI.calls == 0
+
+    # Reposting the same title needs a real variation
+    assert ai_system.generate_ai_title_variation('acc', 'Grey Carpet')['type'] == 'ai_generated'
+    assert _FakeOpenAI.calls == 1
+
+    # History is per account and persisted
+    assert ai_system.generate_ai_title_variation('other', 'Grey Carpet')['type'] == 'direct'
+    assert ai_system.learning_data['success_metrics']['direct_gate'] == {'checked': 3, 'direct': 2}
+    ai_system.close()
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir, direct_threshold=0.5)
+    assert ai_system.generate_ai_title_variation('acc', 'grey  carpet')['type'] != 'direct'
+    assert ai_system.generate_ai_title_variation('acc', 'Composite Decking')['type'] == 'direct'
+    ai_system.close()
+
+    # A session where every original was gated still saves its counts
+    calls = _FakeOpenAI.calls
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir, direct_threshold=0.5)
+    assert ai_system.generate_ai_title_variation('acc', 'Oak Garden Bench')['type'] == 'direct'
+    assert _FakeOpenAI.calls == calls
+    ai_system.close()
+    saved = AILearningSystem(openai_api_key='test-key', base_dir=base_dir).learning_data
+    assert saved['success_metrics']['direct_gate'] == {'checked': 6, 'direct': 4}
+    print("✅ Unseen originals skipped OpenAI")
+
+
+@_with_fake_openai
+def test_title_batch_shares_one_call(base_dir):
+    """A batch of titles is sent as one prompt; titles it misses are retried alone."""
+    print("🧪 Testing batched title variations...")
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    titles = ['Grey Carpet', 'Artificial Grass', 'Grey Carpet', 'Unanswered Decking']
+    results = ai_system.generate_ai_title_variations_batch('acc', titles)
+    ai_system.close()
+
+    assert [r['variation'] for r in results] == [
+        'Premium Grey Carpet', 'Premium Artificial Grass', 'Premium Grey Carpet', 'Soft Grey Carpet'
+    ]
+    assert _FakeOpenAI.calls == 2  # one batch, one retry for the missing title
+    print(f"✅ {len(titles)} titles in {_FakeOpenAI.calls} calls")
+
+
+@_with_fake_openai
+def test_variations_are_stored_in_sqlite(base_dir):
+    """Generated variations go to the variations table; older JSON entries are moved there."""
+    print("🧪 Testing variation storage...")
+
+    legacy = {'accounts': {}, 'variations': {
+        'acc_title_0000': {'account': 'acc', 'type': 'title', 'original': 'Old Title', 'variation': 'New Title'}
+    }}
+    with open(os.path.join(base_dir, 'ai_learning_data.json'), 'w', encoding='utf-8') as f:
+        json.dump(legacy, f)
+
+    ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+    assert 'variations' not in ai_system.learning_data
+    ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+    ai_system.generate_ai_title_variation('acc', 'Grey Carpet')
+
+    assert sorted(ai_system.get_variations('acc', 'Grey Carpet')) == [
+        'Grey Twist Carpet', 'Plush Grey Carpet', 'Soft Grey Carpet'
+    ]
+    assert ai_system.get_variations('acc', 'Old Title') == ['New Title']
+    assert ai_system.get_learning_insights()['total_variations'] == 4
+    ai_system.close()
+    print("✅ Variations stored once each")
+
+
+def test_parse_ai_variations_formats():
+    """JSON responses are read directly; other responses fall back to line parsing."""
+    print("🧪 Testing variation parsing...")
+
+    ai_system = AILearningSystem.__new__(AILearningSystem)
+    assert ai_system._parse_ai_variations('{"variations": [" Soft Grey Carpet ", "", 3]}') == ['Soft Grey Carpet']
+
+    # Labelled, quoted and numbered lines are variations; other lines are ignored
+    content = (
+        "Here are some ideas:\n"
+        "  VARIATION: Soft Grey Carpet  \r\n"
+        '"Plush Grey Carpet"\n'
+        '2. "Grey Twist Carpet"\n'
+        "7. Not a variation\n"
+        "VARIATION:\n"
+    )
+    assert ai_system._parse_ai_variations(content) == [
+        'Soft Grey Carpet', 'Plush Grey Carpet', 'Grey Twist Carpet'
+    ]
+    print("✅ Variations parsed")
+
+
+def test_analysis_keeps_only_aggregates():
+    """Analysis stores SQL aggregates; the listings themselves stay in SQLite."""
+    print("🧪 Testing listing aggregates...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        _create_account(base_dir, 'acc', SAMPLE_LISTINGS + [
+            ('Decking Screws', 'Stainless', 'Garden', '£1,000', 'active'),
+            ('Garden Hose', 'Price on request', 'Garden', 'Ask', 'active'),
+            ('Garden Gnome', 'Set of three', 'Garden', 'from £20', 'active'),
+            ('Hose Reel', 'Wall mounted', 'Garden', '$15', 'active'),
+        ])
+        legacy = {'accounts': {'acc': {'listings': [{'title': 'Legacy Listing', 'created_at': None}]}}}
+        with open(os.path.join(base_dir, 'ai_learning_data.json'), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        result = ai_system.analyze_account_listings('acc')
+        assert result['success'], result
+        assert result['analysis'] == {
+            'total_listings': 7,
+            'categories': {
+                'Garden': {'count': 6, 'avg_price': 262.0, 'median_price': 20.0},
+                'Home & Garden': {'count': 1, 'avg_price': 12.0, 'median_price': 12.0},
+            }
+        }
+        assert ai_system.get_learning_insights('acc')['total_listings'] == 7
+
+        titles = sorted(listing['title'] for listing in ai_system.load_account_listings('acc'))
+        assert titles == ['Artificial Grass 🌿', 'Composite Decking Boards', 'Decking Screws',
+                          'Garden Gnome', 'Garden Hose', 'Grey Twist Carpet 4m', 'Hose Reel']
+
+        ai_system.close()
+        saved = AILearningSystem(openai_api_key='test-key', base_dir=base_dir).learning_data
+        assert 'listings' not in saved['accounts']['acc']
+        assert saved['accounts']['acc']['patterns'] == result['analysis']
+        assert [name for name in os.listdir(base_dir) if name.endswith('.tmp')] == []
+        print("✅ Only aggregates kept in the learning JSON")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def test_newer_learning_file_wins():
+    """The newer of the plain and compressed learning files is loaded; neither hides a newer one."""
+    print("🧪 Testing learning file choice...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        json_file = os.path.join(base_dir, 'ai_learning_data.json')
+        compressed_file = json_file + '.zst'
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({'accounts': {'plain': {}}}, f)
+        with open(compressed_file, 'wb') as f:
+            if zstandard is not None:
+                f.write(zstandard.ZstdCompressor().compress(json.dumps({'accounts': {'compressed': {}}}).encode()))
+            else:
+                f.write(b'compressed learning data')
+
+        os.utime(json_file, (1000, 1000))
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        if zstandard is not None:
+            assert list(ai_system.learning_data['accounts']) == ['compressed']
+        else:
+            # Unreadable but newer: the plain copy is used and never written over it
+            assert list(ai_system.learning_data['accounts']) == ['plain']
+            ai_system.save_learning_data()
+            assert os.path.getmtime(json_file) == 1000
+
+        os.utime(compressed_file, (1000, 1000))
+        os.utime(json_file, (2000, 2000))
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+        assert list(ai_system.learning_data['accounts']) == ['plain']
+        ai_system.save_learning_data()
+        saved = AILearningSystem(openai_api_key='test-key', base_dir=base_dir).learning_data
+        assert list(saved['accounts']) == ['plain']
+        print("✅ Newest learning file loaded")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def test_listings_connection_is_reused():
+    """Each account's listings database is opened once, in WAL mode."""
+    print("🧪 Testing listings connection reuse...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        _create_account(base_dir, 'acc')
+        ai_system = AILearningSystem(openai_api_key='test-key', base_dir=base_dir)
+
+        first = ai_system._get_conn('acc')
+        ai_system.analyze_account_listings('acc')
+        assert len(list(ai_system.load_account_listings('acc'))) == 3
+        assert ai_system._get_conn('acc') is first
+        assert first.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert ai_system._get_conn('missing') is None
+
+        ai_system.close()
+        assert ai_system._conn_cache == {}
+        print("✅ Connection reused and closed")
+    finally:
+        shutil.rmtree(base_dir)
+
+
+def main():
+    """Run all simple AI learning system tests."""
+    test_identical_prompts_use_response_cache()
+    test_near_duplicate_titles_use_semantic_cache()
+    test_bundle_generates_title_and_description()
+    test_thin_answers_are_retried_on_fallback_model()
+    test_direct_gate_skips_openai_for_unseen_originals()
+    test_title_batch_shares_one_call()
+    test_variations_are_stored_in_sqlite()
+    test_parse_ai_variations_formats()
+    test_analysis_keeps_only_aggregates()
+    test_newer_learning_file_wins()
+    test_listings_connection_is_reused()
+    print("\n🎉 All simple AI learning system tests passed!")
+
+
+if __name__ == "__main__":
+    main()
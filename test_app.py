@@ -0,0 +1,794 @@
+#!/usr/bin/env python3
+"""
+Test script for the account, database and file serving helpers in app.py.
+These tests use temporary folders and databases and never start the bot.
+"""
+
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import types
+
+import app
+from bot import DeleteResult
+
+
+def _listing(title, **fields):
+    """Build listing data like the listing form does."""
+    listing = {'title': title, 'price': '£10', 'description': 'Soft grey carpet'}
+    listing.update(fields)
+    return listing
+
+
+def test_pool_reuses_one_connection():
+    """Every save to one database should go through the same pooled connection."""
+    print("🧪 Testing account database pool...")
+
+    base_dir = tempfile.mkdtemp()
+    pool = app.db_pool
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        first_id = app.save_listing_to_db(db_path, _listing('Grey Carpet'))
+        conn, _ = pool.get(db_path)
+        second_id = app.save_listing_to_db(db_path, _listing('Grey Carpet', price='£12'))
+
+        assert first_id == second_id
+        assert pool.get(db_path)[0] is conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        plan = conn.execute('EXPLAIN QUERY PLAN SELECT id FROM listings WHERE title = ?', ('x',)).fetchall()
+        assert 'idx_listings_title (title=?)' in plan[0][3]
+
+        with pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT COUNT(*), MAX(price) FROM listings')
+            assert cursor.fetchone() == (1, '£12')
+        print("✅ One connection, one row")
+    finally:
+        pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_update_listing_status_relists_or_saves():
+    """Relisting updates the active row; unknown titles are saved as new listings."""
+    print("🧪 Testing listing status updates...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        app.save_listing_to_db(db_path, _listing('Grey Carpet'))
+
+        app.update_listing_status(db_path, _listing('Plush Grey Carpet', original_title='Grey Carpet'))
+        app.update_listing_status(db_path, _listing('Composite Decking', original_title='Missing'))
+
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT title, status FROM listings ORDER BY id')
+            assert cursor.fetchall() == [('Plush Grey Carpet', 'relisted'), ('Composite Decking', 'active')]
+        print("✅ Relisted and saved")
+    finally:
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_relist_onto_a_deleted_listings_title():
+    """Renaming onto a deleted listing's title moves the deleted row aside instead of failing."""
+    print("🧪 Testing relist onto a deleted listing's title...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        old_id = app.save_listing_to_db(db_path, _listing('Old title'))
+        chair_id = app.save_listing_to_db(db_path, _listing('Blue chair'))
+        table_id = app.save_listing_to_db(db_path, _listing('Oak table'))
+        app.mark_listings_deleted(db_path, [old_id])
+
+        app.update_listing_status(db_path, _listing('Old title', original_title='Blue chair'))
+        # A live listing keeps its title; the relist is still recorded on the renamed one
+        app.update_listing_status(db_path, _listing('Old title', original_title='Oak table'))
+
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT id, title, status FROM listings ORDER BY id')
+            assert cursor.fetchall() == [
+                (old_id, f'Old title (deleted #{old_id})', 'deleted'),
+                (chair_id, 'Old title', 'relisted'),
+                (table_id, 'Oak table', 'relisted'),
+            ]
+        print("✅ Relisted without a title clash")
+    finally:
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_bulk_save_upserts_in_batches():
+    """Bulk saves update existing titles, add new ones and commit per batch."""
+    print("🧪 Testing bulk listing saves...")
+
+    base_dir = tempfile.mkdtemp()
+    batch_size = app.BULK_INSERT_BATCH_SIZE
+    try:
+        app.BULK_INSERT_BATCH_SIZE = 2
+        db_path = os.path.join(base_dir, 'listings.db')
+        first_id = app.save_listing_to_db(db_path, _listing('Grey Carpet'))
+        conn, _ = app.db_pool.get(db_path)
+        assert not conn.in_transaction
+
+        commits = []
+        conn.set_trace_callback(lambda sql: sql == 'COMMIT' and commits.append(sql))
+        listings = [_listing('Grey Carpet', price='£12')] + [_listing(f'Decking {n}') for n in range(4)]
+        assert app.save_listings_to_db(db_path, listings) == 5
+        conn.set_trace_callback(None)
+        assert len(commits) == 3
+
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT id, price FROM listings WHERE title = ?', ('Grey Carpet',))
+            assert cursor.fetchone() == (first_id, '£12')
+            cursor.execute('SELECT COUNT(*) FROM listings')
+            assert cursor.fetchone() == (5,)
+        print("✅ Bulk save OK")
+    finally:
+        app.BULK_INSERT_BATCH_SIZE = batch_size
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_readonly_connection_sees_pooled_writes():
+    """Endpoint reads borrow pooled read-only connections over the WAL database."""
+    print("🧪 Testing read-only connections...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        app.save_listing_to_db(db_path, _listing('Grey Carpet'))
+        assert app.db_pool.get(db_path)[0].execute('PRAGMA mmap_size').fetchone()[0] == 134217728
+
+        with app.read_pool.borrow(db_path) as conn:
+            assert conn.execute('SELECT title FROM listings').fetchall() == [('Grey Carpet',)]
+        app.save_listing_to_db(db_path, _listing('Composite Decking'))
+        with app.read_pool.borrow(db_path) as reused:
+            assert reused is conn
+            assert reused.execute('SELECT COUNT(*) FROM listings').fetchone() == (2,)
+
+        try:
+            with app.read_pool.borrow(db_path) as conn:
+                conn.execute('DELETE FROM listings')
+            assert False, 'read-only connection accepted a write'
+        except sqlite3.OperationalError:
+            pass
+        with app.read_pool.borrow(db_path) as fresh:
+            assert fresh is not conn
+        print("✅ Read-only connections pooled")
+    finally:
+        app.read_pool.close_all()
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_duplicate_titles_fall_back_to_lookup():
+    """Databases that already hold duplicate titles should still accept saves."""
+    print("🧪 Testing saves without the unique title index...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute(app.LISTINGS_SCHEMA)
+        conn.executemany('INSERT INTO listings (title, price) VALUES (?, ?)',
+                         [('Grey Carpet', '£10'), ('Grey Carpet', '£11')])
+        conn.commit()
+        conn.close()
+
+        assert not app.db_pool.has_unique_titles(db_path)
+        conn, _ = app.db_pool.get(db_path)
+        plan = conn.execute('EXPLAIN QUERY PLAN ' + app.ACTIVE_LISTINGS_BY_TITLE_QUERY, ('a',)).fetchall()
+        assert 'idx_listings_title_status' in plan[0][3]
+        listing_id = app.save_listing_to_db(db_path, _listing('Grey Carpet', price='£12'))
+        new_id = app.save_listing_to_db(db_path, _listing('Composite Decking'))
+
+        assert listing_id == 1
+        assert new_id == 3
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT price FROM listings ORDER BY id')
+            assert cursor.fetchall() == [('£12',), ('£11',), ('£10',)]
+        print("✅ Saved without UPSERT")
+    finally:
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_get_accounts_scans_once_per_ttl():
+    """Account folders are listed from a short-lived cache until invalidated."""
+    print("🧪 Testing account listing cache...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        app.invalidate_accounts_cache()
+        assert app.get_accounts() == []
+
+        os.makedirs(os.path.join('accounts', 'first'))
+        with open(os.path.join('accounts', 'notes.txt'), 'w') as f:
+            f.write('not an account')
+        assert app.get_accounts() == []  # still cached
+
+        app.invalidate_accounts_cache()
+        assert app.get_accounts() == ['first']
+        print("✅ Accounts cached and rescanned")
+    finally:
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_account_paths_prefer_pickle_cookies():
+    """Cookie paths are found with one folder scan and remembered once they exist."""
+    print("🧪 Testing account path resolution...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        db_path = os.path.join('accounts', 'first', 'listings.db')
+        assert app._resolve_account_paths('first') == (os.path.join('accounts', 'first', 'cookies.json'), db_path)
+        assert 'first' not in app._account_paths
+
+        for name in ('cookies.json', 'cookies.pkl'):
+            with open(os.path.join('accounts', 'first', name), 'w') as f:
+                f.write('[]')
+        pkl_paths = (os.path.join('accounts', 'first', 'cookies.pkl'), db_path)
+        assert app._resolve_account_paths('first') == pkl_paths
+        assert app._account_paths['first'] == pkl_paths
+        print("✅ Account paths resolved and cached")
+    finally:
+        os.chdir(cwd)
+        app._account_paths.pop('first', None)
+        shutil.rmtree(base_dir)
+
+
+def test_bot_jobs_are_bounded():
+    """Bot jobs beyond the pool and queue limit are refused until a slot frees up."""
+    print("🧪 Testing bot job queue limit...")
+
+    bot_slots = app._bot_slots
+    release = threading.Event()
+    try:
+        app._bot_slots = threading.BoundedSemaphore(1)
+        first = app._submit_bot_job('first', lambda account, event: event.wait(5), release)
+        assert first is not None
+        assert app._bot_futures['first'] is first
+        assert app._submit_bot_job('second', lambda account: None) is None
+
+        release.set()
+        first.result(timeout=5)
+        second = app._submit_bot_job('second', lambda account: account.upper())
+        assert second.result(timeout=5) == 'SECOND'
+        print("✅ Queue limit enforced")
+    finally:
+        release.set()
+        app._bot_slots = bot_slots
+        app._bot_futures.clear()
+
+
+def test_bot_jobs_for_one_account_run_in_order():
+    """A second job for a busy account waits for the first; other accounts don't."""
+    print("🧪 Testing one bot job at a time per account...")
+
+    release = threading.Event()
+    order = []
+
+    def job(account, name, wait=False):
+        order.append(f'{name} start')
+        if wait:
+            release.wait(5)
+        order.append(f'{name} end')
+        return name
+
+    try:
+        first = app._submit_bot_job('first', job, 'relist', True)
+        queued = app._submit_bot_job('first', job, 'delete')
+        other = app._submit_bot_job('second', job, 'other')
+
+        assert other.result(timeout=5) == 'other'
+        assert not queued.done()
+        assert app._bot_futures['first'] is queued
+        release.set()
+        assert queued.result(timeout=5) == 'delete'
+        assert first.result() == 'relist'
+        relist_end = order.index('relist end')
+        assert order.index('delete start') == relist_end + 1
+        # The worker lets go of the account just after finishing its last job
+        deadline = time.monotonic() + 5
+        while app._bot_account_jobs and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert app._bot_account_jobs == {}
+        print("✅ Jobs for one account ran in order")
+    finally:
+        release.set()
+        app._bot_futures.clear()
+
+
+class _FakeBot:
+    """Stand-in for MarketplaceBot that 'relists' by appending a marker to the title."""
+
+    def __init__(self, cookies_path, delay_factor, proxy=None):
+        pass
+
+    def delete_listing_if_exists(self, title):
+        return DeleteResult(success=True, found=True)
+
+    def create_new_listing(self, listing_data):
+        return {
+            'success': True,
+            'original_title': listing_data['original_title'],
+            'new_title': listing_data['title'] + ' (new)',
+            'new_description': listing_data['description'],
+        }
+
+    def close(self):
+        pass
+
+
+def test_batch_jobs_group_database_writes():
+    """Relist and delete batches commit their database changes in groups."""
+    print("🧪 Testing batched database writes...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    patched = {name: getattr(app, name) for name in
+               ('MarketplaceBot', 'time', 'DB_BATCH_SIZE', 'update_listing_statuses', 'mark_listings_deleted')}
+    calls = []
+    try:
+        os.chdir(base_dir)
+        app.MarketplaceBot = _FakeBot
+        app.time = types.SimpleNamespace(sleep=lambda seconds: None)
+        app.DB_BATCH_SIZE = 2
+        app.update_listing_statuses = lambda *args: calls.append('relist') or patched['update_listing_statuses'](*args)
+        app.mark_listings_deleted = lambda *args: calls.append('delete') or patched['mark_listings_deleted'](*args)
+
+        _, db_path = app._resolve_account_paths('first')
+        titles = ['Grey Carpet', 'Artificial Grass', 'Composite Decking']
+        ids = [app.save_listing_to_db(db_path, _listing(title)) for title in titles]
+
+        app.run_multiple_bot_process('first', [_listing(t, original_title=t) for t in titles])
+        assert calls == ['relist', 'relist']
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT title, status FROM listings ORDER BY id')
+            assert cursor.fetchall() == [(t + ' (new)', 'relisted') for t in titles]
+
+        calls.clear()
+        app.run_delete_only_process('first', [{'listing_id': i, 'title': 't'} for i in ids])
+        assert calls == ['delete', 'delete']
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute("SELECT COUNT(*) FROM listings WHERE status = 'deleted'")
+            assert cursor.fetchone()[0] == 3
+
+        # A single relist may land on a title that only a deleted listing still holds
+        sofa_id = app.save_listing_to_db(db_path, _listing('Sofa'))
+        app.run_bot_process('first', _listing('Grey Carpet', original_title='Sofa'))
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT title, status FROM listings WHERE id = ?', (sofa_id,))
+            assert cursor.fetchone() == ('Grey Carpet (new)', 'active')
+        print("✅ Batch writes grouped")
+    finally:
+        for name, value in patched.items():
+            setattr(app, name, value)
+        app.db_pool.close_all()
+        app._account_paths.pop('first', None)
+        os.chdir(cwd)
+        shutil.rmtree(base_dir)
+
+
+def test_save_listing_stores_photos_and_row():
+    """Saving from the form keeps image uploads only and records the listing."""
+    print("🧪 Testing listing save endpoint...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        client = app.app.test_client()
+        response = client.post('/save_listing', data={
+            'account': 'first',
+            'title': 'Grey Carpet: 4m Roll!',
+            'price': '£12',
+            'description': 'Soft grey carpet',
+            'location': 'Leeds',
+            'photos': [(io.BytesIO(b'jpeg bytes'), 'front.JPG'), (io.BytesIO(b'notes'), 'notes.txt')],
+        }, content_type='multipart/form-data')
+        assert response.get_json()['success'], response.get_json()
+        assert app.wait_for_background_writes(5)
+
+        listing_dirs = os.listdir(os.path.join('accounts', 'first', 'listings'))
+        assert len(listing_dirs) == 1 and listing_dirs[0].endswith('_Grey_Carpet_4m_Roll')
+        listing_dir = os.path.join('accounts', 'first', 'listings', listing_dirs[0])
+        assert sorted(os.listdir(listing_dir)) == ['image_01.jpg', 'listing_data.txt']
+        with open(os.path.join(listing_dir, 'listing_data.txt'), encoding='utf-8') as f:
+            text = f.read()
+        assert 'Title: Grey Carpet: 4m Roll!\n' in text
+        assert text.endswith('Images (1):\n  1. image_01.jpg\n')
+
+        with app.db_pool.acquire(os.path.join('accounts', 'first', 'listings.db')) as cursor:
+            cursor.execute('SELECT title, image_paths FROM listings')
+            title, image_paths = cursor.fetchone()
+        assert title == 'Grey Carpet: 4m Roll!'
+        assert image_paths == os.path.abspath(os.path.join(listing_dir, 'image_01.jpg'))
+        print("✅ Listing saved with one photo")
+    finally:
+        app.db_pool.close_all()
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_add_account_writes_cookies_and_database():
+    """Adding an account saves Selenium-ready cookies and creates its database."""
+    print("🧪 Testing account creation...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        client = app.app.test_client()
+        cookies = [{'name': 'c_user', 'value': '1', 'expirationDate': 1900000000.5, 'sameSite': 'no_restriction'}]
+        cookies += [{'name': f'c{n}', 'value': '1', 'sameSite': same_site}
+                    for n, same_site in enumerate(['lax', 'Strict', 'unspecified', 'bogus'])]
+        cookies.append({'name': 'xs', 'value': '1'})
+
+        bad = client.post('/add_account', json={'account_name': 'first', 'cookies_json': '[{'})
+        assert bad.status_code == 400
+        assert 'Invalid JSON format' in bad.get_json()['message']
+
+        response = client.post('/add_account', json={'account_name': 'first', 'cookies_json': json.dumps(cookies)})
+        assert response.get_json()['success'], response.get_json()
+        assert app.get_accounts() == ['first']
+
+        with open(os.path.join('accounts', 'first', 'cookies.json'), encoding='utf-8') as f:
+            text = f.read()
+        assert '\n' not in text and ', ' not in text
+        saved = json.loads(text)
+        assert saved[:1] == [{'name': 'c_user', 'value': '1', 'domain': '.facebook.com', 'path': '/',
+                          'expiry': 1900000000, 'httpOnly': False, 'secure': True, 'sameSite': 'None'}]
+        assert [cookie['sameSite'] for cookie in saved] == ['None', 'Lax', 'Strict', 'Lax', 'None', 'None']
+        assert app.db_pool.has_unique_titles(os.path.join('accounts', 'first', 'listings.db'))
+        print("✅ Account created")
+    finally:
+        app.db_pool.close_all()
+        app.invalidate_accounts_cache()
+        os.chdir(cwd)
+        shutil.rmtree(base_dir)
+
+
+def test_listing_edit_endpoints_use_pooled_connection():
+    """Deleting a listing and filling in categories write through the pool."""
+    print("🧪 Testing listing delete and category endpoints...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        db_path = os.path.join('accounts', 'first', 'listings.db')
+        os.makedirs(os.path.dirname(db_path))
+        first_id = app.save_listing_to_db(db_path, _listing('Grey Carpet', category=''))
+        app.save_listing_to_db(db_path, _listing('Composite Decking', category='Garden'))
+        app.save_listing_to_db(db_path, _listing('Artificial Grass', category=None))
+        client = app.app.test_client()
+
+        response = client.post('/account/first/update_categories', json={'default_category': 'Flooring'})
+        body = response.get_json()
+        assert body['updated'] == 2, body
+        assert body['category_stats'] == {'Flooring': 2, 'Garden': 1}
+        again = client.post('/account/first/update_categories', json={})
+        assert again.get_json()['updated'] == 0
+
+        assert client.post(f'/account/first/listings/{first_id}/delete').get_json()['success']
+        missing = client.post(f'/account/first/listings/{first_id}/delete')
+        assert missing.status_code == 404
+
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute('SELECT title FROM listings ORDER BY id')
+            assert cursor.fetchall() == [('Composite Decking',), ('Artificial Grass',)]
+        print("✅ Listing deleted and categories filled in")
+    finally:
+        app.db_pool.close_all()
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_randomize_locations_only_reads_selected_listings():
+    """Only the selected active listings get a new location, each one different."""
+    print("🧪 Testing location randomizing...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        db_path = os.path.join('accounts', 'first', 'listings.db')
+        os.makedirs(os.path.dirname(db_path))
+        ids = [app.save_listing_to_db(db_path, _listing(f'Grey Carpet {n}')) for n in range(4)]
+        app.mark_listings_deleted(db_path, [ids[3]])
+        client = app.app.test_client()
+
+        response = client.post('/randomize_locations', json={
+            'account': 'first',
+            'listing_ids': [str(ids[2]), ids[0], ids[0], ids[3], 'not-an-id'],
+        })
+        body = response.get_json()
+        assert body['success'], body
+        locations = body['locations']
+        assert [loc['listing_id'] for loc in locations] == [ids[0], ids[2]]
+        assert len({loc['new_location'] for loc in locations}) == 2
+
+        with open(os.path.join('accounts', 'first', 'randomized_locations.json'), encoding='utf-8') as f:
+            assert set(json.load(f)) == {str(ids[0]), str(ids[2])}
+        assert app._location_manager() is app._location_manager()
+        print(f"✅ {len(locations)} locations randomized")
+    finally:
+        app.read_pool.close_all()
+        app.db_pool.close_all()
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_listing_page_and_title_check_use_indexes():
+    """The listings page and the duplicate title check are answered from indexes."""
+    print("🧪 Testing listings page and title check...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(base_dir)
+        db_path = os.path.join('accounts', 'first', 'listings.db')
+        os.makedirs(os.path.dirname(db_path))
+        ids = [app.save_listing_to_db(db_path, _listing(title)) for title in
+               ('Grey Carpet', 'Composite Decking', 'Artificial Grass')]
+        app.mark_listings_deleted(db_path, [ids[1]])
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.execute("UPDATE listings SET created_at = '2024-01-0' || id")
+
+        conn, _ = app.db_pool.get(db_path)
+        page_plan = conn.execute(
+            f'EXPLAIN QUERY PLAN SELECT id FROM listings WHERE {app.LIVE_LISTING_FILTER} ORDER BY created_at DESC'
+        ).fetchall()
+        assert page_plan == [(page_plan[0][0], 0, 0, 'SCAN listings USING INDEX idx_listings_live_created')]
+        title_plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT id FROM listings WHERE LOWER(title) = LOWER(?)', ('x',)
+        ).fetchall()
+        assert 'idx_listings_lower_title' in title_plan[0][3]
+
+        client = app.app.test_client()
+        assert client.get('/account/nobody/listings').get_json() == {'listings': []}
+        listings = client.get('/account/first/listings').get_json()['listings']
+        assert app._account_dbs == {'first': db_path}
+        assert [listing['title'] for listing in listings] == ['Artificial Grass', 'Grey Carpet']
+        assert listings[0]['category'] == 'Other Garden decor'
+        cached = app._listing_page_queries[os.path.abspath(db_path)]
+        assert client.get('/account/first/listings').get_json()['listings'] == listings
+        assert app._listing_page_queries[os.path.abspath(db_path)] is cached
+
+        # Older databases without the optional columns still get every field
+        legacy_path = os.path.join('accounts', 'legacy', 'listings.db')
+        os.makedirs(os.path.dirname(legacy_path))
+        legacy = sqlite3.connect(legacy_path)
+        legacy.execute('CREATE TABLE listings (id INTEGER PRIMARY KEY, title TEXT, price TEXT, '
+                       'image_paths TEXT, created_at TEXT, status TEXT)')
+        legacy.execute("INSERT INTO listings (title, price) VALUES ('Grey Carpet', '£10')")
+        legacy.commit()
+        legacy.close()
+        assert client.get('/account/legacy/listings').get_json() == {'listings': [{
+            'id': 1, 'title': 'Grey Carpet', 'price': '£10', 'image_paths': '', 'created_at': None,
+            'status': None, 'category': 'Other Garden decor', 'product_tags': '', 'location': '', 'notes': '',
+        }]}
+
+        found = client.post('/account/first/check_title', json={'title': 'grey CARPET'}).get_json()
+        assert found['exists'] and f"ID: {ids[0]}" in found['message']
+        deleted = client.post('/account/first/check_title', json={'title': 'Composite Decking'}).get_json()
+        assert not deleted['exists']
+        print("✅ Listings page and title check OK")
+    finally:
+        app._listing_page_queries.clear()
+        app.read_pool.close_all()
+        app.db_pool.close_all()
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_relist_and_delete_hand_rows_to_the_worker():
+    """The endpoints queue the selected rows; the worker builds the listing data."""
+    print("🧪 Testing relist and delete dispatch...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    submit = app._submit_bot_job
+    run_multiple, run_delete = app.run_multiple_bot_process, app.run_delete_only_process
+    jobs, runs = [], []
+    try:
+        os.chdir(base_dir)
+        db_path = os.path.join('accounts', 'first', 'listings.db')
+        os.makedirs(os.path.dirname(db_path))
+        ids = [app.save_listing_to_db(db_path, _listing(title, image_paths=['a.jpg', 'b.jpg']))
+               for title in ('Grey Carpet', 'Composite Decking')]
+        app.mark_listings_deleted(db_path, [ids[1]])
+
+        app._submit_bot_job = lambda account, target, *args: jobs.append((account, target, args)) or True
+        app.run_multiple_bot_process = lambda account, data: runs.append(('relist', data))
+        app.run_delete_only_process = lambda account, data: runs.append(('delete', data))
+        client = app.app.test_client()
+
+        assert client.post('/relist_listings', json={'account': 'first', 'listing_ids': ids}).get_json()['success']
+        assert client.post('/delete_listings', json={'account': 'first', 'listing_ids': ids}).get_json()['success']
+        for account, target, args in jobs:
+            target(account, *args)
+
+        (_, relisted), (_, deleted) = runs
+        assert relisted == [{
+            'title': 'Grey Carpet', 'price': '£10', 'description': 'Soft grey carpet',
+            'category': 'Other Garden decor', 'product_tags': '', 'location': '',
+            'image_paths': ['a.jpg', 'b.jpg'], 'speed': '1.0', 'account': 'first',
+            'listing_id': ids[0], 'original_title': 'Grey Carpet',
+        }]
+        assert deleted == [{'listing_id': ids[0], 'title': 'Grey Carpet'}]
+        print("✅ Rows handed to the worker")
+    finally:
+        app._submit_bot_job = submit
+        app.run_multiple_bot_process, app.run_delete_only_process = run_multiple, run_delete
+        app.read_pool.close_all()
+        app.db_pool.close_all()
+        os.chdir(cwd)
+        app.invalidate_accounts_cache()
+        shutil.rmtree(base_dir)
+
+
+def test_ai_analyze_saves_learning_data_once():
+    """The AI analysis route saves learning data when the request ends, not mid-request."""
+    print("🧪 Testing AI analysis write coalescing...")
+
+    from ai_learning_system import AILearningSystem
+    from test_ai_learning_system import _create_account
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    save = AILearningSystem.save_learning_data
+    analyze = AILearningSystem.analyze_account_listings
+    saves = []
+
+    def analyze_then_check(self, account):
+        result = analyze(self, account)
+        assert saves == []  # still inside the request's batch
+        return result
+
+    try:
+        os.chdir(base_dir)
+        _create_account('accounts', 'first')
+        AILearningSystem.save_learning_data = lambda self: saves.append(self) or save(self)
+        AILearningSystem.analyze_account_listings = analyze_then_check
+
+        response = app.app.test_client().post('/account/first/ai_analyze')
+        assert response.get_json()['success'], response.get_json()
+        assert len(saves) == 1
+        assert os.path.exists(saves[0].learning_data_file)
+        print("✅ Learning data saved once per request")
+    finally:
+        AILearningSystem.save_learning_data = save
+        AILearningSystem.analyze_account_listings = analyze
+        os.chdir(cwd)
+        shutil.rmtree(base_dir)
+
+
+def test_select_listings_by_ids_chunks_and_pads():
+    """ID lookups skip bad IDs, respect the status filter and split long ID lists."""
+    print("🧪 Testing listing lookup by IDs...")
+
+    base_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(base_dir, 'listings.db')
+        with app.db_pool.acquire(db_path) as cursor:
+            cursor.executemany('INSERT INTO listings (title, price, status) VALUES (?, ?, ?)',
+                               [(f'Carpet {n}', '£10', 'deleted' if n == 5 else 'active') for n in range(1, 601)])
+
+        with app.read_pool.borrow(db_path) as conn:
+            rows = app.select_listings_by_ids(conn, 'id', list(range(600, 0, -1)) + ['x', '3'],
+                                              app.ACTIONABLE_LISTING_FILTER)
+            assert [row[0] for row in rows] == [n for n in range(1, 601) if n != 5]
+
+            app._select_by_ids_sql.cache_clear()
+            for ids in ([1, 2, 3], [4, 6, 7], ['8']):
+                assert len(app.select_listings_by_ids(conn, 'id, title', ids, "status = 'active'")) == len(ids)
+            assert app._select_by_ids_sql.cache_info().currsize == 2  # padded to 4 IDs and 1 ID
+        print("✅ Listings found by ID")
+    finally:
+        app.read_pool.close_all()
+        app.db_pool.close_all()
+        shutil.rmtree(base_dir)
+
+
+def test_serve_image_stays_inside_app_folder():
+    """Images are served from the app folder, directly or through X-Accel-Redirect."""
+    print("🧪 Testing image serving...")
+
+    base_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    use_xaccel = app.USE_XACCEL
+    try:
+        os.chdir(base_dir)
+        os.makedirs(os.path.join('accounts', 'first', 'images'))
+        with open(os.path.join('accounts', 'first', 'images', 'image 01.jpg'), 'wb') as f:
+            f.write(b'jpeg bytes')
+        client = app.app.test_client()
+
+        response = client.get('/image/accounts/first/images/image 01.jpg')
+        assert response.status_code == 200
+        assert response.data == b'jpeg bytes'
+        response.close()
+        etag = response.headers['ETag']
+        assert response.headers['Cache-Control'] == 'public, max-age=86400'
+        repeat = client.get('/image/accounts/first/images/image 01.jpg', headers={'If-None-Match': etag})
+        assert repeat.status_code == 304
+        repeat.close()
+        partial = client.get('/image/accounts/first/images/image 01.jpg', headers={'Range': 'bytes=0-3'})
+        assert partial.status_code == 206 and partial.data == b'jpeg'
+        partial.close()
+        unsatisfiable = client.get('/image/accounts/first/images/image 01.jpg', headers={'Range': 'bytes=50-60'})
+        assert unsatisfiable.status_code == 416
+        since = client.get('/image/accounts/first/images/image 01.jpg',
+                           headers={'If-Modified-Since': response.headers['Last-Modified']})
+        assert since.status_code == 304
+        assert client.get('/image/accounts/first/images/missing.jpg').status_code == 404
+        assert client.get('/image/accounts/../../etc/passwd').status_code == 404
+
+        # Listing images are served the same way from inside the accounts folder
+        with open('secret.jpg', 'wb') as f:
+            f.write(b'not for you')
+        listing_image = client.get('/accounts/first/images/image 01.jpg')
+        assert listing_image.data == b'jpeg bytes'
+        listing_image.close()
+        assert client.get('/accounts/first/images/image 01.jpg',
+                          headers={'If-None-Match': listing_image.headers['ETag']}).status_code == 304
+        assert client.get('/accounts/..%2Fsecret.jpg').status_code == 404
+        assert client.get('/accounts/first/images/missing.jpg').status_code == 404
+        assert client.get('/accounts/first/cookies.json').status_code == 400
+
+        app.USE_XACCEL = True
+        response = client.get('/image/accounts/first/images/image 01.jpg')
+        assert response.headers['X-Accel-Redirect'] == '/protected/accounts/first/images/image%2001.jpg'
+        assert response.headers['Content-Type'] == 'image/jpeg'
+        assert response.data == b''
+        print("✅ Images served safely")
+    finally:
+        app.USE_XACCEL = use_xaccel
+        os.chdir(cwd)
+        shutil.rmtree(base_dir)
+
+
+def main():
+    """Run all app tests."""
+    test_pool_reuses_one_connection()
+    test_update_listing_status_relists_or_saves()
+    test_relist_onto_a_deleted_listings_title()
+    test_bulk_save_upserts_in_batches()
+    test_readonly_connection_sees_pooled_writes()
+    test_duplicate_titles_fall_back_to_lookup()
+    test_get_accounts_scans_once_per_ttl()
+    test_account_paths_prefer_pickle_cookies()
+    test_bot_jobs_are_bounded()
+    test_bot_jobs_for_one_account_run_in_order()
+    test_batch_jobs_group_database_writes()
+    test_save_listing_stores_photos_and_row()
+    test_add_account_writes_cookies_and_database()
+    test_listing_edit_endpoints_use_pooled_connection()
+    test_randomize_locations_only_reads_selected_listings()
+    test_listing_page_and_title_check_use_indexes()
+    test_relist_and_delete_hand_rows_to_the_worker()
+    test_ai_analyze_saves_learning_data_once()
+    test_select_listings_by_ids_chunks_and_pads()
+    test_serve_image_stays_inside_app_folder()
+    print("\n🎉 All app tests passed!")
+
+
+if __name__ == "__main__":
+    main()
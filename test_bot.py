@@ -6,7 +6,8 @@ This script tests the bot initialization without running the full automation.
 
 import os
 import sys
-from bot import MarketplaceBot
+import types
+from bot import DeleteResult, MarketplaceBot
 
 def test_bot_initialization():
     """Test if the bot can initialize properly."""
@@ -65,6 +66,18 @@ def test_bot_initialization():
         print(f"❌ Bot test failed: {e}")
         return False
 
+def test_delete_result_on_search_error():
+    """A delete that fails before searching reports nothing found, even on a fresh bot."""
+    print("🧪 Testing delete result on a failed search...")
+
+    bot = MarketplaceBot.__new__(MarketplaceBot)  # no browser needed before the search starts
+    bot.driver = types.SimpleNamespace(find_elements=lambda by, selector: [])
+    result = bot.delete_listing_if_exists(None)
+    assert result == DeleteResult(success=False, found=False)
+    assert not result
+    print("✅ Failed search reported as not found")
+
 if __name__ == "__main__":
+    test_delete_result_on_search_error()
     success = test_bot_initialization()
     sys.exit(0 if success else 1)
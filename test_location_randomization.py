@@ -75,6 +75,29 @@ def test_location_integration():
     
     return True
 
+def test_location_sampling():
+    """Sampled locations should not repeat until every location is used."""
+    print("\nTesting Location Sampling")
+    print("=" * 40)
+    
+    modifier = ImageMetadataModifier()
+    pool_size = len(modifier.uk_locations)
+    
+    locations = modifier.sample_random_uk_locations(pool_size)
+    assert len({loc['name'] for loc in locations}) == pool_size
+    
+    extra = modifier.sample_random_uk_locations(pool_size + 3)
+    assert len(extra) == pool_size + 3
+    assert len({loc['name'] for loc in extra}) == pool_size
+    
+    for location in extra:
+        base = next(b for b in modifier.uk_locations if b['name'] == location['name'])
+        assert abs(location['lat'] - base['lat']) <= 0.1
+        assert abs(location['lon'] - base['lon']) <= 0.1
+    
+    print(f"SUCCESS: {pool_size} distinct locations sampled")
+    return True
+
 def main():
     """Run location randomization tests."""
     print("LOCATION RANDOMIZATION TEST")
@@ -86,7 +109,10 @@ def main():
     # Test integration
     result2 = test_location_integration()
     
-    if result1 and result2:
+    # Test sampling without repeats
+    result3 = test_location_sampling()
+    
+    if result1 and result2 and result3:
         print("\nSUCCESS: Location randomization is working correctly")
         print("The UI will now be able to randomize locations for selected listings")
     else: